@@ -0,0 +1,103 @@
+"""Benchmark of building the model of a planning
+
+Builds the model of a planning of 4 months and 50 employees, with all
+constraints and distributions, and reports the build time per stage.
+With --compare the model is built a second time using the builtin sum for
+the linear expressions (the reference), to show the reduction of the build
+time by the flat sums.
+
+Usage:
+    python -m benchmarks.build_model [--employees 50] [--days 120] [--compare]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from contextlib import ExitStack
+from datetime import date, timedelta
+from unittest import mock
+
+from shift.domain.planning.constraints import (
+    MaxConsecutiveShifts,
+    MaxRecurrentShifts,
+    ShiftsPerDay,
+    WorkersPerShift,
+)
+from shift.domain.planning.distributions import NShifts, NShiftsMonthly
+from shift.domain.shifts.periods import DayAndEvening
+from shift.domain.shifts.shift import Day, Shift, Slot, shift_range
+from shift.domain.solver.instrumentation import Instrumentation
+from shift.domain.solver.solver import Solver
+
+# modules that refer to linear_sum, patched for the reference build
+_LinearSumReferences = (
+    "shift.domain.utils.utils.linear_sum",
+    "shift.domain.planning.constraints.linear_sum",
+    "shift.domain.solver.optimizers.linear_sum",
+)
+
+
+def get_slots(first_day: date, n_days: int) -> list[Slot]:
+    shifts = shift_range(
+        Shift(min(DayAndEvening), Day(first_day)),
+        Shift(max(DayAndEvening), Day(first_day + timedelta(n_days - 1))),
+        periods=DayAndEvening,
+    )
+    return [
+        Slot(shift.period, shift.day, shift.duration, n_employees=2)
+        for shift in shifts
+    ]
+
+
+def build(n_employees: int, n_days: int) -> Instrumentation:
+    employee_ids = list(range(n_employees))
+    slots = get_slots(date(2024, 1, 1), n_days)
+
+    constraints = [
+        WorkersPerShift(),
+        ShiftsPerDay(),
+        MaxConsecutiveShifts(max=3, window=5),
+        MaxRecurrentShifts(),
+    ]
+    for constraint in constraints:
+        constraint.employee_ids = employee_ids
+
+    distributions = [NShifts(offset=1), NShiftsMonthly(offset=2)]
+    for distribution in distributions:
+        distribution.employee_hours = {
+            employee_id: 24 + 8 * (employee_id % 3)
+            for employee_id in employee_ids
+        }
+
+    instrumentation = Instrumentation()
+    solver = Solver(0, employee_ids, slots, instrumentation=instrumentation)
+    solver.add_constraints(constraints)
+    solver.add_distributions(distributions)
+    return instrumentation
+
+
+def build_reference(n_employees: int, n_days: int) -> Instrumentation:
+    with ExitStack() as stack:
+        for target in _LinearSumReferences:
+            stack.enter_context(mock.patch(target, new=sum))
+        return build(n_employees, n_days)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+
+    report = {"flat_sum": build(args.employees, args.days).summary()}
+    if args.compare:
+        report["builtin_sum"] = build_reference(
+            args.employees, args.days
+        ).summary()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark of the encodings of max consecutive shifts
+
+Builds (and solves) the model of a planning with a wide max consecutive
+shifts constraint (e.g. at most 5 shifts in any 7 days) once per encoding,
+and reports the size of the model (including the number of terms of
+the linear constraints) and the build and solve time of each.
+
+Usage:
+    python -m benchmarks.consecutive [--employees 50] [--days 120]
+        [--max 5] [--window 14] [--max-time 60] [--workers 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date
+from time import perf_counter
+from typing import Any, Optional
+
+from benchmarks.build_model import get_slots
+from shift.domain.planning.constraints import (
+    MaxConsecutiveShifts,
+    ShiftsPerDay,
+    WindowEncoding,
+    WorkersPerShift,
+)
+from shift.domain.planning.distributions import NShifts
+from shift.domain.solver.solver import Solver
+
+
+def run(
+    encoding: WindowEncoding,
+    n_employees: int,
+    n_days: int,
+    max: int,
+    window: int,
+    max_time: Optional[float] = None,
+    num_workers: int = 8,
+) -> dict[str, Any]:
+    employee_ids = list(range(n_employees))
+    slots = get_slots(date(2024, 1, 1), n_days)
+
+    constraints = [
+        WorkersPerShift(),
+        ShiftsPerDay(),
+        MaxConsecutiveShifts(max=max, window=window, encoding=encoding),
+    ]
+    for constraint in constraints:
+        constraint.employee_ids = employee_ids
+    n_shifts = NShifts(offset=2)
+    n_shifts.employee_hours = {
+        employee_id: 24 + 8 * (employee_id % 3) for employee_id in employee_ids
+    }
+
+    start = perf_counter()
+    solver = Solver(0, employee_ids, slots)
+    solver.add_constraints(constraints)
+    solver.add_distributions([n_shifts])
+    build_time = perf_counter() - start
+
+    proto = solver.model.Proto()
+    result: dict[str, Any] = {
+        "encoding": encoding.value,
+        "n_variables": len(proto.variables),
+        "n_constraints": len(proto.constraints),
+        "n_linear_terms": sum(
+            len(constraint.linear.vars) for constraint in proto.constraints
+        ),
+        "build_time": build_time,
+    }
+    if max_time is not None:
+        solver_result = solver.solve(
+            num_workers=num_workers, max_time=max_time, random_seed=0
+        )
+        result["status"] = solver_result.status
+        result["wall_time"] = solver_result.wall_time
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--max", type=int, default=5)
+    parser.add_argument("--window", type=int, default=14)
+    parser.add_argument("--max-time", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            [
+                run(
+                    encoding,
+                    args.employees,
+                    args.days,
+                    args.max,
+                    args.window,
+                    args.max_time,
+                    args.workers,
+                )
+                for encoding in WindowEncoding
+            ],
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
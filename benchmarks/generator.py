@@ -0,0 +1,173 @@
+"""Deterministic generator of synthetic plannings
+
+A planning is generated from a configuration (number of employees,
+months, seed and the mix of constraints), including random specifications
+and holidays of the employees. The same configuration always results in
+the same planning.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from shift.domain.employee.specifications import (
+    Holiday,
+    SpecificDay,
+    SpecificPeriod,
+    Specifications,
+    SpecificShift,
+    SpecificWeekDay,
+    SpecType,
+)
+from shift.domain.planning.constraints import (
+    MaxConsecutiveShifts,
+    MaxRecurrentShifts,
+    ShiftsPerDay,
+    WorkersPerShift,
+)
+from shift.domain.planning.distributions import NShifts, NShiftsMonthly
+from shift.domain.planning.planning import Planning
+from shift.domain.shifts.periods import DayAndEvening
+from shift.domain.shifts.shift import Day, Shift
+
+# constraints (and distributions) of every mix
+ConstraintMixes = ("basic", "consecutive", "full")
+
+_ContractHours = (16, 24, 32, 36)
+_PreferenceTypes = (
+    SpecType.UNAVAILABLE,
+    SpecType.NOT_PREFERRED,
+    SpecType.PREFERRED,
+)
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """Configuration of a synthetic planning
+
+    Arguments:
+        n_employees -- Number of employees
+        n_months -- Number of months (of 30 days) of the planning
+        seed -- Seed of the random specifications
+        employees_per_shift -- Number of employees per shift
+        constraint_mix -- basic (workers per shift and shifts per day),
+            consecutive (and max consecutive shifts) or full (and max
+            recurrent shifts and monthly distributions)
+        holidays -- Number of holidays per employee
+        specifications -- Number of (other) specifications per employee
+        first_day -- First day of the planning
+    """
+
+    n_employees: int
+    n_months: int
+    seed: int = 0
+    employees_per_shift: int = 2
+    constraint_mix: str = "full"
+    holidays: int = 1
+    specifications: int = 3
+    first_day: date = date(2024, 1, 1)
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self.n_employees}e-{self.n_months}m-{self.constraint_mix}"
+            f"-s{self.seed}"
+        )
+
+    @property
+    def last_day(self) -> date:
+        return self.first_day + timedelta(days=30 * self.n_months - 1)
+
+
+def generate(config: SyntheticConfig) -> tuple[Planning, list[Specifications]]:
+    """Generate a planning and the specifications of its employees
+
+    Arguments:
+        config -- Configuration of the planning
+
+    Returns:
+        Planning and the specifications of the employees
+    """
+    if config.constraint_mix not in ConstraintMixes:
+        raise ValueError(f"Unknown constraint mix {config.constraint_mix}")
+
+    _random = random.Random(config.seed)
+    employee_ids = list(range(config.n_employees))
+    planning = Planning(
+        first_day=config.first_day,
+        last_day=config.last_day,
+        periods=DayAndEvening,
+        shift_duration=8,
+        employees_per_shift=config.employees_per_shift,
+        employee_hours={
+            employee_id: _random.choice(_ContractHours)
+            for employee_id in employee_ids
+        },
+    )
+
+    constraints = [WorkersPerShift(), ShiftsPerDay()]
+    if config.constraint_mix in ("consecutive", "full"):
+        constraints.append(MaxConsecutiveShifts(max=4, window=6))
+    if config.constraint_mix == "full":
+        constraints.append(MaxRecurrentShifts(max=2))
+    for constraint in constraints:
+        planning.constraints.add(constraint, employee_ids=employee_ids)
+
+    planning.distributions.add(NShifts(offset=2))
+    if config.constraint_mix == "full":
+        planning.distributions.add(NShiftsMonthly(offset=3))
+
+    specifications = [
+        _specifications(_random, config, employee_id)
+        for employee_id in employee_ids
+    ]
+    return planning, specifications
+
+
+def _random_day(_random: random.Random, config: SyntheticConfig) -> Day:
+    n_days = (config.last_day - config.first_day).days + 1
+    return Day(config.first_day + timedelta(days=_random.randrange(n_days)))
+
+
+def _specifications(
+    _random: random.Random, config: SyntheticConfig, employee_id: int
+) -> Specifications:
+    specifications = Specifications(employee_id)
+    for _ in range(config.holidays):
+        first_day = _random_day(_random, config)
+        last_day = Day(first_day.date + timedelta(days=_random.randint(0, 13)))
+        specifications.add(
+            Holiday(
+                Shift(min(DayAndEvening), first_day),
+                Shift(max(DayAndEvening), last_day),
+            )
+        )
+
+    for _ in range(config.specifications):
+        spec_type = _random.choice(_PreferenceTypes)
+        kind = _random.randrange(4)
+        if kind == 0:
+            specifications.add(
+                SpecificShift(
+                    spec_type,
+                    Shift(
+                        _random.choice(list(DayAndEvening)),
+                        _random_day(_random, config),
+                    ),
+                )
+            )
+        elif kind == 1:
+            specifications.add(
+                SpecificDay(spec_type, _random_day(_random, config))
+            )
+        elif kind == 2:
+            specifications.add(
+                SpecificPeriod(spec_type, _random.choice(list(DayAndEvening)))
+            )
+        else:
+            specifications.add(
+                SpecificWeekDay(spec_type, _random.randint(1, 7))
+            )
+    return specifications
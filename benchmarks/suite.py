@@ -0,0 +1,187 @@
+"""Benchmark suite of building and solving synthetic plannings
+
+Every case of the suite generates a synthetic planning (see generator.py),
+builds the model while recording the wall time, peak memory and number of
+variables and constraints per stage, and (optionally) solves it. Results
+are written as JSON, to compare them across versions.
+
+Usage:
+    python -m benchmarks.suite [--suite quick|scaling] [--solve SECONDS]
+        [--output results.json] [--baseline previous.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from importlib import metadata
+from time import perf_counter
+from typing import Any, Optional
+
+from benchmarks.generator import SyntheticConfig, generate
+from shift.domain.solver.instrumentation import Instrumentation
+from shift.domain.solver.solver import Solver
+
+Suites: dict[str, list[SyntheticConfig]] = {
+    "quick": [
+        SyntheticConfig(10, 1, constraint_mix="basic"),
+        SyntheticConfig(10, 1),
+        SyntheticConfig(25, 2),
+    ],
+    "scaling": [
+        SyntheticConfig(n_employees, n_months, constraint_mix=mix)
+        for n_employees in (10, 25, 50, 100)
+        for n_months in (1, 4, 12)
+        for mix in ("basic", "full")
+    ],
+}
+
+
+def run_case(
+    config: SyntheticConfig,
+    solve: Optional[float] = None,
+    trace_memory: bool = True,
+) -> dict[str, Any]:
+    """Build (and solve) the model of a synthetic planning
+
+    Arguments:
+        config -- Configuration of the synthetic planning
+        solve -- Time limit of the solve in seconds, the model is not
+            solved if None
+        trace_memory -- Trace the peak memory per stage
+
+    Returns:
+        Result of the case
+    """
+    start = perf_counter()
+    planning, specifications = generate(config)
+    generate_time = perf_counter() - start
+
+    instrumentation = Instrumentation(trace_memory=trace_memory)
+    start = perf_counter()
+    solver = Solver(
+        0,
+        planning.employee_ids,
+        planning.slots,
+        specifications=specifications,
+        instrumentation=instrumentation,
+    )
+    solver.add_constraints(planning.retrieve_constraints())
+    solver.add_distributions(planning.retrieve_distributions())
+    build_time = perf_counter() - start
+
+    proto = solver.model.Proto()
+    result: dict[str, Any] = {
+        "case": config.name,
+        "config": {
+            key: str(value) if key == "first_day" else value
+            for key, value in asdict(config).items()
+        },
+        "generate_time": generate_time,
+        "build_time": build_time,
+        "n_variables": len(proto.variables),
+        "n_constraints": len(proto.constraints),
+        "stages": instrumentation.summary(),
+        "components": instrumentation.report(),
+    }
+
+    if solve is not None:
+        solver_result = solver.solve(max_time=solve, random_seed=0)
+        result["solve"] = {
+            "status": solver_result.status,
+            "wall_time": solver_result.wall_time,
+        }
+    return result
+
+
+def run_suite(
+    configs: list[SyntheticConfig],
+    solve: Optional[float] = None,
+    trace_memory: bool = True,
+) -> dict[str, Any]:
+    return {
+        "environment": _environment(),
+        "cases": [
+            run_case(config, solve=solve, trace_memory=trace_memory)
+            for config in configs
+        ],
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Relative change of the build (and solve) time per case
+
+    Arguments:
+        results -- Results of the suite
+        baseline -- Results of the suite of a previous version
+
+    Returns:
+        Ratio of the times of every case that is part of both results
+    """
+    baseline_cases = {case["case"]: case for case in baseline["cases"]}
+    comparison = []
+    for case in results["cases"]:
+        baseline_case = baseline_cases.get(case["case"])
+        if baseline_case is None:
+            continue
+        row = {
+            "case": case["case"],
+            "build_time": case["build_time"] / baseline_case["build_time"],
+        }
+        if "solve" in case and "solve" in baseline_case:
+            row["solve_time"] = (
+                case["solve"]["wall_time"]
+                / baseline_case["solve"]["wall_time"]
+            )
+        comparison.append(row)
+    return comparison
+
+
+def _environment() -> dict[str, Any]:
+    def version(package: str) -> Optional[str]:
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            return None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "shift": version("shift"),
+        "ortools": version("ortools"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", choices=sorted(Suites), default="quick")
+    parser.add_argument("--solve", type=float, default=None)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    args = parser.parse_args()
+
+    results = run_suite(
+        Suites[args.suite], solve=args.solve, trace_memory=not args.no_memory
+    )
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        print(json.dumps(compare(results, baseline), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark of symmetry breaking between interchangeable employees
+
+Solves synthetic plannings without specifications (so employees with the
+same hours are interchangeable) with and without symmetry breaking, and
+reports the solve time of both.
+
+Usage:
+    python -m benchmarks.symmetry [--employees 12] [--months 1]
+        [--employees-per-shift 3] [--max-time 60] [--optimize]
+        [--workers 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any
+
+from benchmarks.generator import SyntheticConfig, generate
+from shift.domain.solver.optimizers import PlanningOptimization
+from shift.domain.solver.solver import Solver
+from shift.domain.solver.symmetry import SymmetryBreaking, equivalent_employees
+
+
+def solve(
+    config: SyntheticConfig,
+    symmetry_breaking: bool,
+    max_time: float,
+    optimize: bool = False,
+    num_workers: int = 8,
+) -> dict[str, Any]:
+    planning, specifications = generate(config)
+    optimization = (
+        PlanningOptimization(planning.employee_ids) if optimize else None
+    )
+    solver = Solver(
+        0,
+        planning.employee_ids,
+        planning.slots,
+        optimization=optimization,
+        specifications=specifications,
+    )
+    solver.add_constraints(planning.retrieve_constraints())
+    solver.add_distributions(planning.retrieve_distributions())
+    solver.add_optimization()
+
+    classes = equivalent_employees(planning, specifications, optimization)
+    if symmetry_breaking:
+        solver.add_constraints([SymmetryBreaking(classes=classes)])
+
+    result = solver.solve(
+        num_workers=num_workers, max_time=max_time, random_seed=0
+    )
+    return {
+        "symmetry_breaking": symmetry_breaking,
+        "classes": [len(_class) for _class in classes],
+        "status": result.status,
+        "objective": result.objective,
+        "bound": result.bound,
+        "wall_time": result.wall_time,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=12)
+    parser.add_argument("--months", type=int, default=1)
+    parser.add_argument("--employees-per-shift", type=int, default=3)
+    parser.add_argument("--max-time", type=float, default=60)
+    parser.add_argument("--optimize", action="store_true")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    config = SyntheticConfig(
+        args.employees,
+        args.months,
+        employees_per_shift=args.employees_per_shift,
+        holidays=0,
+        specifications=0,
+    )
+    print(
+        json.dumps(
+            [
+                solve(
+                    config,
+                    symmetry_breaking,
+                    args.max_time,
+                    args.optimize,
+                    args.workers,
+                )
+                for symmetry_breaking in (False, True)
+            ],
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
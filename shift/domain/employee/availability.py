@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from shift.domain.employee.specifications import Specifications, SpecType
+from shift.domain.shifts.shift import Shift, ShiftRange
+
+
+@dataclass(frozen=True, eq=False)
+class AvailabilityMatrix:
+    """Spec types of a team of employees over a range of shifts
+
+    Every row is an employee and every column a shift of the range, the
+    values are the (minimal) spec type of the employee for that shift, or
+    0 if no specification applies.
+    """
+
+    employee_ids: list[int]
+    shifts: ShiftRange
+    spec_types: npt.NDArray[np.int8]
+
+    @classmethod
+    def from_specifications(
+        cls,
+        specifications: Iterable[Specifications],
+        shifts: ShiftRange,
+        employee_ids: Optional[Iterable[int]] = None,
+    ) -> AvailabilityMatrix:
+        """Build the matrix from the specifications of the employees
+
+        Arguments:
+            specifications -- Specifications of (a part of) the employees
+            shifts -- Range of shifts (e.g. the horizon of a planning)
+            employee_ids -- Employees of the rows, defaults to the employees
+                of the specifications. Employees without specifications
+                are available for all shifts.
+
+        Returns:
+            Availability matrix
+        """
+        _specifications = {
+            specification.employee_id: specification
+            for specification in specifications
+        }
+        _employee_ids = (
+            list(_specifications)
+            if employee_ids is None
+            else list(employee_ids)
+        )
+
+        spec_types = np.zeros((len(_employee_ids), len(shifts)), dtype=np.int8)
+        for row, employee_id in enumerate(_employee_ids):
+            if employee_id in _specifications:
+                spec_types[row] = _specifications[employee_id].spec_types(
+                    shifts
+                )
+        spec_types.flags.writeable = False
+        return cls(_employee_ids, shifts, spec_types)
+
+    @cached_property
+    def _rows(self) -> dict[int, int]:
+        return {
+            employee_id: row
+            for row, employee_id in enumerate(self.employee_ids)
+        }
+
+    def available(
+        self, unavailable: SpecType = SpecType.UNAVAILABLE_COR
+    ) -> npt.NDArray[np.bool_]:
+        """Availability of the employees (rows) per shift (columns)
+
+        Arguments:
+            unavailable -- Spec types up to and including this spec type
+                are considered as unavailable
+
+        Returns:
+            Boolean matrix
+        """
+        return self.spec_types > unavailable
+
+    def n_available_per_shift(
+        self, unavailable: SpecType = SpecType.UNAVAILABLE_COR
+    ) -> npt.NDArray[np.int64]:
+        return self.available(unavailable).sum(axis=0)
+
+    def n_available_per_employee(
+        self, unavailable: SpecType = SpecType.UNAVAILABLE_COR
+    ) -> npt.NDArray[np.int64]:
+        return self.available(unavailable).sum(axis=1)
+
+    def row(self, employee_id: int) -> npt.NDArray[np.int8]:
+        return self.spec_types[self._rows[employee_id]]
+
+    def column(self, shift: Shift) -> npt.NDArray[np.int8]:
+        return self.spec_types[:, self.shifts.index(shift)]
+
+    def available_for(
+        self,
+        employee_id: int,
+        shifts: Iterable[Shift],
+        unavailable: SpecType = SpecType.UNAVAILABLE_COR,
+    ) -> npt.NDArray[np.bool_]:
+        """Availability of an employee for arbitrary shifts
+
+        Arguments:
+            employee_id -- Id of the employee
+            shifts -- Shifts to look up, shifts outside the matrix (and all
+                shifts of employees outside the matrix) are available
+            unavailable -- Spec types up to and including this spec type
+                are considered as unavailable
+
+        Returns:
+            Boolean array with an element per shift
+        """
+        _shifts = list(shifts)
+        if employee_id not in self._rows or not len(self.shifts):
+            return np.ones(len(_shifts), dtype=bool)
+
+        columns = np.array(
+            [
+                self.shifts.index(shift) if shift in self.shifts else -1
+                for shift in _shifts
+            ],
+            dtype=np.int64,
+        )
+        available = self.spec_types[self._rows[employee_id]] > unavailable
+        return np.where(columns >= 0, available[columns], True)
+
+    def is_available(
+        self,
+        employee_id: int,
+        shift: Shift,
+        unavailable: SpecType = SpecType.UNAVAILABLE_COR,
+    ) -> bool:
+        # employees and shifts outside the matrix are not constrained
+        if employee_id not in self._rows or shift not in self.shifts:
+            return True
+        return bool(
+            self.spec_types[
+                self._rows[employee_id],
+                self.shifts.index(shift),
+            ]
+            > unavailable
+        )
@@ -4,11 +4,15 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import IntEnum
 from functools import cached_property
-from typing import Iterable, Iterator, Optional, Union
+from typing import Any, Iterable, Iterator, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
 
 from shift.domain.shifts.days import WeekDay
-from shift.domain.shifts.periods import DayAndEvening, Period
-from shift.domain.shifts.shift import Day, Shift, shift_range
+from shift.domain.shifts.periods import DayAndEvening, Period, period_position
+from shift.domain.shifts.shift import Day, Shift, ShiftRange, shift_range
+from shift.domain.utils.intervals import Intervals
 from shift.domain.utils.model import Model
 
 
@@ -29,6 +33,9 @@ class Specifications(Model):
     week_day: list[SpecificWeekDay] = field(default_factory=list)
     holidays: list[Holiday] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        self._index: Optional[SpecificationIndex] = None
+
     def add(self, specification: Specification | Holiday) -> None:
         if isinstance(specification, SpecificShift):
             self.shifts.append(specification)
@@ -42,6 +49,8 @@ class Specifications(Model):
             self.holidays.append(specification)
         else:
             raise
+        # the compiled index is outdated
+        self._index = None
 
     def __iter__(self) -> Iterator[Union[Specification, Holiday]]:
         yield from self.shifts
@@ -50,24 +59,50 @@ class Specifications(Model):
         yield from self.week_day
         yield from self.holidays
 
+    @property
+    def index(self) -> SpecificationIndex:
+        """Index of the specifications, compiled on first use after adding
+        a specification
+        """
+        if self._index is None:
+            self._index = SpecificationIndex.compile(self)
+        return self._index
+
+    def is_unavailable(self, shift: Shift) -> bool:
+        """Whether the shift is within a holiday of the employee"""
+        return self.index.is_unavailable(shift)
+
+    def unavailable_mask(self, shifts: ShiftRange) -> npt.NDArray[np.bool_]:
+        """Mask of the shifts that are within a holiday of the employee
+
+        Arguments:
+            shifts -- Range of shifts (e.g. the horizon of a planning)
+
+        Returns:
+            Boolean array with an element per shift in the range
+        """
+        return self.index.unavailable_mask(shifts)
+
     def min_for_shift(self, shift: Shift) -> Optional[SpecType]:
-        try:
-            return min(
-                spec_type
-                for specification in self
-                if (spec_type := specification.spec_for_shift(shift))
-            )
-        except ValueError:
-            return None
+        return self.index.min_for_shift(shift)
+
+    def spec_types(self, shifts: ShiftRange) -> npt.NDArray[np.int8]:
+        """Minimal spec type of every shift in a range of shifts
+
+        Arguments:
+            shifts -- Range of shifts (e.g. the horizon of a planning)
+
+        Returns:
+            Array with the (integer) spec type per shift, 0 if none applies
+        """
+        return self.index.spec_types(shifts)
 
     def blocked_shifts(
         self, from_shift: Shift, to_shift: Shift
     ) -> list[Shift]:
-        blocked_shifts = []
-        for shift in shift_range(from_shift, to_shift, periods=DayAndEvening):
-            if self.min_for_shift(shift) is SpecType.UNAVAILABLE_COR:
-                blocked_shifts.append(shift)
-        return blocked_shifts
+        shifts = shift_range(from_shift, to_shift, periods=DayAndEvening)
+        blocked = self.spec_types(shifts) == SpecType.UNAVAILABLE_COR
+        return [shifts[index] for index in np.flatnonzero(blocked)]
 
     def blocked_days(self, from_day: Day, to_day: Day) -> list[Day]:
         blocked_shifts = self.blocked_shifts(
@@ -128,30 +163,183 @@ class Holiday(Model):
         return self.spec_type if shift in self.shifts else None
 
     @cached_property
-    def shifts(self) -> list[Shift]:
+    def shifts(self) -> ShiftRange:
         periods = self.first_shift.period.__class__
         if not isinstance(self.last_shift.period, periods):
             raise ValueError(
                 "The first and last shift should be specified using the same periods"
             )
 
-        return list(
-            shift_range(
-                self.first_shift,
-                self.last_shift,
-                periods=periods,
-                inclusive=True,
-            )
+        return shift_range(
+            self.first_shift,
+            self.last_shift,
+            periods=periods,
+            inclusive=True,
         )
 
+    @property
+    def interval(self) -> tuple[int, int]:
+        """Half-open interval of the shift ordinals of the holiday"""
+        return self.shifts.ordinals.start, self.shifts.ordinals.stop
+
     @property
     def days(self) -> Iterable[Day]:
         return set(shift.day for shift in self.shifts)
 
     @property
     def n_shifts(self) -> int:
-        return len(list(self.shifts))
+        return len(self.shifts)
 
     @property
     def n_days(self) -> int:
         return len(list(self.days))
+
+
+NoSpecType = 0
+
+
+@dataclass
+class SpecificationIndex:
+    """Compiled specifications of an employee
+
+    The (minimal) spec type is stored per shift, day, period and week day,
+    and holidays are merged into intervals of shift ordinals.
+    """
+
+    shifts: dict[tuple[int, Period], SpecType] = field(default_factory=dict)
+    days: dict[int, SpecType] = field(default_factory=dict)
+    periods: dict[Period, SpecType] = field(default_factory=dict)
+    week_days: dict[int, SpecType] = field(default_factory=dict)
+    unavailable: dict[type[Period], Intervals] = field(default_factory=dict)
+
+    @classmethod
+    def compile(cls, specifications: Specifications) -> SpecificationIndex:
+        index = cls()
+        for specific_shift in specifications.shifts:
+            _min(
+                index.shifts,
+                (
+                    specific_shift.shift.day.date.toordinal(),
+                    specific_shift.shift.period,
+                ),
+                specific_shift.spec_type,
+            )
+        for specific_day in specifications.days:
+            _min(
+                index.days,
+                specific_day.day.date.toordinal(),
+                specific_day.spec_type,
+            )
+        for specific_period in specifications.periods:
+            _min(
+                index.periods,
+                specific_period.period,
+                specific_period.spec_type,
+            )
+        for specific_week_day in specifications.week_day:
+            _min(
+                index.week_days,
+                specific_week_day.week_day,
+                specific_week_day.spec_type,
+            )
+        for holiday in specifications.holidays:
+            periods = type(holiday.first_shift.period)
+            index.unavailable.setdefault(periods, Intervals()).add(
+                *holiday.interval
+            )
+        return index
+
+    def is_unavailable(self, shift: Shift) -> bool:
+        intervals = self.unavailable.get(type(shift.period))
+        return intervals is not None and shift.ordinal in intervals
+
+    def min_for_shift(self, shift: Shift) -> Optional[SpecType]:
+        if self.is_unavailable(shift):
+            return Holiday.spec_type
+
+        day_ordinal = shift.day.date.toordinal()
+        spec_types = [
+            spec_type
+            for spec_type in (
+                self.shifts.get((day_ordinal, shift.period)),
+                self.days.get(day_ordinal),
+                self.periods.get(shift.period),
+                # the first day (ordinal 1) was a monday
+                self.week_days.get((day_ordinal - 1) % 7 + 1),
+            )
+            if spec_type is not None
+        ]
+        return min(spec_types) if spec_types else None
+
+    def unavailable_mask(self, shifts: ShiftRange) -> npt.NDArray[np.bool_]:
+        if not len(shifts):
+            return np.zeros(0, dtype=bool)
+
+        periods = type(shifts.periods[0])
+        intervals = self.unavailable.get(periods)
+        if intervals is None:
+            return np.zeros(len(shifts), dtype=bool)
+
+        # translate ordinals of the range to ordinals of all periods
+        day_ordinals, positions = _day_ordinals_and_positions(shifts)
+        period_positions = np.array(
+            [period_position(period) for period in shifts.periods]
+        )
+        return intervals.contains(
+            day_ordinals * len(periods) + period_positions[positions]
+        )
+
+    def spec_types(self, shifts: ShiftRange) -> npt.NDArray[np.int8]:
+        # start from a value above all spec types, to take the minimum
+        spec_types = np.full(len(shifts), max(SpecType) + 1, dtype=np.int8)
+        day_ordinals, positions = _day_ordinals_and_positions(shifts)
+
+        for (day_ordinal, period), spec_type in self.shifts.items():
+            if period in shifts.periods:
+                _ordinal = day_ordinal * len(shifts.periods) + (
+                    shifts.periods.index(period)
+                )
+                if _ordinal in shifts.ordinals:
+                    _index = shifts.ordinals.index(_ordinal)
+                    spec_types[_index] = min(spec_types[_index], spec_type)
+
+        for day_ordinal, spec_type in self.days.items():
+            _apply_min(spec_types, day_ordinals == day_ordinal, spec_type)
+
+        for period, spec_type in self.periods.items():
+            if period in shifts.periods:
+                _apply_min(
+                    spec_types,
+                    positions == shifts.periods.index(period),
+                    spec_type,
+                )
+
+        if self.week_days:
+            week_days = (day_ordinals - 1) % 7 + 1
+            for week_day, spec_type in self.week_days.items():
+                _apply_min(spec_types, week_days == week_day, spec_type)
+
+        spec_types[self.unavailable_mask(shifts)] = Holiday.spec_type
+        spec_types[spec_types > max(SpecType)] = NoSpecType
+        return spec_types
+
+
+def _min(index: dict, key: Any, spec_type: SpecType) -> None:
+    if key not in index or spec_type < index[key]:
+        index[key] = spec_type
+
+
+def _apply_min(
+    spec_types: npt.NDArray[np.int8],
+    mask: npt.NDArray[np.bool_],
+    spec_type: SpecType,
+) -> None:
+    spec_types[mask] = np.minimum(spec_types[mask], spec_type)
+
+
+def _day_ordinals_and_positions(
+    shifts: ShiftRange,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    return np.divmod(
+        np.asarray(shifts.ordinals, dtype=np.int64), len(shifts.periods)
+    )
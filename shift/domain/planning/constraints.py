@@ -1,29 +1,52 @@
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left
 from dataclasses import dataclass, field
+from datetime import timedelta
+from enum import Enum
+from functools import lru_cache
 from itertools import groupby
+from math import comb
 from typing import (
+    Collection,
     Iterable,
     Iterator,
     Optional,
     Protocol,
     Sequence,
+    Union,
 )
 
+import numpy as np
+import numpy.typing as npt
 from ortools.sat.python import cp_model  # type: ignore
-from ortools.sat.python.cp_model import CpModel, IntVar  # type: ignore
+from ortools.sat.python.cp_model import CpModel  # type: ignore
 
+from shift.domain.shifts.calendars import CalendarTable
 from shift.domain.shifts.days import WeekDay, WeekDays
-from shift.domain.shifts.periods import DayAndEvening  # type: ignore
+from shift.domain.shifts.periods import (  # type: ignore
+    DayAndEvening,
+    period_position,
+)
 from shift.domain.shifts.shift import (
     Period,
     Shift,
     Slot,
-    get_consecutive_shifts,
 )
 from shift.domain.utils.model import Model
-from shift.domain.utils.utils import EmployeeSlot, get_key
+from shift.domain.utils.utils import (
+    EmployeeSlotMatrix,
+    get_key,
+    linear_sum,
+    weighted_sum,
+)
+
+# the states of a window automaton grow exponentially with the window
+_MaxAutomatonStates = 4096
+
+# day of a shift pattern: a period, None (no shift) or any of a collection
+PatternDay = Union[Period, None, Collection[Optional[Period]]]
 
 
 @dataclass
@@ -39,6 +62,13 @@ class Constraints(Model):
     max_recurrent_shifts: list[MaxRecurrentShifts] = field(
         init=False, default_factory=list
     )
+    max_shift_patterns: list[MaxShiftPatterns] = field(
+        init=False, default_factory=list
+    )
+    minimum_rest: list[MinimumRest] = field(init=False, default_factory=list)
+    contract_hours: list[ContractHours] = field(
+        init=False, default_factory=list
+    )
 
     def add(
         self,
@@ -64,6 +94,12 @@ class Constraints(Model):
             self.max_consecutive_shifts.append(constraint)
         elif isinstance(constraint, MaxRecurrentShifts):
             self.max_recurrent_shifts.append(constraint)
+        elif isinstance(constraint, MaxShiftPatterns):
+            self.max_shift_patterns.append(constraint)
+        elif isinstance(constraint, MinimumRest):
+            self.minimum_rest.append(constraint)
+        elif isinstance(constraint, ContractHours):
+            self.contract_hours.append(constraint)
 
     def __iter__(self) -> Iterator[PlanningConstraint]:
         if self.workers_per_shift:
@@ -73,6 +109,9 @@ class Constraints(Model):
         yield from self.specific_shifts
         yield from self.max_consecutive_shifts
         yield from self.max_recurrent_shifts
+        yield from self.max_shift_patterns
+        yield from self.minimum_rest
+        yield from self.contract_hours
 
 
 class PlanningConstraint(Protocol):  # pragma: no cover
@@ -82,10 +121,7 @@ class PlanningConstraint(Protocol):  # pragma: no cover
         self,
         slots: Iterable[Slot],
         model: cp_model.CpModel,
-        employee_slots: dict[
-            EmployeeSlot,
-            cp_model.IntVar,
-        ],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
         ...
 
@@ -98,19 +134,15 @@ class WorkersPerShift(Model):
         self,
         slots: Iterable[Slot],
         model: CpModel,
-        employee_slots: dict[
-            EmployeeSlot,
-            cp_model.IntVar,
-        ],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
+        shifts = employee_slots.shifts
         for slot in slots:
-            _sum = sum(
-                (
-                    employee_slots[get_key(employee_id, slot.shift)]
-                    for employee_id in self.employee_ids
-                )
+            index = shifts.index(slot)
+            model.Add(
+                employee_slots.column_sum(self.employee_ids, index)
+                == slot.n_employees
             )
-            model.Add(_sum == slot.n_employees)
 
 
 @dataclass
@@ -130,21 +162,178 @@ class ShiftsPerDay(Model):
         self,
         slots: Iterable[Slot],
         model: CpModel,
-        employee_slots: dict[
-            EmployeeSlot,
-            cp_model.IntVar,
-        ],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
         for _, _slots in groupby(
             slots,
             key=lambda slot: slot.day,
         ):
-            day_slots = list(_slots)
+            day_indices = employee_slots.shifts.indices(_slots)
             for employee_id in self.employee_ids:
-                model.AddAtMostOne(
-                    employee_slots[get_key(employee_id, _slot.shift)]
-                    for _slot in day_slots
-                )
+                _employee_slots = employee_slots.row(employee_id, day_indices)
+                if _employee_slots:
+                    model.AddAtMostOne(_employee_slots)
+
+
+@dataclass
+class MinimumRest(PlanningConstraint):
+    """Minimum rest between the end of a shift and the start of the next
+    shift of an employee, based on the start times of the periods and the
+    duration of the shifts
+
+    Arguments:
+        hours -- Minimum number of hours of rest
+    """
+
+    employee_ids: Sequence[int] = field(init=False)
+    hours: float = 11
+
+    def add_constraint(
+        self,
+        slots: Iterable[Slot],
+        model: CpModel,
+        employee_slots: EmployeeSlotMatrix,
+    ) -> None:
+        _slots = sorted(slots, key=lambda slot: slot.start)
+        starts = [slot.start for slot in _slots]
+        indices = employee_slots.shifts.indices(_slots)
+        rest = timedelta(hours=self.hours)
+
+        # a later shift conflicts if it starts within the rest after the
+        # end of a shift (or the shifts overlap)
+        conflicts = [
+            (indices[first], indices[second])
+            for first, slot in enumerate(_slots)
+            for second in range(
+                first + 1, bisect_left(starts, slot.end + rest)
+            )
+        ]
+        for employee_id in self.employee_ids:
+            for first_index, second_index in conflicts:
+                first_slot = employee_slots.get((employee_id, first_index))
+                second_slot = employee_slots.get((employee_id, second_index))
+                if first_slot is not None and second_slot is not None:
+                    model.AddAtMostOne([first_slot, second_slot])
+
+
+@dataclass
+class ContractHours(PlanningConstraint):
+    """Limit the hours (the duration of the shifts) an employee works per
+    (iso) week and per window of consecutive weeks
+
+    The limits are relative to the contract hours (per week) of an
+    employee, or absolute for all employees. Limits that are None do not
+    apply.
+
+    Arguments:
+        weekly -- Max hours per week, as a fraction of the contract hours
+        rolling -- Max hours per week on average over every window, as a
+            fraction of the contract hours
+        max_weekly_hours -- Max hours per week
+        max_rolling_hours -- Max hours per week on average over every window
+        window -- Number of consecutive weeks of a window
+    """
+
+    employee_ids: Sequence[int] = field(init=False)
+    employee_hours: dict[int, int] = field(init=False, default_factory=dict)
+    weekly: Optional[float] = None
+    rolling: Optional[float] = None
+    max_weekly_hours: Optional[int] = None
+    max_rolling_hours: Optional[int] = None
+    window: int = 4
+
+    def add_constraint(
+        self,
+        slots: Iterable[Slot],
+        model: CpModel,
+        employee_slots: EmployeeSlotMatrix,
+    ) -> None:
+        _slots = list(slots)
+        if not _slots:
+            return
+
+        # slots (and their duration) per week of the calendar
+        calendar = CalendarTable.from_dates(slot.day.date for slot in _slots)
+        weeks = calendar.week_index[
+            calendar.indices(slot.day.date for slot in _slots)
+        ].tolist()
+        week_slots: list[list[tuple[int, int]]] = [
+            [] for _ in range(int(calendar.week_index[-1]) + 1)
+        ]
+        for slot, index, week in zip(
+            _slots, employee_slots.shifts.indices(_slots), weeks
+        ):
+            week_slots[week].append((index, slot.duration))
+
+        for employee_id in self.employee_ids:
+            weekly, rolling = self._get_limits(employee_id)
+            if weekly is None and rolling is None:
+                continue
+            # the hours of every week are aggregated once, for both limits
+            hours = [
+                _week_hours(model, employee_slots, employee_id, _week_slots)
+                for _week_slots in week_slots
+            ]
+            if weekly is not None:
+                for week_hours in hours:
+                    if week_hours is not None:
+                        model.Add(week_hours <= weekly)
+            if rolling is not None:
+                for start in range(len(hours) - self.window + 1):
+                    window_hours = [
+                        week_hours
+                        for week_hours in hours[start : start + self.window]
+                        if week_hours is not None
+                    ]
+                    if window_hours:
+                        model.Add(
+                            linear_sum(window_hours) <= rolling * self.window
+                        )
+
+    def _get_limits(
+        self, employee_id: int
+    ) -> tuple[Optional[int], Optional[int]]:
+        """Max hours per week and on average per week of a window"""
+        contract_hours = self.employee_hours.get(employee_id)
+
+        def limit(
+            fraction: Optional[float], max_hours: Optional[int]
+        ) -> Optional[int]:
+            limits = []
+            if fraction is not None and contract_hours is not None:
+                limits.append(int(fraction * contract_hours))
+            if max_hours is not None:
+                limits.append(max_hours)
+            return min(limits, default=None)
+
+        return (
+            limit(self.weekly, self.max_weekly_hours),
+            limit(self.rolling, self.max_rolling_hours),
+        )
+
+
+def _week_hours(
+    model: CpModel,
+    employee_slots: EmployeeSlotMatrix,
+    employee_id: int,
+    week_slots: list[tuple[int, int]],
+) -> Optional[cp_model.IntVar]:
+    variables, durations = [], []
+    for index, duration in week_slots:
+        var = employee_slots.get(get_key(employee_id, index))
+        if var is not None:
+            variables.append(var)
+            durations.append(duration)
+    if not variables:
+        return None
+
+    week_hours = model.NewIntVar(
+        0,
+        sum(durations),
+        employee_slots.name("h", employee_id, week_slots[0][0]),
+    )
+    model.Add(week_hours == weighted_sum(variables, durations))
+    return week_hours
 
 
 @dataclass
@@ -156,7 +345,7 @@ class SpecificShifts(PlanningConstraint):
         self,
         slots: Iterable[Slot],
         model: CpModel,
-        employee_slots: dict[EmployeeSlot, IntVar],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
         if len(self.employee_ids) != 1:
             raise ValueError(
@@ -165,20 +354,39 @@ class SpecificShifts(PlanningConstraint):
             )
         employee_id = self.employee_ids[0]
 
-        specific_shifts = filter(
-            lambda specific_shift: specific_shift[0]
-            in [slot.shift for slot in slots],
-            self.specific_shifts,
-        )
-
-        for shift, blocked in specific_shifts:
-            _employee_slot = employee_slots[get_key(employee_id, shift)]
+        shifts = employee_slots.shifts
+        slot_indices = set(shifts.indices(slots))
+
+        for shift, blocked in self.specific_shifts:
+            index = shifts.get_index(shift)
+            if index not in slot_indices:
+                continue
+            _employee_slot = employee_slots.get(get_key(employee_id, index))
+            if _employee_slot is None:
+                # the employee is unavailable for the shift, which can only
+                # be satisfied if the shift is blocked anyway
+                if not blocked:
+                    model.AddBoolOr([])
+                continue
             if blocked:
                 model.Add(_employee_slot <= 0)
             else:
                 model.AddExactlyOne(_employee_slot)
 
 
+class WindowEncoding(str, Enum):
+    """Encoding of a constraint over a sliding window of shifts
+
+    Window sums every window of shifts, prefix sums (auxiliary) running
+    totals of the shifts and automaton accepts the sequences of shifts that
+    satisfy the constraint in every window.
+    """
+
+    WINDOW = "window"
+    PREFIX_SUM = "prefix_sum"
+    AUTOMATON = "automaton"
+
+
 @dataclass
 class MaxConsecutiveShifts(PlanningConstraint):
     employee_ids: Sequence[int] = field(init=False)
@@ -188,75 +396,424 @@ class MaxConsecutiveShifts(PlanningConstraint):
     )
     max: int = 1
     window: int = 2
+    encoding: WindowEncoding = WindowEncoding.WINDOW
 
     def add_constraint(
         self,
         slots: Iterable[Slot],
         model: CpModel,
-        employee_slots: dict[EmployeeSlot, IntVar],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
-        for _slots in get_consecutive_shifts(
-            filter(
-                lambda slot: slot.period in self.periods,
-                slots,
-            ),
+        _slots = [slot for slot in slots if slot.period in self.periods]
+        if not _slots:
+            return
+
+        indices = employee_slots.shifts.indices(_slots)
+        calendar = CalendarTable.from_dates(slot.day.date for slot in _slots)
+        on_week_days = np.isin(
+            calendar.week_day[
+                calendar.indices(slot.day.date for slot in _slots)
+            ],
             self.week_days,
-            self.window,
-        ):
+        )
+
+        if self.encoding is WindowEncoding.WINDOW:
+            self._add_window_sums(model, employee_slots, indices, on_week_days)
+            return
+        if self.encoding is WindowEncoding.AUTOMATON:
+            n_states = _n_window_states(self.max, self.window)
+            if n_states > _MaxAutomatonStates:
+                raise ValueError(
+                    f"An automaton of at most {self.max} shifts in a window "
+                    f"of {self.window} requires {n_states} states (more than "
+                    f"{_MaxAutomatonStates}), use the prefix sum encoding"
+                )
+
+        # windows are only constrained within runs of slots on a week day
+        for start, stop in _get_runs(on_week_days):
+            if stop - start < self.window:
+                continue
+            for employee_id in self.employee_ids:
+                if self.encoding is WindowEncoding.PREFIX_SUM:
+                    self._add_prefix_sums(
+                        model, employee_slots, employee_id, indices[start:stop]
+                    )
+                else:
+                    self._add_automaton(
+                        model, employee_slots, employee_id, indices[start:stop]
+                    )
+
+    def _add_window_sums(
+        self,
+        model: CpModel,
+        employee_slots: EmployeeSlotMatrix,
+        indices: list[int],
+        on_week_days: npt.NDArray[np.bool_],
+    ) -> None:
+        # a window longer than the slots is never complete (convolve would
+        # swap its arguments)
+        if len(on_week_days) < self.window:
+            return
+
+        # number of slots, within the window, that are not on a week day
+        n_off_week_days = np.convolve(
+            ~on_week_days, np.ones(self.window, dtype=int), mode="valid"
+        )
+
+        for start in np.flatnonzero(n_off_week_days == 0):
             for employee_id in self.employee_ids:
-                _employee_slots = (
-                    employee_slots[get_key(employee_id, slot.shift)]
-                    for slot in _slots
+                _employee_slots = employee_slots.row(
+                    employee_id, indices[start : start + self.window]
                 )
-                model.Add(sum(_employee_slots) <= self.max)
+                if _employee_slots:
+                    model.Add(linear_sum(_employee_slots) <= self.max)
+
+    def _add_prefix_sums(
+        self,
+        model: CpModel,
+        employee_slots: EmployeeSlotMatrix,
+        employee_id: int,
+        indices: list[int],
+    ) -> None:
+        # number of shifts of the employee before every slot of the run
+        prefix_sums: list[cp_model.LinearExprT] = [0]
+        for index in indices:
+            var = employee_slots.get((employee_id, index))
+            if var is None:
+                prefix_sums.append(prefix_sums[-1])
+                continue
+            prefix_sum = model.NewIntVar(
+                0,
+                len(prefix_sums),
+                employee_slots.name("p", employee_id, index),
+            )
+            model.Add(prefix_sum == prefix_sums[-1] + var)
+            prefix_sums.append(prefix_sum)
+
+        for start in range(len(indices) - self.window + 1):
+            first, last = prefix_sums[start], prefix_sums[start + self.window]
+            if first is not last:
+                model.Add(last - first <= self.max)
+
+    def _add_automaton(
+        self,
+        model: CpModel,
+        employee_slots: EmployeeSlotMatrix,
+        employee_id: int,
+        indices: list[int],
+    ) -> None:
+        variables = [
+            employee_slots.get((employee_id, index)) for index in indices
+        ]
+        if all(var is None for var in variables):
+            return
+        model.AddAutomaton(
+            [
+                model.NewConstant(0) if var is None else var
+                for var in variables
+            ],
+            0,
+            *_max_in_window_automaton(self.max, self.window),
+        )
+
+
+def _get_runs(mask: npt.NDArray[np.bool_]) -> list[tuple[int, int]]:
+    """Start and stop of the runs of consecutive true values"""
+    edges = np.diff(np.concatenate(([0], mask.astype(int), [0])))
+    return list(
+        zip(
+            np.flatnonzero(edges == 1).tolist(),
+            np.flatnonzero(edges == -1).tolist(),
+        )
+    )
+
+
+def _n_window_states(max: int, window: int) -> int:
+    """Number of states of the automaton of at most max shifts in a window"""
+    return sum(comb(window - 1, n) for n in range(min(max, window - 1) + 1))
+
+
+@lru_cache(maxsize=None)
+def _max_in_window_automaton(
+    max: int, window: int
+) -> tuple[list[int], list[tuple[int, int, int]]]:
+    """Final states and transitions of an automaton that accepts sequences
+    of shifts with at most max shifts in every window
+
+    The state is a bit mask of the previous (window - 1) shifts.
+    """
+    mask = (1 << (window - 1)) - 1
+    states = [
+        state for state in range(mask + 1) if bin(state).count("1") <= max
+    ]
+    transitions = [
+        (state, value, ((state << 1) | value) & mask)
+        for state in states
+        for value in (0, 1)
+        if bin(state).count("1") + value <= max
+    ]
+    return states, transitions
 
 
 @dataclass
 class MaxRecurrentShifts(PlanningConstraint):
+    """Limit the shifts on week days (e.g. the weekend) within every window
+    of consecutive (iso) weeks
+
+    Arguments:
+        week_days -- Week days of the shifts
+        periods -- Periods of the shifts
+        max -- Number of shifts (or weeks) within a window
+        window -- Number of consecutive weeks of a window
+        weeks -- Count the weeks with a shift on the week days (e.g. the
+            weekends that are worked) instead of the shifts
+    """
+
     employee_ids: Sequence[int] = field(init=False)
     week_days: list[WeekDay] = field(default_factory=lambda: [6, 7])
     periods: list[Period] = field(
         default_factory=lambda: [period for period in DayAndEvening]
     )
     max: int = 1
+    window: int = 2
+    weeks: bool = False
 
-    @property
-    def window(self) -> int:
-        return 2
+    def add_constraint(
+        self,
+        slots: Iterable[Slot],
+        model: CpModel,
+        employee_slots: EmployeeSlotMatrix,
+    ) -> None:
+        _slots = [slot for slot in slots if slot.period in self.periods]
+        if not _slots:
+            return
+
+        calendar = CalendarTable.from_dates(slot.day.date for slot in _slots)
+        days = calendar.indices(slot.day.date for slot in _slots)
+        on_week_days = np.isin(calendar.week_day[days], self.week_days)
+
+        # indices of the slots on the week days, per week of the calendar
+        n_weeks = int(calendar.week_index[-1]) + 1
+        week_indices: list[list[int]] = [[] for _ in range(n_weeks)]
+        for index, week, on_week_day in zip(
+            employee_slots.shifts.indices(_slots),
+            calendar.week_index[days].tolist(),
+            on_week_days,
+        ):
+            if on_week_day:
+                week_indices[week].append(index)
+
+        n_windows = n_weeks - self.window + 1
+        for employee_id in self.employee_ids:
+            weeks = [
+                self._add_week(
+                    model,
+                    employee_slots,
+                    employee_id,
+                    indices,
+                    # a week of multiple windows is aggregated once
+                    shared=min(week, n_windows - 1)
+                    > max(week - self.window + 1, 0),
+                )
+                for week, indices in enumerate(week_indices)
+            ]
+            for start in range(n_windows):
+                _weeks = [
+                    week
+                    for week in weeks[start : start + self.window]
+                    if week is not None
+                ]
+                if _weeks:
+                    model.Add(linear_sum(_weeks) <= self.max)
+
+    def _add_week(
+        self,
+        model: CpModel,
+        employee_slots: EmployeeSlotMatrix,
+        employee_id: int,
+        indices: list[int],
+        shared: bool,
+    ) -> Optional[cp_model.LinearExprT]:
+        """Shifts (or whether a shift is worked) of an employee in a week"""
+        _employee_slots = employee_slots.row(employee_id, indices)
+        if not _employee_slots:
+            return None
+        if len(_employee_slots) == 1:
+            return _employee_slots[0]
+        if not (shared or self.weeks):
+            return linear_sum(_employee_slots)
+
+        name = employee_slots.name("w", employee_id, indices[0])
+        if self.weeks:
+            week = model.NewBoolVar(name)
+            model.Add(week <= linear_sum(_employee_slots))
+            for var in _employee_slots:
+                model.Add(var <= week)
+        else:
+            week = model.NewIntVar(0, len(_employee_slots), name)
+            model.Add(week == linear_sum(_employee_slots))
+        return week
+
+
+@dataclass
+class MaxShiftPatterns(PlanningConstraint):
+    """Limit the occurrences of patterns of shifts on consecutive days
+
+    A pattern is a sequence of days, every day is a period (a shift of the
+    period is worked), None (no shift is worked) or a collection of both
+    (any of them), e.g. [evening, day] is a day shift directly after an
+    evening shift. The patterns are compiled into a single automaton per
+    employee, which also limits the employee to a single shift per day.
+
+    Arguments:
+        patterns -- Patterns of shifts
+        max -- Number of occurrences (of all patterns) that is allowed, the
+            patterns are forbidden if 0
+        monthly -- Count the occurrences per month (in which an occurrence
+            ends) instead of over all slots
+    """
+
+    employee_ids: Sequence[int] = field(init=False)
+    patterns: list[Sequence[PatternDay]] = field(default_factory=list)
+    max: int = 0
+    monthly: bool = False
 
     def add_constraint(
         self,
         slots: Iterable[Slot],
         model: CpModel,
-        employee_slots: dict[EmployeeSlot, IntVar],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
-        sorted_slots = sorted(slots)
-        # groupby week_number (without years
-        # because groupby is not actually group.by)
-        slots_per_week = groupby(
-            sorted_slots, lambda slot: slot.day.week_number
+        if not all(self.patterns):
+            raise ValueError("A pattern of shifts requires at least a day")
+        _slots = sorted(slots)
+        if not _slots or not self.patterns:
+            return
+
+        # the symbol of a day is 0 without a shift, or 1 + the position of
+        # the period of the shift
+        n_periods = len(type(_slots[0].period))
+        separator = n_periods + 1
+        patterns = tuple(
+            tuple(_pattern_symbols(day) for day in pattern)
+            for pattern in self.patterns
         )
+        finals, transitions = _pattern_automaton(patterns, self.max, n_periods)
+
+        calendar = CalendarTable.from_dates(slot.day.date for slot in _slots)
+        day_slots: list[list[tuple[int, int]]] = [
+            [] for _ in range(len(calendar))
+        ]
+        for slot, day in zip(
+            _slots, calendar.indices(slot.day.date for slot in _slots)
+        ):
+            day_slots[day].append(
+                (
+                    period_position(slot.period) + 1,
+                    employee_slots.shifts.index(slot),
+                )
+            )
 
-        # retrieve slots from first week
-        _, _slots_0 = next(slots_per_week)
-        slots_0 = list(_slots_0)
+        for employee_id in self.employee_ids:
+            variables = []
+            for day, _day_slots in enumerate(day_slots):
+                # the count of the occurrences restarts every month
+                if (
+                    self.monthly
+                    and day
+                    and calendar.month[day] != calendar.month[day - 1]
+                ):
+                    variables.append(model.NewConstant(separator))
+                variables.append(
+                    _day_symbol(model, employee_slots, employee_id, _day_slots)
+                )
+            model.AddAutomaton(variables, 0, finals, transitions)
 
-        n_weeks = set(
-            (slot.day.week_number, slot.day.iso_year) for slot in sorted_slots
-        )
 
-        for _ in range(len(n_weeks) - 1):
-            # roll over slots
-            slots_1 = slots_0
-            _, _slots_0 = next(slots_per_week)
-            slots_0 = list(_slots_0)
+def _pattern_symbols(day: PatternDay) -> frozenset[int]:
+    if day is None or isinstance(day, Period):
+        days: Collection[Optional[Period]] = [day]
+    else:
+        days = day
+    return frozenset(
+        0 if _day is None else period_position(_day) + 1 for _day in days
+    )
 
-            for employee_id in self.employee_ids:
-                _sum = sum(
-                    employee_slots[get_key(employee_id, slot.shift)]
-                    for slot in filter(
-                        lambda _slot: _slot.day.week_day in self.week_days,
-                        slots_0 + slots_1,
-                    )
+
+def _day_symbol(
+    model: CpModel,
+    employee_slots: EmployeeSlotMatrix,
+    employee_id: int,
+    day_slots: list[tuple[int, int]],
+) -> cp_model.IntVar:
+    symbols, variables = [], []
+    for symbol, index in day_slots:
+        var = employee_slots.get(get_key(employee_id, index))
+        if var is not None:
+            symbols.append(symbol)
+            variables.append(var)
+    if not variables:
+        return model.NewConstant(0)
+
+    day_symbol = model.NewIntVar(
+        0,
+        max(symbols),
+        employee_slots.name("d", employee_id, day_slots[0][1]),
+    )
+    model.AddAtMostOne(variables)
+    model.Add(day_symbol == weighted_sum(variables, symbols))
+    return day_symbol
+
+
+@lru_cache(maxsize=None)
+def _pattern_automaton(
+    patterns: tuple[tuple[frozenset[int], ...], ...], max: int, n_periods: int
+) -> tuple[list[int], list[tuple[int, int, int]]]:
+    """Final states and transitions of an automaton that accepts sequences
+    of days with at most max occurrences of the patterns
+
+    A state is the set of (pattern, position) pairs of the patterns that
+    are partially matched by the previous days, and the number of
+    occurrences so far. The separator (n_periods + 1) resets the number
+    of occurrences.
+    """
+    separator = n_periods + 1
+    start: tuple[frozenset[tuple[int, int]], int] = (frozenset(), 0)
+    states = {start: 0}
+    transitions = []
+    queue = [start]
+    while queue:
+        state = queue.pop()
+        matched, count = state
+        for symbol in range(separator + 1):
+            if symbol == separator:
+                _state = (matched, 0)
+            else:
+                # the previous matches and a new match of every pattern
+                candidates = matched | {
+                    (pattern, 0) for pattern in range(len(patterns))
+                }
+                _matched = {
+                    (pattern, position + 1)
+                    for pattern, position in candidates
+                    if symbol in patterns[pattern][position]
+                }
+                n_occurrences = sum(
+                    position == len(patterns[pattern])
+                    for pattern, position in _matched
+                )
+                if count + n_occurrences > max:
+                    continue
+                _state = (
+                    frozenset(
+                        (pattern, position)
+                        for pattern, position in _matched
+                        if position < len(patterns[pattern])
+                    ),
+                    count + n_occurrences,
                 )
-                model.Add(_sum <= self.max)
+            if _state not in states:
+                states[_state] = len(states)
+                queue.append(_state)
+            transitions.append((states[state], symbol, states[_state]))
+    return list(states.values()), transitions
@@ -4,13 +4,14 @@ from abc import abstractmethod
 from dataclasses import dataclass, field
 from itertools import groupby
 from math import ceil, floor
-from typing import Any, Iterator, Sequence
+from typing import Iterator, Optional, Sequence
 
 from ortools.sat.python import cp_model  # type: ignore
 
+from shift.domain.shifts.calendars import CalendarTable
 from shift.domain.shifts.shift import Slot
 from shift.domain.utils.model import Model
-from shift.domain.utils.utils import EmployeeSlot, get_key
+from shift.domain.utils.utils import EmployeeSlotMatrix
 
 
 @dataclass
@@ -38,7 +39,7 @@ class PlanningDistribution(Model):
         self,
         slots: Sequence[Slot],
         model: cp_model.CpModel,
-        employee_slots: dict[EmployeeSlot, cp_model.IntVar],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
         raise NotImplementedError
 
@@ -49,13 +50,24 @@ class PlanningDistribution(Model):
 
 @dataclass
 class NShifts(PlanningDistribution):
+    """Distribute the slots according to the hours of the employees
+
+    Arguments:
+        offset -- Allowed deviation (in shifts) from the share of an
+            employee
+        balance -- Shifts an employee has already been planned in excess of
+            (or, if negative, short of) the share of the employee, e.g. in
+            a previous window of a rolling horizon
+    """
+
     offset: int = 0
+    balance: dict[int, float] = field(default_factory=dict)
 
     def add_distribution(
         self,
         slots: Sequence[Slot],
         model: cp_model.CpModel,
-        employee_slots: dict[EmployeeSlot, Any],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
         _distribute_slots(
             slots,
@@ -64,6 +76,7 @@ class NShifts(PlanningDistribution):
             self.employee_hours,
             self.total_hours,
             self.offset,
+            self.balance,
         )
 
 
@@ -75,11 +88,18 @@ class NShiftsMonthly(PlanningDistribution):
         self,
         slots: Sequence[Slot],
         model: cp_model.CpModel,
-        employee_slots: dict[EmployeeSlot, Any],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
-        for month, _slots in groupby(slots, lambda slot: slot.day.month):
+        if not slots:
+            return
+
+        calendar = CalendarTable.from_dates(slot.day.date for slot in slots)
+        months = calendar.month[
+            calendar.indices(slot.day.date for slot in slots)
+        ]
+        for month, _slots in groupby(zip(slots, months), lambda slot: slot[1]):
             _distribute_slots(
-                list(_slots),
+                [slot for slot, _ in _slots],
                 model,
                 employee_slots,
                 self.employee_hours,
@@ -91,22 +111,25 @@ class NShiftsMonthly(PlanningDistribution):
 def _distribute_slots(
     slots: Sequence[Slot],
     model,
-    employee_slots,
+    employee_slots: EmployeeSlotMatrix,
     employee_hours,
     total_hours,
     offset,
+    balance: Optional[dict[int, float]] = None,
 ):
     total_shifts = sum(slot.n_employees for slot in slots)
+    indices = employee_slots.shifts.indices(slots)
+    _balance = balance or {}
 
     for id, hours in employee_hours.items():
-        n_shifts_employee = hours / total_hours * total_shifts
+        n_shifts_employee = max(
+            hours / total_hours * total_shifts - _balance.get(id, 0), 0
+        )
         min_shifts_employee, max_shifts_employee = _get_bounds(
             n_shifts_employee, offset
         )
 
-        sum_employee_slots = sum(
-            employee_slots[get_key(id, slot.shift)] for slot in slots
-        )
+        sum_employee_slots = employee_slots.row_sum(id, indices)
         model.Add(min_shifts_employee <= sum_employee_slots)
         model.Add(sum_employee_slots <= max_shifts_employee)
 
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from shift.domain.employee.availability import AvailabilityMatrix
+from shift.domain.employee.specifications import Specifications
+from shift.domain.planning.constraints import (
+    ShiftsPerDay,
+    SpecificShifts,
+    WorkersPerShift,
+)
+from shift.domain.planning.distributions import (
+    NShifts,
+    NShiftsMonthly,
+    PlanningDistribution,
+    _get_bounds,
+)
+from shift.domain.planning.planning import Planning
+from shift.domain.shifts.shift import Slot
+
+# number of shifts (or days) listed in the message of a conflict
+_MaxListed = 5
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """Necessary condition of a feasible planning that is violated
+
+    Arguments:
+        check -- Name of the check (e.g. supply)
+        message -- Explanation of the conflict
+    """
+
+    check: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.check}: {self.message}"
+
+
+class InfeasiblePlanning(ValueError):
+    def __init__(self, conflicts: Sequence[Conflict]) -> None:
+        super().__init__(
+            "Planning is infeasible:\n"
+            + "\n".join(f"- {conflict}" for conflict in conflicts)
+        )
+        self.conflicts = list(conflicts)
+
+
+def check_feasibility(
+    planning: Planning,
+    specifications: Iterable[Specifications] = (),
+) -> list[Conflict]:
+    """Cheap necessary conditions of a feasible planning, checked before
+    the model is built and solved
+
+    A planning without conflicts is not necessarily feasible, but a
+    planning with conflicts is certainly infeasible.
+
+    Arguments:
+        planning -- Planning to check
+        specifications -- Specifications of the employees
+
+    Returns:
+        Conflicts that make the planning infeasible
+    """
+    slots = list(planning.slots)
+    if not slots:
+        return []
+
+    workers_per_shift = getattr(
+        planning.constraints, "workers_per_shift", None
+    )
+    shifts_per_day = getattr(planning.constraints, "shifts_per_day", None)
+    availability = AvailabilityMatrix.from_specifications(
+        specifications, planning.shifts, planning.employee_ids
+    )
+
+    conflicts: list[Conflict] = []
+    if workers_per_shift is not None:
+        conflicts.extend(_check_supply(slots, availability, workers_per_shift))
+        if shifts_per_day is not None:
+            conflicts.extend(
+                _check_daily_supply(
+                    slots, availability, workers_per_shift, shifts_per_day
+                )
+            )
+    conflicts.extend(
+        _check_specific_shifts(
+            planning.constraints.specific_shifts, availability, shifts_per_day
+        )
+    )
+    for distribution in planning.retrieve_distributions():
+        conflicts.extend(
+            _check_distribution(slots, availability, distribution)
+        )
+    return conflicts
+
+
+def assert_feasible(
+    planning: Planning,
+    specifications: Iterable[Specifications] = (),
+) -> None:
+    """Raise if a necessary condition of a feasible planning is violated
+
+    Raises:
+        InfeasiblePlanning: Explanation of all conflicts
+    """
+    conflicts = check_feasibility(planning, specifications)
+    if conflicts:
+        raise InfeasiblePlanning(conflicts)
+
+
+def _rows(
+    availability: AvailabilityMatrix, employee_ids: Iterable[int]
+) -> list[int]:
+    _employee_ids = set(employee_ids)
+    return [
+        row
+        for row, employee_id in enumerate(availability.employee_ids)
+        if employee_id in _employee_ids
+    ]
+
+
+def _listed(values: Sequence[object]) -> str:
+    listed = ", ".join(str(value) for value in values[:_MaxListed])
+    if len(values) > _MaxListed:
+        listed += f" and {len(values) - _MaxListed} more"
+    return listed
+
+
+def _check_supply(
+    slots: list[Slot],
+    availability: AvailabilityMatrix,
+    workers_per_shift: WorkersPerShift,
+) -> Iterable[Conflict]:
+    # slots of a planning cover the shifts of the planning one by one
+    rows = _rows(availability, workers_per_shift.employee_ids)
+    supply = availability.available()[rows].sum(axis=0)
+    demand = np.array([slot.n_employees for slot in slots])
+
+    short = np.flatnonzero(supply < demand)
+    if short.size:
+        yield Conflict(
+            "supply",
+            f"{short.size} slot(s) require more employees than available: "
+            + _listed(
+                [
+                    f"{slots[index]} ({supply[index]} available)"
+                    for index in short
+                ]
+            ),
+        )
+
+
+def _check_daily_supply(
+    slots: list[Slot],
+    availability: AvailabilityMatrix,
+    workers_per_shift: WorkersPerShift,
+    shifts_per_day: ShiftsPerDay,
+) -> Iterable[Conflict]:
+    # employees limited to a single shift per day are counted once per day
+    single_rows = set(_rows(availability, shifts_per_day.employee_ids))
+    rows = _rows(availability, workers_per_shift.employee_ids)
+    available = availability.available()
+
+    short = []
+    columns = range(len(slots))
+    for _, _columns in groupby(columns, lambda column: slots[column].day.date):
+        day_columns = list(_columns)
+        demand = sum(slots[column].n_employees for column in day_columns)
+        n_available = available[rows][:, day_columns].sum(axis=1)
+        supply = sum(
+            min(int(n), 1) if row in single_rows else int(n)
+            for row, n in zip(rows, n_available)
+        )
+        if supply < demand:
+            short.append(
+                f"{slots[day_columns[0]].day} ({demand} required, "
+                f"{supply} available)"
+            )
+
+    if short:
+        yield Conflict(
+            "daily supply",
+            f"{len(short)} day(s) require more shifts than employees can "
+            f"work with a single shift per day: {_listed(short)}",
+        )
+
+
+def _check_specific_shifts(
+    specific_shifts: Iterable[SpecificShifts],
+    availability: AvailabilityMatrix,
+    shifts_per_day: Optional[ShiftsPerDay],
+) -> Iterable[Conflict]:
+    single_ids = (
+        set(shifts_per_day.employee_ids) if shifts_per_day is not None else ()
+    )
+    mandatory = defaultdict(list)
+    for specific_shift in specific_shifts:
+        for employee_id in specific_shift.employee_ids:
+            for shift, blocked in specific_shift.specific_shifts:
+                if blocked:
+                    continue
+                mandatory[employee_id].append(shift)
+                if not availability.is_available(employee_id, shift):
+                    yield Conflict(
+                        "specific shifts",
+                        f"{shift} is mandatory for employee {employee_id}, "
+                        "who is unavailable",
+                    )
+
+    for employee_id, shifts in mandatory.items():
+        if employee_id not in single_ids:
+            continue
+        days = defaultdict(list)
+        for shift in shifts:
+            days[shift.day.date].append(shift)
+        for _shifts in days.values():
+            if len({shift.period for shift in _shifts}) > 1:
+                yield Conflict(
+                    "specific shifts",
+                    f"{_listed(_shifts)} are all mandatory for employee "
+                    f"{employee_id}, who can only work a single shift per "
+                    "day",
+                )
+
+
+def _check_distribution(
+    slots: list[Slot],
+    availability: AvailabilityMatrix,
+    distribution: PlanningDistribution,
+) -> Iterable[Conflict]:
+    columns = list(range(len(slots)))
+    if isinstance(distribution, NShifts):
+        groups = [("the planning", columns)]
+        balance = distribution.balance
+        offset = distribution.offset
+    elif isinstance(distribution, NShiftsMonthly):
+        groups = [
+            (f"month {month}", list(_columns))
+            for month, _columns in groupby(
+                columns, lambda column: slots[column].day.date.month
+            )
+        ]
+        balance = {}
+        offset = distribution.offset
+    else:
+        return
+
+    available = availability.available()
+    rows = dict(zip(availability.employee_ids, range(len(available))))
+    total_hours = distribution.total_hours
+    for name, _columns in groups:
+        demand = sum(slots[column].n_employees for column in _columns)
+        minimum, maximum = 0, 0
+        for employee_id, hours in distribution.employee_hours.items():
+            lower, upper = _get_bounds(
+                max(
+                    hours / total_hours * demand - balance.get(employee_id, 0),
+                    0,
+                ),
+                offset,
+            )
+            minimum += max(lower, 0)
+            maximum += upper
+
+            n_available = (
+                int(available[rows[employee_id], _columns].sum())
+                if employee_id in rows
+                else len(_columns)
+            )
+            if lower > n_available:
+                yield Conflict(
+                    type(distribution).__name__,
+                    f"employee {employee_id} requires at least {lower} "
+                    f"shifts of {name}, but is available for {n_available}",
+                )
+
+        if not minimum <= demand <= maximum:
+            yield Conflict(
+                type(distribution).__name__,
+                f"{demand} shifts of {name} can not be distributed within "
+                f"the bounds of the employees ({minimum} - {maximum})",
+            )
@@ -2,12 +2,23 @@ from dataclasses import dataclass, field
 from datetime import date
 from typing import Iterable
 
-from shift.domain.planning.constraints import Constraints, PlanningConstraint
+from shift.domain.planning.constraints import (
+    Constraints,
+    ContractHours,
+    PlanningConstraint,
+)
 from shift.domain.planning.distributions import (
     Distributions,
     PlanningDistribution,
 )
-from shift.domain.shifts.shift import Day, Period, Shift, Slot, shift_range
+from shift.domain.shifts.shift import (
+    Day,
+    Period,
+    Shift,
+    ShiftRange,
+    Slot,
+    shift_range,
+)
 from shift.domain.utils.model import Model
 
 
@@ -23,14 +34,13 @@ class Planning(Model):
     distributions: Distributions = field(default_factory=Distributions)
 
     @property
-    def shifts(self) -> Iterable[Shift]:
+    def shifts(self) -> ShiftRange:
         first_shift = Shift(min(self.periods), Day(self.first_day))
         last_shift = Shift(max(self.periods), Day(self.last_day))
 
-        for shift in shift_range(
+        return shift_range(
             first_shift, last_shift, periods=self.periods, inclusive=True
-        ):
-            yield shift
+        )
 
     @property
     def employee_ids(self) -> list[int]:
@@ -53,6 +63,8 @@ class Planning(Model):
                     self.employee_hours.keys()
                 )
             )
+            if isinstance(constraint, ContractHours):
+                constraint.employee_hours = self.employee_hours
             yield constraint
 
     def retrieve_distributions(self) -> Iterable[PlanningDistribution]:
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property, lru_cache
+from typing import Iterable, Optional
+
+import holidays
+import numpy as np
+import numpy.typing as npt
+
+DefaultCountry = "NL"
+
+
+@lru_cache(maxsize=64)
+def _holidays_for_year(
+    country: str, subdiv: Optional[str], year: int
+) -> frozenset[date]:
+    return frozenset(
+        holidays.country_holidays(country, subdiv=subdiv, years=year)
+    )
+
+
+@dataclass(frozen=True)
+class HolidayCalendar:
+    """Holidays of a country (and optional subdivision)
+
+    The holidays of a year are built once and kept in a process-wide LRU
+    cache, so a lookup is a membership test on a set of dates.
+    """
+
+    country: str = DefaultCountry
+    subdiv: Optional[str] = None
+
+    def holidays(self, year: int) -> frozenset[date]:
+        return _holidays_for_year(self.country, self.subdiv, year)
+
+    def is_holiday(self, _date: date) -> bool:
+        return _date in self.holidays(_date.year)
+
+    def prefetch(self, first_year: int, last_year: int) -> None:
+        """Build the holidays for all years between first and last year
+
+        Arguments:
+            first_year -- First year to build (inclusive)
+            last_year -- Last year to build (inclusive)
+        """
+        for year in range(first_year, last_year + 1):
+            self.holidays(year)
+
+    def between(self, first_day: date, last_day: date) -> Iterable[date]:
+        self.prefetch(first_day.year, last_day.year)
+        for year in range(first_day.year, last_day.year + 1):
+            yield from sorted(
+                _date
+                for _date in self.holidays(year)
+                if first_day <= _date <= last_day
+            )
+
+
+_holiday_calendar = HolidayCalendar()
+
+
+def get_holiday_calendar() -> HolidayCalendar:
+    return _holiday_calendar
+
+
+def set_holiday_calendar(
+    country: str = DefaultCountry, subdiv: Optional[str] = None
+) -> HolidayCalendar:
+    """Configure the process-wide holiday calendar
+
+    Arguments:
+        country -- ISO 3166-1 code of the country
+        subdiv -- Optional subdivision (e.g. state or province) of the country
+
+    Returns:
+        The holiday calendar that is used from now on
+    """
+    global _holiday_calendar
+    # validate country and subdivision before replacing the calendar
+    holidays.country_holidays(country, subdiv=subdiv)
+    _holiday_calendar = HolidayCalendar(country, subdiv)
+    return _holiday_calendar
+
+
+class CalendarTable:
+    """Calendar attributes of all days between a first and last day
+
+    The attributes are precomputed once as (read-only) NumPy columns, which
+    are indexed by the position of a day relative to the first day.
+    """
+
+    def __init__(
+        self,
+        first_day: date,
+        last_day: date,
+        holiday_calendar: Optional[HolidayCalendar] = None,
+    ) -> None:
+        if last_day < first_day:
+            raise ValueError(
+                f"The last day ({last_day}) should not be before the first "
+                f"day ({first_day})"
+            )
+        self.first_day = first_day
+        self.last_day = last_day
+        self.holiday_calendar = holiday_calendar or get_holiday_calendar()
+
+        dates = np.arange(
+            np.datetime64(first_day, "D"),
+            np.datetime64(last_day, "D") + 1,
+        )
+        # days since 1970-01-01, which was a thursday
+        days = dates.astype(np.int64)
+        week_day = (days + 3) % 7 + 1
+        # the iso year (and week) is determined by the thursday of the week
+        thursday = days - week_day + 4
+        iso_year = thursday.astype("datetime64[D]").astype("datetime64[Y]")
+        first_thursday = iso_year.astype("datetime64[D]").astype(np.int64)
+
+        self.week_day = self._column(week_day)
+        self.week_number = self._column((thursday - first_thursday) // 7 + 1)
+        self.iso_year = self._column(iso_year.astype(np.int64) + 1970)
+        # position of the (iso) week relative to the week of the first day
+        self.week_index = self._column((thursday - thursday[0]) // 7)
+        self.month = self._column(
+            dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        )
+        self.weekend = self._column(week_day > 5)
+
+        holiday = np.zeros(len(dates), dtype=bool)
+        for _date in self.holiday_calendar.between(first_day, last_day):
+            holiday[self.index(_date)] = True
+        self.holiday = self._column(holiday)
+
+    @classmethod
+    def between(
+        cls,
+        first_day: date,
+        last_day: date,
+        holiday_calendar: Optional[HolidayCalendar] = None,
+    ) -> CalendarTable:
+        """Retrieve a (cached) calendar table for the days between first and
+        last day
+        """
+        return _calendar_table(
+            first_day, last_day, holiday_calendar or get_holiday_calendar()
+        )
+
+    @classmethod
+    def from_dates(cls, dates: Iterable[date]) -> CalendarTable:
+        _dates = list(dates)
+        if not _dates:
+            raise ValueError("At least a single date is required")
+        return cls.between(min(_dates), max(_dates))
+
+    @staticmethod
+    def _column(values: npt.ArrayLike) -> npt.NDArray:
+        column = np.asarray(values)
+        if column.dtype != bool:
+            column = column.astype(np.int16)
+        column.flags.writeable = False
+        return column
+
+    @cached_property
+    def weeks(self) -> dict[tuple[int, int], int]:
+        """Position of every week (see week_index), keyed on the iso year
+        and week number of the week
+        """
+        return {
+            (int(iso_year), int(week_number)): int(week_index)
+            for iso_year, week_number, week_index in zip(
+                self.iso_year, self.week_number, self.week_index
+            )
+        }
+
+    def __len__(self) -> int:
+        return (self.last_day - self.first_day).days + 1
+
+    def __contains__(self, _date: object) -> bool:
+        if not isinstance(_date, date):
+            return False
+        return self.first_day <= _date <= self.last_day
+
+    def index(self, _date: date) -> int:
+        if _date not in self:
+            raise KeyError(
+                f"{_date} is not between {self.first_day} and {self.last_day}"
+            )
+        return (_date - self.first_day).days
+
+    def indices(self, dates: Iterable[date]) -> npt.NDArray[np.int64]:
+        first_ordinal = self.first_day.toordinal()
+        indices = np.fromiter(
+            (_date.toordinal() for _date in dates), dtype=np.int64
+        )
+        indices -= first_ordinal
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+            raise KeyError(
+                f"Not all dates are between {self.first_day} and "
+                f"{self.last_day}"
+            )
+        return indices
+
+
+@lru_cache(maxsize=16)
+def _calendar_table(
+    first_day: date, last_day: date, holiday_calendar: HolidayCalendar
+) -> CalendarTable:
+    return CalendarTable(first_day, last_day, holiday_calendar)
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Literal, Sequence, cast
 
-import holidays
+from shift.domain.shifts.calendars import get_holiday_calendar
 
 WeekDay = Literal[1, 2, 3, 4, 5, 6, 7]
 WeekDays: Sequence[WeekDay] = (1, 2, 3, 4, 5, 6, 7)
@@ -34,7 +34,7 @@ class Day:
         return self.week_day > 5
 
     def is_holiday(self) -> bool:
-        return self.date in holidays.country_holidays("NL")
+        return get_holiday_calendar().is_holiday(self.date)
 
     def __repr__(self) -> str:
         _day = self.date.strftime("%A %-d %B")
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+from datetime import time
 from enum import IntEnum
+from functools import lru_cache
+from typing import Mapping
+
+# start times of the periods, keyed on the type and name of the period (as
+# periods of different types are equal if their values are equal)
+_starts: dict[tuple[type[Period], str], time] = {}
 
 
 class Period(IntEnum):
@@ -9,7 +16,50 @@ class Period(IntEnum):
     def __hash__(self) -> int:
         return super().__hash__()
 
+    @property
+    def start(self) -> time:
+        """Start time of the shifts of the period
+
+        Raises:
+            ValueError: No start time is set for the period
+        """
+        try:
+            return _starts[(type(self), self.name)]
+        except KeyError:
+            raise ValueError(f"{self!r} has no start time") from None
+
 
 class DayAndEvening(Period):
     day = 1
     evening = 2
+
+
+def set_period_starts(starts: Mapping[Period, time]) -> None:
+    """Configure the (process-wide) start times of periods
+
+    Arguments:
+        starts -- Start time of every period
+    """
+    for period, start in starts.items():
+        _starts[(type(period), period.name)] = start
+
+
+def get_period_starts() -> list[tuple[Period, time]]:
+    """Configured (process-wide) start time of every period, as pairs
+    (as periods of different types can not be the keys of a single mapping)
+    """
+    return [
+        (period_type[name], start)
+        for (period_type, name), start in _starts.items()
+    ]
+
+
+set_period_starts(
+    {DayAndEvening.day: time(7), DayAndEvening.evening: time(15)}
+)
+
+
+@lru_cache(maxsize=None, typed=True)
+def period_position(period: Period) -> int:
+    """Position of a period within the (sorted) periods it belongs to"""
+    return sorted(type(period)).index(period)
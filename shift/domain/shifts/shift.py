@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 import itertools
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from datetime import timedelta
-from itertools import product
-from typing import Iterable, Iterator, Sequence, Set, TypeVar, Union
+from datetime import date, datetime, timedelta
+from functools import cached_property
+from typing import (
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from shift.domain.shifts.days import Day, WeekDay, WeekDays
-from shift.domain.shifts.periods import Period
+from shift.domain.shifts.periods import Period, period_position
 from shift.domain.utils.model import Model
 
 RegularShiftDuration = 8
@@ -48,7 +58,26 @@ class Shift(Model):
         return f"{self.period.name} shift on {self.day}"
 
     def __hash__(self) -> int:
-        return hash((self.period, self.day, self.duration))
+        return hash((self.period, self.day.date, self.duration))
+
+    @property
+    def start(self) -> datetime:
+        """Start of the shift, on the day at the start time of the period"""
+        return datetime.combine(self.day.date, self.period.start)
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(hours=self.duration)
+
+    @property
+    def ordinal(self) -> int:
+        """Position of the shift in the sequence of all shifts (of all
+        periods the period of the shift belongs to)
+        """
+        n_periods = len(type(self.period))
+        return self.day.date.toordinal() * n_periods + period_position(
+            self.period
+        )
 
 
 S = TypeVar("S", bound=Shift)
@@ -79,7 +108,7 @@ class Planned(Shift):
 class Slot(Shift):
     n_employees: int = 1
 
-    @property
+    @cached_property
     def shift(self) -> Shift:
         return Shift(self.period, self.day, self.duration)
 
@@ -87,31 +116,199 @@ class Slot(Shift):
         return f"slot {super().__repr__()}, for {self.n_employees} employee(s)"
 
 
+class ShiftRegistry:
+    """Interns shifts and maps them on dense integer indices
+
+    Every (day, period) combination is stored once, the index of a shift is
+    the order in which it was added to the registry.
+    """
+
+    __slots__ = ("_shifts", "_indices")
+
+    def __init__(self, shifts: Iterable[Shift] = ()) -> None:
+        self._shifts: list[Shift] = []
+        self._indices: dict[tuple[int, Period], int] = {}
+        for shift in shifts:
+            self.add(shift)
+
+    @staticmethod
+    def _key(shift: Shift) -> tuple[int, Period]:
+        return shift.day.date.toordinal(), shift.period
+
+    def add(self, shift: Shift) -> int:
+        """Add shift to the registry (if not yet registered)
+
+        Arguments:
+            shift -- Shift (or any variant of a shift) to register
+
+        Returns:
+            Index of the shift
+        """
+        key = self._key(shift)
+        index = self._indices.get(key)
+        if index is None:
+            index = self._indices[key] = len(self._shifts)
+            self._shifts.append(Shift(shift.period, shift.day, shift.duration))
+        return index
+
+    def index(self, shift: Shift) -> int:
+        try:
+            return self._indices[self._key(shift)]
+        except KeyError:
+            raise KeyError(f"{shift} is not registered") from None
+
+    def get_index(self, shift: Shift) -> Optional[int]:
+        return self._indices.get(self._key(shift))
+
+    def indices(self, shifts: Iterable[Shift]) -> list[int]:
+        return [self.index(shift) for shift in shifts]
+
+    def __getitem__(self, index: int) -> Shift:
+        return self._shifts[index]
+
+    def __contains__(self, shift: object) -> bool:
+        if not isinstance(shift, Shift):
+            return False
+        return self._key(shift) in self._indices
+
+    def __iter__(self) -> Iterator[Shift]:
+        return iter(self._shifts)
+
+    def __len__(self) -> int:
+        return len(self._shifts)
+
+
+class ShiftRange(Sequence[Shift]):
+    """Lazy range of shifts between a first and last shift
+
+    Shifts are represented by an ordinal (day ordinal times the number of
+    periods plus the position of the period), so the length, membership
+    and index of a shift are computed arithmetically.
+    """
+
+    __slots__ = ("periods", "_positions", "_ordinals")
+
+    def __init__(
+        self,
+        start: Shift,
+        end: Shift,
+        periods: Iterable[Period],
+        inclusive: bool = True,
+    ) -> None:
+        if end < start:
+            raise ValueError(f"{end} is before {start}")
+
+        self.periods = sorted(periods)
+        self._positions = {
+            period: position for position, period in enumerate(self.periods)
+        }
+        n_periods = len(self.periods)
+
+        # position of first (and last) period within the range, on the day
+        # of the start (and end) shift
+        start_position = bisect_left(self.periods, start.period)
+        stop_position = (
+            bisect_right(self.periods, end.period)
+            if inclusive
+            else bisect_left(self.periods, end.period)
+        )
+        self._ordinals = range(
+            start.day.date.toordinal() * n_periods + start_position,
+            end.day.date.toordinal() * n_periods + stop_position,
+        )
+
+    @classmethod
+    def _from_ordinals(
+        cls, periods: list[Period], ordinals: range
+    ) -> ShiftRange:
+        shift_range = cls.__new__(cls)
+        shift_range.periods = periods
+        shift_range._positions = {
+            period: position for position, period in enumerate(periods)
+        }
+        shift_range._ordinals = ordinals
+        return shift_range
+
+    @property
+    def ordinals(self) -> range:
+        return self._ordinals
+
+    def ordinal(self, shift: Shift) -> int:
+        """Ordinal of a shift, regardless whether it is within the range
+
+        Arguments:
+            shift -- Shift with a period of the range
+
+        Raises:
+            ValueError: The period of the shift is not part of the range
+
+        Returns:
+            Ordinal of the shift
+        """
+        position = self._positions.get(shift.period)
+        if position is None:
+            raise ValueError(f"{shift.period!r} is not part of the periods")
+        return shift.day.date.toordinal() * len(self.periods) + position
+
+    def from_ordinal(self, ordinal: int) -> Shift:
+        day_ordinal, position = divmod(ordinal, len(self.periods))
+        return Shift(
+            self.periods[position], Day(date.fromordinal(day_ordinal))
+        )
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    @overload
+    def __getitem__(self, index: int) -> Shift:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ShiftRange:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Shift, ShiftRange]:
+        if isinstance(index, slice):
+            return self._from_ordinals(self.periods, self._ordinals[index])
+        return self.from_ordinal(self._ordinals[index])
+
+    def __iter__(self) -> Iterator[Shift]:
+        return map(self.from_ordinal, self._ordinals)
+
+    def __reversed__(self) -> Iterator[Shift]:
+        return map(self.from_ordinal, reversed(self._ordinals))
+
+    def __contains__(self, shift: object) -> bool:
+        if not isinstance(shift, Shift) or shift.period not in self._positions:
+            return False
+        return self.ordinal(shift) in self._ordinals
+
+    def index(
+        self, shift: Shift, start: int = 0, stop: Optional[int] = None
+    ) -> int:
+        if shift not in self:
+            raise ValueError(f"{shift} is not in range")
+        index = self._ordinals.index(self.ordinal(shift))
+        # start and stop are interpreted as in a slice (like list.index)
+        if index not in range(len(self))[start:stop]:
+            raise ValueError(f"{shift} is not in range")
+        return index
+
+    def count(self, shift: Shift) -> int:
+        return int(shift in self)
+
+    def __repr__(self) -> str:
+        if not self:
+            return "ShiftRange()"
+        return f"ShiftRange({self[0]} - {self[-1]})"
+
+
 def shift_range(
     *_args: Shift, periods: Iterable[Period], inclusive: bool = True
-) -> Iterator[Shift]:
-    if _args[1] < _args[0]:
-        raise ValueError
-
-    # get range of days between start and end
-    day_range = range(
-        (_args[1].day.date - _args[0].day.date + timedelta(days=1)).days
-    )
-
-    for _day, _period in product(
-        (_args[0].day.date + timedelta(delta) for delta in day_range),
-        sorted(period for period in periods),
-    ):
-        shift = Shift(_period, Day(_day))
-        # Prevent shift on same day but earlier period
-        if shift < _args[0]:
-            continue
-        # Prevent shift on same day but later period
-        elif inclusive and shift > _args[1]:
-            continue
-        elif not inclusive and not shift < _args[1]:
-            continue
-        yield shift
+) -> ShiftRange:
+    return ShiftRange(_args[0], _args[1], periods, inclusive=inclusive)
 
 
 def get_consecutive_shifts(
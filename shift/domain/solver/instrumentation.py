@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+from ortools.sat.python import cp_model  # type: ignore
+
+
+@dataclass(frozen=True)
+class StageStatistics:
+    """Statistics of adding a single component to the model
+
+    Arguments:
+        stage -- Stage of the build (constraints, distributions or
+            optimization)
+        component -- Name of the component (e.g. MaxConsecutiveShifts)
+        wall_time -- Wall time in seconds
+        peak_memory -- Peak of the memory allocated in bytes, 0 if memory
+            is not traced
+        n_variables -- Number of variables added to the model
+        n_constraints -- Number of constraints added to the model
+    """
+
+    stage: str
+    component: str
+    wall_time: float
+    peak_memory: int
+    n_variables: int
+    n_constraints: int
+
+
+BuildHook = Callable[[StageStatistics], None]
+
+
+@dataclass
+class Instrumentation:
+    """Records statistics of every component that is added to the model
+
+    Arguments:
+        trace_memory -- Trace the peak memory (with tracemalloc), which slows
+            down the build
+        hooks -- Called with the statistics of every component
+    """
+
+    trace_memory: bool = False
+    hooks: list[BuildHook] = field(default_factory=list)
+    statistics: list[StageStatistics] = field(init=False, default_factory=list)
+
+    @contextmanager
+    def measure(
+        self, model: cp_model.CpModel, stage: str, component: object
+    ) -> Iterator[None]:
+        proto = model.Proto()
+        n_variables, n_constraints = (
+            len(proto.variables),
+            len(proto.constraints),
+        )
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = perf_counter() - start
+
+            peak_memory = 0
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                peak_memory = max(peak - memory, 0)
+                if started_tracing:
+                    tracemalloc.stop()
+
+            proto = model.Proto()
+            self.record(
+                StageStatistics(
+                    stage=stage,
+                    component=type(component).__name__,
+                    wall_time=wall_time,
+                    peak_memory=peak_memory,
+                    n_variables=len(proto.variables) - n_variables,
+                    n_constraints=len(proto.constraints) - n_constraints,
+                )
+            )
+
+    def record(self, statistics: StageStatistics) -> None:
+        self.statistics.append(statistics)
+        for hook in self.hooks:
+            hook(statistics)
+
+    def report(self) -> list[dict[str, Any]]:
+        """Statistics of all components as (JSON serializable) dicts"""
+        return [asdict(statistics) for statistics in self.statistics]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Totals of the statistics per stage
+
+        Returns:
+            Wall time, (max) peak memory, number of variables and
+            constraints per stage
+        """
+        summary: dict[str, dict[str, float]] = {}
+        for statistics in self.statistics:
+            totals = summary.setdefault(
+                statistics.stage,
+                {
+                    "wall_time": 0.0,
+                    "peak_memory": 0,
+                    "n_variables": 0,
+                    "n_constraints": 0,
+                },
+            )
+            totals["wall_time"] += statistics.wall_time
+            totals["peak_memory"] = max(
+                totals["peak_memory"], statistics.peak_memory
+            )
+            totals["n_variables"] += statistics.n_variables
+            totals["n_constraints"] += statistics.n_constraints
+        return summary
@@ -1,12 +1,18 @@
 from dataclasses import dataclass, field
 from typing import Sequence
 
+import numpy as np
 from ortools.sat.python import cp_model  # type: ignore
 
+from shift.domain.shifts.calendars import CalendarTable
 from shift.domain.shifts.days import WeekDay, WeekDays
-from shift.domain.shifts.shift import Slot
+from shift.domain.shifts.shift import Planned, Slot
 from shift.domain.utils.model import Model
-from shift.domain.utils.utils import EmployeeSlot, get_key
+from shift.domain.utils.utils import (
+    EmployeeSlotMatrix,
+    linear_sum,
+    weighted_sum,
+)
 
 
 @dataclass
@@ -18,37 +24,50 @@ class PlanningOptimization(Model):
         self,
         slots: Sequence[Slot],
         model: cp_model.CpModel,
-        employee_slots: dict[EmployeeSlot, cp_model.IntVar],
+        employee_slots: EmployeeSlotMatrix,
     ) -> None:
+        if not slots:
+            return
+
         any_planned_on_week_day = {}
         max_planned_on_week_day = {}
 
+        calendar = CalendarTable.from_dates(slot.day.date for slot in slots)
+        week_days = calendar.week_day[
+            calendar.indices(slot.day.date for slot in slots)
+        ]
+        indices = np.asarray(employee_slots.shifts.indices(slots))
+        indices_on_week_day = {
+            week_day: indices[week_days == week_day].tolist()
+            for week_day in self.week_days
+        }
+
         for employee_id in self.employee_ids:
             n_planned_on_week_day = []
             max_planned_on_week_day[employee_id] = model.NewIntVar(
                 0,
                 len(slots),
-                f"max planned on week day <employee: {employee_id}>",
+                employee_slots.name("m", employee_id),
             )
             for week_day in self.week_days:
                 key = (employee_id, week_day)
 
                 any_planned_on_week_day[key] = model.NewBoolVar(
-                    f"any planned <employee: {key[0]}; week day: {key[1]}>"
+                    employee_slots.name("a", *key)
                 )
 
-                _slots = [
-                    employee_slots[get_key(employee_id, slot.shift)]
-                    for slot in slots
-                    if slot.day.week_day == week_day
-                ]
+                _slots = employee_slots.row(
+                    employee_id, indices_on_week_day[week_day]
+                )
 
+                # nothing can be planned if the employee is unavailable
+                # for all slots on the week day
                 model.AddMaxEquality(
                     any_planned_on_week_day[key],
-                    _slots,
+                    _slots or [0],
                 )
 
-                n_planned_on_week_day.append(sum(_slots))
+                n_planned_on_week_day.append(linear_sum(_slots))
 
             model.AddMaxEquality(
                 max_planned_on_week_day[employee_id], n_planned_on_week_day
@@ -57,11 +76,67 @@ class PlanningOptimization(Model):
         # TODO: Add balance (don't use a single employee to dump)
 
         model.Minimize(
-            sum(
-                any_planned for any_planned in any_planned_on_week_day.values()
-            )
-            + sum(
-                -max_planned
-                for max_planned in max_planned_on_week_day.values()
+            weighted_sum(
+                [
+                    *any_planned_on_week_day.values(),
+                    *max_planned_on_week_day.values(),
+                ],
+                [1] * len(any_planned_on_week_day)
+                + [-1] * len(max_planned_on_week_day),
             )
         )
+
+
+@dataclass
+class MinimizeChanges(Model):
+    """Minimize the changes with respect to a previous (e.g. published)
+    planning, added to the objective that is already set on the model
+
+    Arguments:
+        planned -- Planned shifts of the previous planning
+        weight -- Weight of a single change within the objective
+    """
+
+    planned: list[Planned] = field(default_factory=list)
+    weight: int = 1
+
+    def add_optimization(
+        self,
+        slots: Sequence[Slot],
+        model: cp_model.CpModel,
+        employee_slots: EmployeeSlotMatrix,
+    ) -> None:
+        model.Minimize(
+            _objective(model) + self.weight * self.changes(employee_slots)
+        )
+
+    def changes(
+        self, employee_slots: EmployeeSlotMatrix
+    ) -> cp_model.LinearExprT:
+        """Number of employee slots that differ from the previous planning
+
+        Only shifts of the previous planning are compared; assignments of
+        employees without a variable (e.g. sick) are always changed.
+        """
+        assigned, known = employee_slots.assignment(self.planned)
+        present = employee_slots.present & known
+        rows, indices = np.nonzero(present)
+
+        # a change is 1 - var if the employee was assigned, and var if not
+        weights = np.where(assigned[rows, indices], -1, 1)
+        return weighted_sum(
+            employee_slots.vars[rows, indices].tolist(), weights.tolist()
+        ) + int(assigned[:, known].sum())
+
+
+def _objective(model: cp_model.CpModel) -> cp_model.LinearExprT:
+    """Objective (to minimize) that is set on the model, 0 if none"""
+    if not model.HasObjective():
+        return 0
+    objective = model.Proto().objective
+    if objective.scaling_factor < 0:
+        raise ValueError("Only a minimized objective can be extended")
+    return weighted_sum(
+        [model.GetIntVarFromProtoIndex(var) for var in objective.vars],
+        objective.coeffs,
+    ) + int(objective.offset)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Iterable, Iterator, Optional
+
+from shift.domain.employee.specifications import Specifications
+from shift.domain.planning.distributions import NShifts
+from shift.domain.planning.planning import Planning
+from shift.domain.shifts.shift import Period, Planned, Slot
+from shift.domain.solver.optimizers import PlanningOptimization
+from shift.domain.solver.solver import Solver, SolverResult
+
+
+@dataclass(frozen=True)
+class Window:
+    """Window of a rolling horizon
+
+    Arguments:
+        first_day -- First day that is planned (and committed) in the window
+        last_day -- Last day that is committed in the window
+        lookahead_day -- Last day of the model of the window, days after the
+            last (committed) day are planned again in the next window
+    """
+
+    first_day: date
+    last_day: date
+    lookahead_day: date
+
+    def commits(self, day: date) -> bool:
+        return self.first_day <= day <= self.last_day
+
+    def plans(self, day: date) -> bool:
+        return self.first_day <= day <= self.lookahead_day
+
+
+@dataclass
+class RollingResult:
+    """Outcome of solving a planning with a rolling horizon
+
+    Arguments:
+        windows -- Windows that were solved, up to and including the first
+            infeasible window
+        results -- Result of the solve of every window
+        planned -- Committed planned shifts of all (feasible) windows
+    """
+
+    windows: list[Window] = field(default_factory=list)
+    results: list[SolverResult] = field(default_factory=list)
+    planned: list[Planned] = field(default_factory=list)
+
+    @property
+    def is_feasible(self) -> bool:
+        return all(result.is_feasible for result in self.results)
+
+    @property
+    def wall_time(self) -> float:
+        return sum(result.wall_time for result in self.results)
+
+
+@dataclass
+class RollingHorizon:
+    """Solve a planning as a sequence of overlapping windows
+
+    Every window is solved with the tail of the previous window fixed, so
+    constraints over consecutive (or recurrent) shifts hold across the
+    boundary of the windows, and the balance of the distribution of the
+    shifts is carried forward. Optimality is traded for predictable solve
+    times of long plannings.
+
+    Arguments:
+        planning -- Planning to solve
+        months -- Number of (calendar) months committed per window
+        lookahead -- Number of days after a window that are included in the
+            model of the window, but are planned again in the next window
+        tail -- Number of days of the previous window that are fixed in the
+            model of a window (should cover the windows of the constraints)
+        specifications -- Specifications of the employees
+        optimization -- Optimization of every window
+    """
+
+    planning: Planning
+    months: int = 1
+    lookahead: int = 7
+    tail: int = 7
+    specifications: list[Specifications] = field(default_factory=list)
+    optimization: Optional[PlanningOptimization] = None
+
+    def windows(self) -> Iterator[Window]:
+        first_day = self.planning.first_day
+        while first_day <= self.planning.last_day:
+            last_day = min(
+                _add_months(first_day, self.months) - timedelta(days=1),
+                self.planning.last_day,
+            )
+            lookahead_day = min(
+                last_day + timedelta(days=self.lookahead),
+                self.planning.last_day,
+            )
+            yield Window(first_day, last_day, lookahead_day)
+            first_day = last_day + timedelta(days=1)
+
+    def solve(self, **parameters: Any) -> RollingResult:
+        """Solve the windows in sequence
+
+        Arguments:
+            parameters -- Parameters of the solve of every window (see
+                Solver.solve)
+
+        Returns:
+            Result of the rolling horizon, solving stops at the first
+            infeasible window
+        """
+        slots = {
+            (slot.period, slot.day.date): slot for slot in self.planning.slots
+        }
+        constraints = list(self.planning.retrieve_constraints())
+        distributions = list(self.planning.retrieve_distributions())
+        employee_ids = self.planning.employee_ids
+        # the id of the planning is only set once it is stored
+        planning_id = getattr(self.planning, "id", 0)
+
+        # the balance of a distribution (e.g. carried over from a previous
+        # planning) is restored once all windows are solved
+        balances = {
+            id(distribution): distribution.balance
+            for distribution in distributions
+            if isinstance(distribution, NShifts)
+        }
+
+        result = RollingResult()
+        try:
+            for window in self.windows():
+                # fix the tail of the committed shifts before the window
+                first_tail_day = window.first_day - timedelta(days=self.tail)
+                tail = [
+                    planned
+                    for planned in result.planned
+                    if planned.day.date >= first_tail_day
+                ]
+                window_slots = [
+                    slot
+                    for slot in slots.values()
+                    if window.plans(slot.day.date)
+                ]
+
+                solver = Solver(
+                    planning_id,
+                    employee_ids,
+                    [
+                        slots[(planned.period, planned.day.date)]
+                        for planned in tail
+                    ]
+                    + window_slots,
+                    optimization=self.optimization,
+                    specifications=self.specifications,
+                )
+                solver.fix(tail)
+                solver.add_constraints(constraints)
+                _set_balance(distributions, balances, result.planned, slots)
+                solver.add_distributions(distributions, window_slots)
+                solver.add_optimization()
+
+                window_result = solver.solve(**parameters)
+                result.windows.append(window)
+                result.results.append(window_result)
+                if not window_result.is_feasible:
+                    break
+                result.planned.extend(
+                    planned
+                    for planned in window_result.planned
+                    if window.commits(planned.day.date)
+                )
+        finally:
+            for distribution in distributions:
+                if isinstance(distribution, NShifts):
+                    distribution.balance = balances[id(distribution)]
+        return result
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _set_balance(
+    distributions: Iterable[Any],
+    balances: dict[int, dict[int, float]],
+    planned: list[Planned],
+    slots: dict[tuple[Period, date], Slot],
+) -> None:
+    # shifts planned in excess of the share of every employee, on top of
+    # the original balance of the distribution
+    total_shifts = sum(
+        slots[(_planned.period, _planned.day.date)].n_employees
+        for _planned in planned
+    )
+    n_planned = Counter(
+        employee_id
+        for _planned in planned
+        for employee_id in _planned.employee_ids
+    )
+    for distribution in distributions:
+        if isinstance(distribution, NShifts):
+            balance = balances[id(distribution)]
+            distribution.balance = {
+                employee_id: balance.get(employee_id, 0)
+                + n_planned[employee_id]
+                - hours / distribution.total_hours * total_shifts
+                for employee_id, hours in distribution.employee_hours.items()
+            }
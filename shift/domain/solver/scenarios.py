@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import time
+from multiprocessing.context import BaseContext
+from copy import deepcopy
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Iterable, Optional
+
+from shift.domain.employee.specifications import Specifications
+from shift.domain.planning.planning import Planning
+from shift.domain.shifts.calendars import (
+    HolidayCalendar,
+    get_holiday_calendar,
+    set_holiday_calendar,
+)
+from shift.domain.shifts.periods import (
+    Period,
+    get_period_starts,
+    set_period_starts,
+)
+from shift.domain.solver.optimizers import PlanningOptimization
+from shift.domain.solver.solver import Solver, SolverResult
+
+
+@dataclass
+class Scenario:
+    """Variant of a planning
+
+    Arguments:
+        name -- Name of the scenario
+        overrides -- Attributes of the planning to override, keyed on their
+            (dotted) path, e.g. employees_per_shift or
+            constraints.max_recurrent_shifts.0.max
+    """
+
+    name: str
+    overrides: dict[str, Any] = field(default_factory=dict)
+
+    def apply(self, planning: Planning) -> Planning:
+        """Copy of the planning with the overrides applied"""
+        _planning = deepcopy(planning)
+        for path, value in self.overrides.items():
+            *parents, attribute = path.split(".")
+            target: Any = _planning
+            for parent in parents:
+                target = (
+                    target[int(parent)]
+                    if parent.isdigit()
+                    else getattr(target, parent)
+                )
+            if attribute.isdigit():
+                target[int(attribute)] = value
+            elif not hasattr(target, attribute):
+                raise AttributeError(
+                    f"{path} of scenario {self.name} does not exist"
+                )
+            else:
+                setattr(target, attribute, value)
+        return _planning
+
+
+@dataclass
+class ScenarioResult:
+    """Outcome of solving a scenario
+
+    Arguments:
+        scenario -- Name of the scenario
+        build_time -- Wall time of building the model in seconds
+        result -- Result of the solve of the scenario
+    """
+
+    scenario: str
+    build_time: float
+    result: SolverResult = field(repr=False)
+
+    @property
+    def is_feasible(self) -> bool:
+        return self.result.is_feasible
+
+
+def solve_scenarios(
+    planning: Planning,
+    scenarios: Iterable[Scenario],
+    specifications: Optional[list[Specifications]] = None,
+    optimization: Optional[PlanningOptimization] = None,
+    cpu_budget: Optional[int] = None,
+    max_processes: Optional[int] = None,
+    mp_context: Optional[BaseContext] = None,
+    **parameters: Any,
+) -> list[ScenarioResult]:
+    """Solve the scenarios of a planning in parallel, every scenario in a
+    separate process
+
+    Arguments:
+        planning -- Base planning
+        scenarios -- Variants of the base planning
+        specifications -- Specifications of the employees (of all scenarios)
+        optimization -- Optimization of all scenarios
+        cpu_budget -- Number of cores that are shared by the solves,
+            defaults to all cores
+        max_processes -- Maximum number of scenarios that are solved at the
+            same time, defaults to the number of scenarios (within the CPU
+            budget)
+        mp_context -- Multiprocessing context of the processes, defaults to
+            the default context of the platform. The period start times
+            and the holiday calendar are passed to every process, so
+            (custom) periods should be defined at module level
+        parameters -- Parameters of the solves (see Solver.solve), the
+            number of workers of every solve follows from the CPU budget
+
+    Raises:
+        TypeError: The number of workers is passed as a parameter
+
+    Returns:
+        Result of every scenario, in the order of the scenarios
+    """
+    if "num_workers" in parameters:
+        raise TypeError(
+            "The number of workers of a scenario follows from the CPU "
+            "budget, num_workers can not be passed"
+        )
+    _scenarios = list(scenarios)
+    if not _scenarios:
+        return []
+
+    _cpu_budget = cpu_budget or os.cpu_count() or 1
+    n_processes = min(
+        max_processes or len(_scenarios), len(_scenarios), _cpu_budget
+    )
+    # the cores are divided over the solves that run at the same time
+    parameters["num_workers"] = max(_cpu_budget // n_processes, 1)
+
+    # the process-wide configuration is not inherited by spawned processes
+    with ProcessPoolExecutor(
+        max_workers=n_processes,
+        mp_context=mp_context,
+        initializer=_initialize_process,
+        initargs=(get_period_starts(), get_holiday_calendar()),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _solve_scenario,
+                scenario.name,
+                scenario.apply(planning),
+                specifications,
+                optimization,
+                parameters,
+            )
+            for scenario in _scenarios
+        ]
+        return [future.result() for future in futures]
+
+
+def comparison_table(results: Iterable[ScenarioResult]) -> list[dict]:
+    """Status, objective and times of the scenarios as (JSON serializable)
+    rows
+    """
+    return [
+        {
+            "scenario": result.scenario,
+            "status": result.result.status,
+            "objective": result.result.objective,
+            "bound": result.result.bound,
+            "build_time": result.build_time,
+            "solve_time": result.result.wall_time,
+        }
+        for result in results
+    ]
+
+
+def _initialize_process(
+    period_starts: list[tuple[Period, time]],
+    holiday_calendar: HolidayCalendar,
+) -> None:
+    for period, start in period_starts:
+        set_period_starts({period: start})
+    set_holiday_calendar(holiday_calendar.country, holiday_calendar.subdiv)
+
+
+def _solve_scenario(
+    name: str,
+    planning: Planning,
+    specifications: Optional[list[Specifications]],
+    optimization: Optional[PlanningOptimization],
+    parameters: dict[str, Any],
+) -> ScenarioResult:
+    start = perf_counter()
+    solver = Solver(
+        # the id of the planning is only set once it is stored
+        getattr(planning, "id", 0),
+        planning.employee_ids,
+        planning.slots,
+        optimization=optimization,
+        specifications=specifications,
+    )
+    solver.add_constraints(planning.retrieve_constraints())
+    solver.add_distributions(planning.retrieve_distributions())
+    solver.add_optimization()
+    build_time = perf_counter() - start
+
+    return ScenarioResult(name, build_time, solver.solve(**parameters))
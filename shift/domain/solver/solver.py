@@ -1,15 +1,82 @@
+from contextlib import contextmanager, nullcontext
+from copy import copy
 from dataclasses import InitVar, dataclass, field
 from itertools import product
-from typing import Iterable, Optional
+from time import perf_counter
+from typing import (
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
 
+import numpy as np
+import numpy.typing as npt
+from ortools.sat import cp_model_pb2, sat_parameters_pb2  # type: ignore
 from ortools.sat.python import cp_model  # type: ignore
 
-from shift.domain.planning.constraints import PlanningConstraint
+from shift.domain.employee.availability import AvailabilityMatrix
+from shift.domain.employee.specifications import Specifications
+from shift.domain.planning.constraints import (
+    MaxConsecutiveShifts,
+    MaxShiftPatterns,
+    PlanningConstraint,
+    WindowEncoding,
+)
 from shift.domain.planning.distributions import PlanningDistribution
-from shift.domain.shifts.shift import Shift, Slot
-from shift.domain.solver.optimizers import PlanningOptimization
+from shift.domain.shifts.shift import (
+    Planned,
+    ShiftRegistry,
+    Slot,
+    shift_range,
+)
+from shift.domain.solver.instrumentation import Instrumentation
+from shift.domain.solver.optimizers import (
+    MinimizeChanges,
+    PlanningOptimization,
+)
 from shift.domain.utils.model import Model
-from shift.domain.utils.utils import EmployeeSlot, get_key
+from shift.domain.utils.utils import EmployeeSlotMatrix, VarNaming, get_key
+
+
+Component = Union[PlanningConstraint, PlanningDistribution]
+
+# constraints that support an enforcement literal (at most one and exactly
+# one constraints are rewritten as linear constraints)
+_Enforceable = ("bool_or", "bool_and", "linear")
+
+
+@dataclass
+class SolverResult:
+    """Outcome of solving the model of a planning
+
+    Arguments:
+        status -- Name of the CP-SAT status (e.g. OPTIMAL or INFEASIBLE)
+        objective -- Value of the objective (if the model has an objective
+            and a solution was found)
+        bound -- Best proven bound of the objective
+        wall_time -- Wall time of the solve in seconds
+        conflicts_time -- Wall time in seconds of minimizing the conflicts
+            (not included in the wall time of the solve)
+        planned -- Planned shifts (one per slot) of the solution
+        conflicts -- Constraints and distributions that are (together)
+            infeasible, if the model is infeasible and solved with
+            assumptions
+    """
+
+    status: str
+    objective: Optional[float]
+    bound: Optional[float]
+    wall_time: float
+    conflicts_time: float = 0.0
+    planned: list[Planned] = field(default_factory=list)
+    conflicts: list[Component] = field(default_factory=list)
+
+    @property
+    def is_feasible(self) -> bool:
+        return self.status in ("OPTIMAL", "FEASIBLE")
 
 
 @dataclass
@@ -18,50 +85,364 @@ class Solver(Model):
     employee_ids: InitVar[Iterable[int]]
     slots: InitVar[Iterable[Slot]]
     optimization: Optional[PlanningOptimization] = None
-    model: cp_model.CpModel = field(default_factory=cp_model.CpModel())
-    employee_slots: dict[EmployeeSlot, cp_model.IntVar] = field(
-        init=False, default_factory=dict
-    )
+    model: cp_model.CpModel = field(default_factory=cp_model.CpModel)
+    availability: Optional[AvailabilityMatrix] = None
+    specifications: InitVar[Optional[Iterable[Specifications]]] = None
+    naming: VarNaming = VarNaming.FULL
+    instrumentation: Optional[Instrumentation] = None
+    previous: Optional[list[Planned]] = None
+    change_weight: int = 0
+    assumptions: bool = False
+    employee_slots: EmployeeSlotMatrix = field(init=False)
 
     def __post_init__(
-        self, employee_ids: Iterable[int], slots: Iterable[Slot]
+        self,
+        employee_ids: Iterable[int],
+        slots: Iterable[Slot],
+        specifications: Optional[Iterable[Specifications]],
     ):
         self._slots = list(slots)
+        self.shifts = ShiftRegistry(self._slots)
+        _employee_ids = self._employee_ids = list(employee_ids)
+        self.employee_slots = EmployeeSlotMatrix(
+            _employee_ids, self.shifts, naming=self.naming
+        )
+
+        if specifications is not None and self.availability is None:
+            self.availability = self._get_availability(
+                _employee_ids, specifications
+            )
+        with self._measure("slots", self.employee_slots):
+            self._add_employee_slots(_employee_ids)
 
-        for employee_id, shift in self._get_employee_slots(
-            employee_ids, self._slots
+        # components that are enforced by an assumption, keyed on the index
+        # of the literal of the assumption
+        self._assumptions: dict[int, Component] = {}
+
+        self.minimize_changes: Optional[MinimizeChanges] = None
+        if self.previous is not None:
+            self._add_hints(self.previous)
+            if self.change_weight:
+                self.minimize_changes = MinimizeChanges(
+                    self.previous, self.change_weight
+                )
+
+    def _add_employee_slots(self, employee_ids: list[int]) -> None:
+        available = self._get_available(employee_ids)
+
+        for employee_id, index in self._get_employee_slots(
+            employee_ids, self.shifts
         ):
+            # unavailable employees are never assigned to the slot
+            if not available[employee_id][index]:
+                continue
             self.employee_slots[
-                get_key(employee_id, shift)
+                get_key(employee_id, index)
             ] = self.model.NewBoolVar(
-                f"Slot <Employee: {employee_id}; Shift: {shift}"
+                self.employee_slots.name("s", employee_id, index)
+            )
+
+    def _add_hints(self, previous: list[Planned]) -> None:
+        # hint the previous assignment of every slot that was planned before
+        assigned, known = self.employee_slots.assignment(previous)
+        present = self.employee_slots.present & known
+        for row, index in zip(*np.nonzero(present)):
+            self.model.AddHint(
+                self.employee_slots.vars[row, index],
+                bool(assigned[row, index]),
+            )
+
+    def fix(self, planned: Iterable[Planned]) -> None:
+        """Fix the employee slots of planned shifts to their assignment
+
+        Arguments:
+            planned -- Planned shifts, e.g. of a previous window of a
+                rolling horizon
+        """
+        assigned, known = self.employee_slots.assignment(planned)
+        present = self.employee_slots.present & known
+        for row, index in zip(*np.nonzero(present)):
+            self.model.Add(
+                self.employee_slots.vars[row, index]
+                == int(assigned[row, index])
+            )
+
+    def _get_availability(
+        self,
+        employee_ids: list[int],
+        specifications: Iterable[Specifications],
+    ) -> Optional[AvailabilityMatrix]:
+        if not len(self.shifts):
+            return None
+        shifts = sorted(self.shifts)
+        horizon = shift_range(
+            shifts[0],
+            shifts[-1],
+            periods={shift.period for shift in shifts},
+        )
+        return AvailabilityMatrix.from_specifications(
+            specifications, horizon, employee_ids
+        )
+
+    def _get_available(
+        self, employee_ids: list[int]
+    ) -> dict[int, npt.NDArray[np.bool_]]:
+        if self.availability is None:
+            return {
+                employee_id: np.ones(len(self.shifts), dtype=bool)
+                for employee_id in employee_ids
+            }
+        return {
+            employee_id: self.availability.available_for(
+                employee_id, self.shifts
             )
+            for employee_id in employee_ids
+        }
 
     @staticmethod
     def _get_employee_slots(
-        employee_ids: Iterable[int], slots: Iterable[Slot]
-    ) -> Iterable[tuple[int, Shift]]:
-        for employee_id, slot in product(employee_ids, slots):
-            yield employee_id, slot.shift
+        employee_ids: Iterable[int], shifts: ShiftRegistry
+    ) -> Iterable[tuple[int, int]]:
+        yield from product(employee_ids, range(len(shifts)))
+
+    def _measure(self, stage: str, component: object) -> ContextManager:
+        if self.instrumentation is None:
+            return nullcontext()
+        return self.instrumentation.measure(self.model, stage, component)
+
+    @contextmanager
+    def _assume(self, component: Component) -> Iterator[None]:
+        """Enforce the constraints that are added by a component with an
+        assumption (if solved with assumptions)
+        """
+        if not self.assumptions:
+            yield
+            return
+
+        start = len(self.model.Proto().constraints)
+        yield
+        literal = self.model.NewBoolVar(
+            self.employee_slots.name("c", len(self._assumptions))
+        )
+        for constraint in self.model.Proto().constraints[start:]:
+            _enforce(constraint, literal.Index())
+        self.model.AddAssumption(literal)
+        self._assumptions[literal.Index()] = component
 
     def add_constraints(
         self,
         constraints: Iterable[PlanningConstraint],
     ) -> None:
         for constraint in constraints:
-            constraint.add_constraint(
-                model=self.model,
-                employee_slots=self.employee_slots,
-                slots=self._slots,
-            )
+            with self._measure("constraints", constraint), self._assume(
+                constraint
+            ):
+                if self.assumptions:
+                    constraint = _enforceable(constraint)
+                constraint.add_constraint(
+                    model=self.model,
+                    employee_slots=self.employee_slots,
+                    slots=self._slots,
+                )
 
     def add_distributions(
         self,
         distributions: Iterable[PlanningDistribution],
+        slots: Optional[Iterable[Slot]] = None,
     ) -> None:
+        """Add the distributions to the model
+
+        Arguments:
+            distributions -- Distributions of the slots over the employees
+            slots -- Slots to distribute, defaults to all slots of the
+                solver (e.g. to skip slots that are fixed already)
+        """
+        _slots = list(self._slots if slots is None else slots)
         for distribution in distributions:
-            distribution.add_distribution(
-                model=self.model,
-                employee_slots=self.employee_slots,
-                slots=list(self._slots),
+            with self._measure("distributions", distribution), self._assume(
+                distribution
+            ):
+                distribution.add_distribution(
+                    model=self.model,
+                    employee_slots=self.employee_slots,
+                    slots=_slots,
+                )
+
+    def add_optimization(self) -> None:
+        # changes are added to the objective of the optimization
+        for optimization in (self.optimization, self.minimize_changes):
+            if optimization is None:
+                continue
+            with self._measure("optimization", optimization):
+                optimization.add_optimization(
+                    model=self.model,
+                    employee_slots=self.employee_slots,
+                    slots=self._slots,
+                )
+
+    def decode_name(self, name: str) -> str:
+        """Full name of a variable of the model with a compact name"""
+        return self.employee_slots.decode_name(name)
+
+    def solve(
+        self,
+        num_workers: int = 0,
+        max_time: Optional[float] = None,
+        relative_gap: Optional[float] = None,
+        random_seed: Optional[int] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        conflicts_max_time: float = 10.0,
+    ) -> SolverResult:
+        """Solve the model with CP-SAT
+
+        Arguments:
+            num_workers -- Number of parallel search workers, 0 uses all
+                available cores
+            max_time -- Time limit of the solve in seconds
+            relative_gap -- Stop once the gap between the objective and its
+                bound is within this fraction of the objective
+            random_seed -- Seed of the (randomized) search
+            log_callback -- Called with every line of the search log
+            conflicts_max_time -- Time limit in seconds of every solve that
+                minimizes the conflicts of an infeasible model
+
+        Returns:
+            Result of the solve, including the planned shifts
+        """
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = num_workers
+        if max_time is not None:
+            solver.parameters.max_time_in_seconds = max_time
+        if relative_gap is not None:
+            solver.parameters.relative_gap_limit = relative_gap
+        if random_seed is not None:
+            solver.parameters.random_seed = random_seed
+        if log_callback is not None:
+            solver.parameters.log_search_progress = True
+            solver.parameters.log_to_stdout = False
+            solver.log_callback = log_callback
+
+        status = solver.Solve(self.model)
+        result = SolverResult(
+            status=solver.StatusName(status),
+            objective=None,
+            bound=None,
+            wall_time=solver.WallTime(),
+        )
+        if status == cp_model.INFEASIBLE and self._assumptions:
+            start = perf_counter()
+            result.conflicts = [
+                self._assumptions[literal]
+                for literal in self._minimize_core(
+                    solver.SufficientAssumptionsForInfeasibility(),
+                    solver.parameters,
+                    conflicts_max_time,
+                )
+            ]
+            result.conflicts_time = perf_counter() - start
+        if not result.is_feasible:
+            return result
+
+        if self.model.Proto().HasField("objective"):
+            result.objective = solver.ObjectiveValue()
+            result.bound = solver.BestObjectiveBound()
+        result.planned = self._get_planned(solver)
+        return result
+
+    def _minimize_core(
+        self,
+        core: list[int],
+        parameters: sat_parameters_pb2.SatParameters,
+        max_time: float,
+    ) -> list[int]:
+        # drop every assumption of the (sufficient) core that is not needed
+        # for the infeasibility, which leaves a minimal core. Only the
+        # feasibility matters, so the objective is dropped (from a copy of
+        # the model) and every solve stops at the first solution
+        model = cp_model.CpModel()
+        model.Proto().CopyFrom(self.model.Proto())
+        model.Proto().ClearField("objective")
+        model.Proto().ClearField("floating_point_objective")
+
+        _core = list(core)
+        for literal in core:
+            if literal not in _core:
+                continue
+            candidate = [_literal for _literal in _core if _literal != literal]
+            model.ClearAssumptions()
+            model.Proto().assumptions.extend(candidate)
+
+            solver = cp_model.CpSolver()
+            solver.parameters.CopyFrom(parameters)
+            solver.parameters.log_search_progress = False
+            solver.parameters.stop_after_first_solution = True
+            solver.parameters.max_time_in_seconds = min(
+                parameters.max_time_in_seconds, max_time
+            )
+            # a literal is kept if the solve is not proven infeasible
+            # without it (e.g. within the time limit)
+            if solver.Solve(model) == cp_model.INFEASIBLE:
+                sufficient = set(
+                    solver.SufficientAssumptionsForInfeasibility()
+                )
+                _core = [
+                    _literal
+                    for _literal in candidate
+                    if _literal in sufficient
+                ]
+        return _core
+
+    def _get_planned(self, solver: cp_model.CpSolver) -> list[Planned]:
+        planned = []
+        for index, shift in enumerate(self.shifts):
+            employee_ids = {
+                employee_id
+                for employee_id in self._employee_ids
+                if (var := self.employee_slots.get((employee_id, index)))
+                is not None
+                and solver.BooleanValue(var)
+            }
+            planned.append(
+                Planned(shift.period, shift.day, shift.duration, employee_ids)
             )
+        return planned
+
+
+def _enforceable(constraint: PlanningConstraint) -> PlanningConstraint:
+    # an automaton can not be enforced by an assumption, so the prefix sum
+    # encoding (of the same constraint) is used instead
+    if isinstance(constraint, MaxShiftPatterns):
+        raise ValueError(
+            "Patterns of shifts are added as an automaton, which can not be "
+            "enforced by an assumption"
+        )
+    if (
+        isinstance(constraint, MaxConsecutiveShifts)
+        and constraint.encoding is WindowEncoding.AUTOMATON
+    ):
+        constraint = copy(constraint)
+        constraint.encoding = WindowEncoding.PREFIX_SUM
+    return constraint
+
+
+def _enforce(constraint: cp_model_pb2.ConstraintProto, literal: int) -> None:
+    kind = constraint.WhichOneof("constraint")
+    if kind in ("at_most_one", "exactly_one"):
+        literals = list(getattr(constraint, kind).literals)
+        # a negated literal (-var - 1) is 1 - var
+        n_negated = sum(_literal < 0 for _literal in literals)
+        lower = 1 if kind == "exactly_one" else 0
+        constraint.ClearField(kind)
+        constraint.linear.vars.extend(
+            _literal if _literal >= 0 else -_literal - 1
+            for _literal in literals
+        )
+        constraint.linear.coeffs.extend(
+            1 if _literal >= 0 else -1 for _literal in literals
+        )
+        constraint.linear.domain.extend([lower - n_negated, 1 - n_negated])
+    elif kind not in _Enforceable:
+        raise ValueError(
+            f"A {kind} constraint can not be enforced by an assumption"
+        )
+    constraint.enforcement_literal.append(literal)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from ortools.sat.python import cp_model  # type: ignore
+
+from shift.domain.employee.availability import AvailabilityMatrix
+from shift.domain.employee.specifications import Specifications
+from shift.domain.planning.planning import Planning
+from shift.domain.shifts.shift import Slot
+from shift.domain.solver.optimizers import PlanningOptimization
+from shift.domain.utils.model import Model
+from shift.domain.utils.utils import EmployeeSlotMatrix
+
+
+def equivalent_employees(
+    planning: Planning,
+    specifications: Iterable[Specifications] = (),
+    optimization: Optional[PlanningOptimization] = None,
+) -> list[list[int]]:
+    """Classes of interchangeable employees of a planning
+
+    Employees are interchangeable if they have the same hours, the same
+    specifications (i.e. spec types for all shifts of the planning) and are
+    part of the same constraints, distributions and optimization.
+
+    Arguments:
+        planning -- Planning of the employees
+        specifications -- Specifications of the employees
+        optimization -- Optimization of the planning
+
+    Returns:
+        Classes of (at least two) employees, ordered by employee id
+    """
+    employee_ids = sorted(planning.employee_ids)
+    availability = AvailabilityMatrix.from_specifications(
+        specifications, planning.shifts, employee_ids
+    )
+    components = [
+        set(constraint.employee_ids) for constraint in planning.constraints
+    ]
+    if optimization is not None:
+        components.append(set(optimization.employee_ids))
+    distributions = list(planning.distributions)
+
+    classes: dict[tuple, list[int]] = {}
+    for row, employee_id in enumerate(employee_ids):
+        key = (
+            planning.employee_hours[employee_id],
+            availability.spec_types[row].tobytes(),
+            tuple(employee_id in component for component in components),
+            tuple(
+                getattr(distribution, "employee_hours", {}).get(employee_id)
+                for distribution in distributions
+            ),
+        )
+        classes.setdefault(key, []).append(employee_id)
+    return [_class for _class in classes.values() if len(_class) > 1]
+
+
+@dataclass
+class SymmetryBreaking(Model):
+    """Order interchangeable employees lexicographically on their shifts
+
+    The shifts of every employee of a class should be lexicographically
+    greater than (or equal to) the shifts of the next employee of the class,
+    which removes the permutations of interchangeable employees from the
+    search. A previous planning (hints or MinimizeChanges) distinguishes the
+    employees, so it should not be combined with symmetry breaking.
+
+    Arguments:
+        classes -- Classes of interchangeable employees (see
+            equivalent_employees)
+        length -- Number of (first) shifts that are ordered, all shifts if
+            None
+    """
+
+    employee_ids: Sequence[int] = field(init=False)
+    classes: list[list[int]] = field(default_factory=list)
+    length: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        self.employee_ids = [
+            employee_id for _class in self.classes for employee_id in _class
+        ]
+
+    def add_constraint(
+        self,
+        slots: Iterable[Slot],
+        model: cp_model.CpModel,
+        employee_slots: EmployeeSlotMatrix,
+    ) -> None:
+        indices = sorted(
+            employee_slots.shifts.indices(slots),
+            key=lambda index: employee_slots.shifts[index],
+        )[: self.length]
+
+        for _class in self.classes:
+            for first_id, second_id in zip(_class, _class[1:]):
+                _add_lexicographic(
+                    model, employee_slots, first_id, second_id, indices
+                )
+
+
+def _add_lexicographic(
+    model: cp_model.CpModel,
+    employee_slots: EmployeeSlotMatrix,
+    first_id: int,
+    second_id: int,
+    indices: list[int],
+) -> None:
+    # shifts for which both employees have a variable
+    present = employee_slots.present[
+        [
+            employee_slots.employee_ids.index(first_id),
+            employee_slots.employee_ids.index(second_id),
+        ]
+    ][:, indices].all(axis=0)
+    _indices = np.asarray(indices)[present].tolist()
+    first = employee_slots.row(first_id, _indices)
+    second = employee_slots.row(second_id, _indices)
+
+    # equal is true if and only if all previous shifts of both employees
+    # are equal, in which case the shift of the first employee bounds the
+    # second
+    equal: list[cp_model.IntVar] = []
+    for position, (index, x, y) in enumerate(zip(_indices, first, second)):
+        not_equal = [literal.Not() for literal in equal]
+        model.AddBoolOr(not_equal + [x, y.Not()])
+        if position == len(_indices) - 1:
+            break
+        _equal = model.NewBoolVar(employee_slots.name("e", first_id, index))
+        model.AddBoolOr(not_equal + [x, _equal])
+        model.AddBoolOr(not_equal + [y.Not(), _equal])
+        model.AddBoolOr([_equal.Not(), x.Not(), y])
+        model.AddBoolOr([_equal.Not(), x, y.Not()])
+        for literal in equal:
+            model.AddImplication(_equal, literal)
+        equal = [_equal]
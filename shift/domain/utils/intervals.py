@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+
+class Intervals:
+    """Merged and sorted half-open intervals of integers
+
+    Overlapping and adjacent intervals are merged when added, so containment
+    is a binary search over the start of the intervals.
+    """
+
+    __slots__ = ("_starts", "_stops")
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()) -> None:
+        self._starts: list[int] = []
+        self._stops: list[int] = []
+        for start, stop in intervals:
+            self.add(start, stop)
+
+    def add(self, start: int, stop: int) -> None:
+        """Add the interval [start, stop) and merge it with overlapping (or
+        adjacent) intervals
+
+        Arguments:
+            start -- First value of the interval
+            stop -- First value after the interval
+        """
+        if stop <= start:
+            return
+
+        first = bisect_left(self._stops, start)
+        last = bisect_right(self._starts, stop)
+        if first < last:
+            start = min(start, self._starts[first])
+            stop = max(stop, self._stops[last - 1])
+
+        self._starts[first:last] = [start]
+        self._stops[first:last] = [stop]
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int):
+            return False
+        index = bisect_right(self._starts, value) - 1
+        return index >= 0 and value < self._stops[index]
+
+    def contains(self, values: npt.ArrayLike) -> npt.NDArray[np.bool_]:
+        """Vectorized containment of values
+
+        Arguments:
+            values -- Values to look up
+
+        Returns:
+            Boolean array that is true for values within an interval
+        """
+        _values = np.asarray(values, dtype=np.int64)
+        if not self._starts:
+            return np.zeros(_values.shape, dtype=bool)
+
+        indices = np.searchsorted(self._starts, _values, side="right") - 1
+        stops = np.asarray(self._stops, dtype=np.int64)[np.maximum(indices, 0)]
+        return (indices >= 0) & (_values < stops)
+
+    def mask(self, start: int, stop: int) -> npt.NDArray[np.bool_]:
+        """Boolean mask of the values in [start, stop) that are within an
+        interval
+
+        Arguments:
+            start -- First value of the mask
+            stop -- First value after the mask
+
+        Returns:
+            Boolean array of length stop - start
+        """
+        mask = np.zeros(max(stop - start, 0), dtype=bool)
+        first = bisect_right(self._stops, start)
+        last = bisect_left(self._starts, stop)
+        for _start, _stop in zip(
+            self._starts[first:last], self._stops[first:last]
+        ):
+            mask[max(_start, start) - start : min(_stop, stop) - start] = True
+        return mask
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self._starts, self._stops)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __repr__(self) -> str:
+        return f"Intervals({list(self)})"
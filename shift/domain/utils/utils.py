@@ -1,7 +1,268 @@
-from shift.domain.shifts.shift import Shift
+import re
+from enum import Enum
+from typing import Any, Iterable, Iterator, Optional
 
-EmployeeSlot = tuple[int, Shift]  # Employee-id, Shift
+import numpy as np
+import numpy.typing as npt
+from ortools.sat.python import cp_model  # type: ignore
 
+from shift.domain.shifts.shift import Planned, ShiftRegistry
 
-def get_key(employee_id: int, shift: Shift) -> EmployeeSlot:
-    return (employee_id, shift)
+EmployeeSlot = tuple[int, int]  # Employee-id, Shift index
+
+
+class VarNaming(str, Enum):
+    """Naming of the variables of the model
+
+    Full names are descriptive, compact names are a code followed by
+    integers (e.g. s3_14 for the slot of employee 3 and shift 14) and
+    anonymous variables have no name at all.
+    """
+
+    FULL = "full"
+    COMPACT = "compact"
+    ANONYMOUS = "anonymous"
+
+
+# templates of full names, keyed on the code of the compact names
+VarTemplates: dict[str, str] = {
+    "s": "Slot <Employee: {0}; Shift: {1}",
+    "m": "max planned on week day <employee: {0}>",
+    "a": "any planned <employee: {0}; week day: {1}>",
+    "c": "assumption <component: {0}>",
+    "e": "equal up to shift <employee: {0}; shift index: {1}>",
+    "p": "shifts before <employee: {0}; shift index: {1}>",
+    "d": "period of day <employee: {0}; shift index: {1}>",
+    "w": "shifts in week <employee: {0}; shift index: {1}>",
+    "h": "hours in week <employee: {0}; shift index: {1}>",
+}
+
+_CompactName = re.compile(r"^([a-z]+)(-?\d+(?:_-?\d+)*)$")
+
+
+class EmployeeSlotMatrix:
+    """Variables of employee slots in a dense matrix, with a row per
+    employee and a column per shift (index) of the shift registry
+
+    Slots without a variable (e.g. pruned because the employee is
+    unavailable) are skipped by the row, column and window helpers.
+    """
+
+    def __init__(
+        self,
+        employee_ids: Iterable[int],
+        shifts: ShiftRegistry,
+        naming: VarNaming = VarNaming.FULL,
+    ) -> None:
+        self.employee_ids = list(employee_ids)
+        self.shifts = shifts
+        self.naming = naming
+        self._rows = {
+            employee_id: row
+            for row, employee_id in enumerate(self.employee_ids)
+        }
+        shape = (len(self.employee_ids), len(shifts))
+        self._vars: npt.NDArray[np.object_] = np.empty(shape, dtype=object)
+        self._present: npt.NDArray[np.bool_] = np.zeros(shape, dtype=bool)
+
+    @property
+    def vars(self) -> npt.NDArray[np.object_]:
+        """Variables of the slots, None for slots without a variable"""
+        return self._vars
+
+    @property
+    def present(self) -> npt.NDArray[np.bool_]:
+        """Whether a slot (employee, shift index) has a variable"""
+        return self._present
+
+    def name(self, code: str, *values: int) -> str:
+        """Name of a variable, according to the naming of the variables
+
+        Arguments:
+            code -- Code of the variable (see VarTemplates)
+            values -- Integers identifying the variable
+
+        Returns:
+            Name of the variable
+        """
+        if self.naming is VarNaming.ANONYMOUS:
+            return ""
+        compact_name = code + "_".join(str(value) for value in values)
+        if self.naming is VarNaming.COMPACT:
+            return compact_name
+        return self.decode_name(compact_name)
+
+    def decode_name(self, name: str) -> str:
+        """Full name of a variable with a compact name
+
+        Arguments:
+            name -- Compact name of a variable
+
+        Returns:
+            Full name of the variable, or the name itself if it is not a
+            (known) compact name
+        """
+        match = _CompactName.match(name)
+        if match is None or match.group(1) not in VarTemplates:
+            return name
+
+        code = match.group(1)
+        values: list[Any] = [int(value) for value in match.group(2).split("_")]
+        if code == "s":
+            # the second value of a slot is the index of the shift
+            values[1] = self.shifts[values[1]]
+        return VarTemplates[code].format(*values)
+
+    def __setitem__(self, key: EmployeeSlot, var: cp_model.IntVar) -> None:
+        employee_id, index = key
+        row = self._rows[employee_id]
+        self._vars[row, index] = var
+        self._present[row, index] = True
+
+    def __getitem__(self, key: EmployeeSlot) -> cp_model.IntVar:
+        var = self.get(key)
+        if var is None:
+            raise KeyError(key)
+        return var
+
+    def get(
+        self, key: EmployeeSlot, default: Optional[cp_model.IntVar] = None
+    ) -> Optional[cp_model.IntVar]:
+        employee_id, index = key
+        row = self._rows.get(employee_id)
+        if row is None or not 0 <= index < len(self.shifts):
+            return default
+        if not self._present[row, index]:
+            return default
+        return self._vars[row, index]
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple):
+            return False
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return int(self._present.sum())
+
+    def __iter__(self) -> Iterator[EmployeeSlot]:
+        for row, index in zip(*np.nonzero(self._present)):
+            yield get_key(self.employee_ids[row], int(index))
+
+    def items(self) -> Iterator[tuple[EmployeeSlot, cp_model.IntVar]]:
+        for key in self:
+            yield key, self[key]
+
+    def values(self) -> list[cp_model.IntVar]:
+        return self._vars[self._present].tolist()
+
+    def row(
+        self, employee_id: int, indices: Optional[Iterable[int]] = None
+    ) -> list[cp_model.IntVar]:
+        """Variables of an employee for the shift indices (or all shifts)"""
+        row = self._rows.get(employee_id)
+        if row is None:
+            return []
+        if indices is None:
+            return self._vars[row][self._present[row]].tolist()
+        _indices = np.fromiter(indices, dtype=np.int64)
+        return self._vars[row, _indices][self._present[row, _indices]].tolist()
+
+    def column(
+        self, employee_ids: Iterable[int], index: int
+    ) -> list[cp_model.IntVar]:
+        """Variables of the employees for a shift index"""
+        rows = [
+            row
+            for employee_id in employee_ids
+            if (row := self._rows.get(employee_id)) is not None
+        ]
+        return self._vars[rows, index][self._present[rows, index]].tolist()
+
+    def window(
+        self, employee_id: int, start: int, stop: int
+    ) -> list[cp_model.IntVar]:
+        """Variables of an employee for the shift indices in [start, stop)"""
+        row = self._rows.get(employee_id)
+        if row is None:
+            return []
+        return self._vars[row, start:stop][
+            self._present[row, start:stop]
+        ].tolist()
+
+    def assignment(
+        self, planned: Iterable[Planned]
+    ) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+        """Previous assignment of the employees to the shifts of the matrix
+
+        Arguments:
+            planned -- Planned shifts (e.g. of a published roster), shifts
+                and employees outside the matrix are ignored
+
+        Returns:
+            Matrix whether an employee was assigned to a shift, and whether
+            the shift was planned at all
+        """
+        assigned = np.zeros(self._present.shape, dtype=bool)
+        known = np.zeros(len(self.shifts), dtype=bool)
+        for _planned in planned:
+            index = self.shifts.get_index(_planned)
+            if index is None:
+                continue
+            known[index] = True
+            for employee_id in _planned.employee_ids:
+                row = self._rows.get(employee_id)
+                if row is not None:
+                    assigned[row, index] = True
+        return assigned, known
+
+    def row_sum(
+        self, employee_id: int, indices: Optional[Iterable[int]] = None
+    ) -> cp_model.LinearExpr:
+        """Sum of the variables of an employee, see row"""
+        return linear_sum(self.row(employee_id, indices))
+
+    def column_sum(
+        self, employee_ids: Iterable[int], index: int
+    ) -> cp_model.LinearExpr:
+        """Sum of the variables of the employees for a shift, see column"""
+        return linear_sum(self.column(employee_ids, index))
+
+    def window_sum(
+        self, employee_id: int, start: int, stop: int
+    ) -> cp_model.LinearExpr:
+        """Sum of the variables of an employee in a window, see window"""
+        return linear_sum(self.window(employee_id, start, stop))
+
+
+def linear_sum(
+    expressions: Iterable[cp_model.LinearExprT],
+) -> cp_model.LinearExpr:
+    """Flat sum of expressions, built at once instead of the chain of
+    intermediate expressions of the builtin sum
+
+    Arguments:
+        expressions -- Variables (or other linear expressions)
+
+    Returns:
+        Linear expression
+    """
+    return cp_model.LinearExpr.Sum(list(expressions))
+
+
+def weighted_sum(
+    expressions: Iterable[cp_model.LinearExprT], weights: Iterable[int]
+) -> cp_model.LinearExpr:
+    """Flat weighted sum of expressions, see linear_sum
+
+    Arguments:
+        expressions -- Variables (or other linear expressions)
+        weights -- Weight of every expression
+
+    Returns:
+        Linear expression
+    """
+    return cp_model.LinearExpr.WeightedSum(list(expressions), list(weights))
+
+
+def get_key(employee_id: int, shift_index: int) -> EmployeeSlot:
+    return (employee_id, shift_index)
@@ -0,0 +1,44 @@
+from dataclasses import fields, is_dataclass
+from typing import Any
+
+import pytest
+
+from benchmarks.generator import SyntheticConfig, generate
+
+
+def _values(value: Any) -> Any:
+    # values of (nested) models, without their id (which is not set)
+    if is_dataclass(value):
+        return (type(value).__name__,) + tuple(
+            _values(getattr(value, _field.name, None))
+            for _field in fields(value)
+            if _field.name != "id"
+        )
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_values(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _values(item)) for key, item in value.items())
+    return value
+
+
+def test_generate_deterministic():
+    config = SyntheticConfig(10, 1)
+    planning, specifications = generate(config)
+    _planning, _specifications = generate(config)
+    assert _values(planning) == _values(_planning)
+    assert _values(specifications) == _values(_specifications)
+    assert _values(list(planning.slots)) == _values(list(_planning.slots))
+
+    # another seed results in other hours and specifications
+    other, other_specifications = generate(SyntheticConfig(10, 1, seed=1))
+    assert _values(planning) != _values(other)
+    assert _values(specifications) != _values(other_specifications)
+
+
+def test_generate_constraint_mix():
+    planning, _ = generate(SyntheticConfig(5, 1, constraint_mix="basic"))
+    assert not planning.constraints.max_consecutive_shifts
+    assert not planning.distributions.n_shifts_monthly
+
+    with pytest.raises(ValueError):
+        generate(SyntheticConfig(5, 1, constraint_mix="unknown"))
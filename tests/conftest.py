@@ -1,13 +1,21 @@
 import datetime
 from datetime import date, timedelta
+from typing import Iterable, Optional
 
 from ortools.sat.python import cp_model  # type: ignore
 from pytest import fixture
 
+from shift.domain.planning.constraints import (
+    PlanningConstraint,
+    ShiftsPerDay,
+    WorkersPerShift,
+)
+from shift.domain.planning.distributions import PlanningDistribution
+from shift.domain.planning.planning import Planning
 from shift.domain.shifts.periods import DayAndEvening
-from shift.domain.shifts.shift import Day, Slot, shift_range
+from shift.domain.shifts.shift import Day, ShiftRegistry, Slot, shift_range
 from shift.domain.solver.solver import Solver
-from shift.domain.utils.utils import EmployeeSlot
+from shift.domain.utils.utils import EmployeeSlotMatrix
 
 
 @fixture
@@ -72,30 +80,26 @@ def employee_ids() -> list[int]:
 @fixture
 def employee_slots_1week(
     slots_1week: list[Slot], employee_ids: list[int], model: cp_model.CpModel
-) -> dict[EmployeeSlot, cp_model.IntVar]:
-    employee_slots = {
-        (employee_id, shift): model.NewBoolVar(
-            f"Slot <Employee: {employee_id}; Shift: {shift}"
+) -> EmployeeSlotMatrix:
+    shifts = ShiftRegistry(slots_1week)
+    employee_slots = EmployeeSlotMatrix(employee_ids, shifts)
+    for employee_id, index in Solver._get_employee_slots(employee_ids, shifts):
+        employee_slots[(employee_id, index)] = model.NewBoolVar(
+            employee_slots.name("s", employee_id, index)
         )
-        for employee_id, shift in Solver._get_employee_slots(
-            employee_ids, slots_1week
-        )
-    }
     return employee_slots
 
 
 @fixture
 def employee_slots_4months(
     slots_4months: list[Slot], employee_ids: list[int], model: cp_model.CpModel
-) -> dict[EmployeeSlot, cp_model.IntVar]:
-    employee_slots = {
-        (employee_id, shift): model.NewBoolVar(
-            f"Slot <Employee: {employee_id}; Shift: {shift}"
-        )
-        for employee_id, shift in Solver._get_employee_slots(
-            employee_ids, slots_4months
+) -> EmployeeSlotMatrix:
+    shifts = ShiftRegistry(slots_4months)
+    employee_slots = EmployeeSlotMatrix(employee_ids, shifts)
+    for employee_id, index in Solver._get_employee_slots(employee_ids, shifts):
+        employee_slots[(employee_id, index)] = model.NewBoolVar(
+            employee_slots.name("s", employee_id, index)
         )
-    }
     return employee_slots
 
 
@@ -110,3 +114,37 @@ def get_cap_value():
         return min(list(map(int, domain)), key=abs)
 
     return _get_cap_value
+
+
+@fixture
+def get_planning():
+    def _get_planning(
+        first_day: date,
+        last_day: date,
+        employee_hours: dict[int, int],
+        constraints: Iterable[PlanningConstraint] = (),
+        distributions: Iterable[PlanningDistribution] = (),
+        employee_ids: Optional[list[int]] = None,
+    ) -> Planning:
+        """Planning of a single employee per shift and a single shift per
+        day, all constraints apply to the employees (of the hours)
+        """
+        planning = Planning(
+            first_day=first_day,
+            last_day=last_day,
+            periods=DayAndEvening,
+            shift_duration=8,
+            employees_per_shift=1,
+            employee_hours=employee_hours,
+        )
+        planning.constraints.add(WorkersPerShift())
+        planning.constraints.add(ShiftsPerDay())
+        for constraint in constraints:
+            planning.constraints.add(constraint)
+        for constraint in planning.constraints:
+            constraint.employee_ids = list(employee_ids or employee_hours)
+        for distribution in distributions:
+            planning.distributions.add(distribution)
+        return planning
+
+    return _get_planning
@@ -0,0 +1,103 @@
+from datetime import date
+
+import pytest
+
+from shift.domain.employee.availability import AvailabilityMatrix
+from shift.domain.employee.specifications import (
+    Holiday,
+    SpecificDay,
+    Specifications,
+    SpecType,
+)
+from shift.domain.shifts.periods import DayAndEvening
+from shift.domain.shifts.days import Day
+from shift.domain.shifts.shift import Shift, ShiftRange, Slot, shift_range
+
+
+@pytest.fixture
+def horizon(slot_t0: Slot, slot_t1_delta_1week: Slot) -> ShiftRange:
+    return shift_range(slot_t0, slot_t1_delta_1week, periods=DayAndEvening)
+
+
+@pytest.fixture
+def availability(
+    horizon: ShiftRange, slot_t0: Slot, slots_1week: list[Slot]
+) -> AvailabilityMatrix:
+    on_holiday = Specifications(0)
+    on_holiday.add(Holiday(slots_1week[0].shift, slots_1week[3].shift))
+    unavailable_first_day = Specifications(1)
+    unavailable_first_day.add(SpecificDay(SpecType.UNAVAILABLE, slot_t0.day))
+
+    return AvailabilityMatrix.from_specifications(
+        [on_holiday, unavailable_first_day], horizon, employee_ids=[0, 1, 2]
+    )
+
+
+def test_availability_matrix(
+    availability: AvailabilityMatrix, horizon: ShiftRange
+):
+    assert availability.spec_types.shape == (3, len(horizon))
+    assert availability.row(0)[:4].tolist() == [SpecType.UNAVAILABLE_COR] * 4
+    assert availability.row(1)[:2].tolist() == [SpecType.UNAVAILABLE] * 2
+    assert not availability.row(2).any()
+    assert availability.column(horizon[0]).tolist() == [
+        SpecType.UNAVAILABLE_COR,
+        SpecType.UNAVAILABLE,
+        0,
+    ]
+
+
+def test_availability_counts(availability: AvailabilityMatrix):
+    n_available = availability.n_available_per_shift()
+    assert n_available[:4].tolist() == [2, 2, 2, 2]
+    assert (n_available[4:] == 3).all()
+
+    n_available = availability.n_available_per_shift(SpecType.UNAVAILABLE)
+    assert n_available[:4].tolist() == [1, 1, 2, 2]
+
+    n_shifts = availability.spec_types.shape[1]
+    assert availability.n_available_per_employee().tolist() == [
+        n_shifts - 4,
+        n_shifts,
+        n_shifts,
+    ]
+
+
+def test_is_available(availability: AvailabilityMatrix, horizon: ShiftRange):
+    assert not availability.is_available(0, horizon[0])
+    assert availability.is_available(1, horizon[0])
+    assert not availability.is_available(1, horizon[0], SpecType.UNAVAILABLE)
+    assert availability.is_available(0, horizon[4])
+    assert availability.is_available(5, horizon[0])
+
+
+def test_employees_of_specifications(horizon: ShiftRange):
+    availability = AvailabilityMatrix.from_specifications(
+        [Specifications(3), Specifications(1)], horizon
+    )
+    assert availability.employee_ids == [3, 1]
+    assert availability.available().all()
+
+
+def test_availability_eq(
+    availability: AvailabilityMatrix, horizon: ShiftRange
+):
+    # matrices are compared by identity, not by their (array) values
+    other = AvailabilityMatrix.from_specifications([], horizon, [0, 1, 2])
+    assert availability == availability
+    assert availability != other
+
+
+def test_available_for(
+    availability: AvailabilityMatrix, slots_1week: list[Slot]
+):
+    outside = Shift(DayAndEvening.day, Day(date(2003, 1, 1)))
+    shifts = [slot.shift for slot in slots_1week[2:6]] + [outside]
+    assert availability.available_for(0, shifts).tolist() == [
+        False,
+        False,
+        True,
+        True,
+        True,
+    ]
+    assert availability.available_for(9, shifts).all()
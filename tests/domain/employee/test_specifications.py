@@ -1,3 +1,5 @@
+import pytest
+
 from shift.domain.employee.specifications import (
     Holiday,
     Specification,
@@ -9,7 +11,7 @@ from shift.domain.employee.specifications import (
     SpecType,
 )
 from shift.domain.shifts.periods import DayAndEvening
-from shift.domain.shifts.shift import Slot
+from shift.domain.shifts.shift import Slot, shift_range
 
 
 def test_spec_type():
@@ -47,6 +49,10 @@ def test_holiday(
     assert holiday.spec_for_shift(slot_t1_delta_4months) is None
 
     assert slot_t1_delta_1week in holiday.shifts
+    assert holiday.interval == (
+        slot_t0.ordinal,
+        slot_t1_delta_1week.ordinal + 1,
+    )
     assert len(list(holiday.days)) == 8
     assert holiday.n_shifts == 16
     assert holiday.n_days == 8
@@ -80,3 +86,112 @@ def test_specifications(slot_t0: Slot, slot_t1_delta_1week: Slot):
         len(specifications.blocked_days(slot_t0.day, slot_t1_delta_1week.day))
         == 1
     )
+
+
+def test_specifications_holidays(
+    slot_t0: Slot,
+    slot_t1_delta_1week: Slot,
+    slot_t1_delta_4months: Slot,
+    slots_4months: list[Slot],
+):
+    first_holiday = Holiday(slot_t0.shift, slot_t1_delta_1week.shift)
+    second_holiday = Holiday(
+        slots_4months[30].shift, slot_t1_delta_4months.shift
+    )
+
+    specifications = Specifications(1, holidays=[first_holiday])
+    specifications.add(second_holiday)
+    specifications.add(
+        SpecificShift(SpecType.PREFERRED, slots_4months[20].shift)
+    )
+
+    for index, slot in enumerate(slots_4months):
+        expected = first_holiday.spec_for_shift(
+            slot
+        ) or second_holiday.spec_for_shift(slot)
+        assert specifications.is_unavailable(slot) is (expected is not None)
+        assert specifications.min_for_shift(slot) == (
+            expected or (SpecType.PREFERRED if index == 20 else None)
+        )
+
+    horizon = shift_range(
+        slot_t0, slot_t1_delta_4months, periods=DayAndEvening
+    )
+    assert specifications.unavailable_mask(horizon).tolist() == [
+        specifications.is_unavailable(shift) for shift in horizon
+    ]
+
+    evenings = shift_range(
+        slot_t0, slot_t1_delta_4months, periods=[DayAndEvening.evening]
+    )
+    assert specifications.unavailable_mask(evenings).tolist() == [
+        specifications.is_unavailable(shift) for shift in evenings
+    ]
+    assert Specifications(2).unavailable_mask(horizon).sum() == 0
+
+
+@pytest.fixture
+def specifications_4months(
+    slot_t0: Slot,
+    slot_t1_delta_1week: Slot,
+    slots_4months: list[Slot],
+) -> Specifications:
+    specifications = Specifications(1)
+    specifications.add(Holiday(slot_t0.shift, slot_t1_delta_1week.shift))
+    specifications.add(
+        SpecificShift(SpecType.MANDATORY, slots_4months[20].shift)
+    )
+    specifications.add(
+        SpecificShift(SpecType.UNAVAILABLE, slots_4months[21].shift)
+    )
+    specifications.add(SpecificDay(SpecType.PREFERRED, slots_4months[20].day))
+    specifications.add(
+        SpecificDay(SpecType.UNAVAILABLE, slots_4months[50].day)
+    )
+    specifications.add(
+        SpecificPeriod(SpecType.NOT_PREFERRED, DayAndEvening.evening)
+    )
+    specifications.add(SpecificWeekDay(SpecType.PREFERRED, 3))
+    specifications.add(SpecificWeekDay(SpecType.UNAVAILABLE, 5))
+    return specifications
+
+
+def test_specification_index(
+    specifications_4months: Specifications, slots_4months: list[Slot]
+):
+    for slot in slots_4months:
+        spec_types = [
+            spec_type
+            for specification in specifications_4months
+            if (spec_type := specification.spec_for_shift(slot))
+        ]
+        expected = min(spec_types) if spec_types else None
+        assert specifications_4months.min_for_shift(slot) == expected
+
+
+def test_specification_index_spec_types(
+    specifications_4months: Specifications,
+    slot_t0: Slot,
+    slot_t1_delta_4months: Slot,
+):
+    for periods in (DayAndEvening, [DayAndEvening.day]):
+        horizon = shift_range(slot_t0, slot_t1_delta_4months, periods=periods)
+        spec_types = specifications_4months.spec_types(horizon)
+        assert len(spec_types) == len(horizon)
+        assert spec_types.tolist() == [
+            specifications_4months.min_for_shift(shift) or 0
+            for shift in horizon
+        ]
+
+
+def test_specification_index_invalidated(
+    specifications_4months: Specifications, slots_4months: list[Slot]
+):
+    slot = slots_4months[-2]
+    index = specifications_4months.index
+    assert specifications_4months.index is index
+    assert specifications_4months.min_for_shift(slot) is None
+
+    specifications_4months.add(SpecificDay(SpecType.MANDATORY, slot.day))
+    assert specifications_4months.index is not index
+    assert specifications_4months.min_for_shift(slot) == SpecType.MANDATORY
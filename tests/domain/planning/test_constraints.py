@@ -1,4 +1,6 @@
 import re
+from datetime import date
+from itertools import product
 
 import pytest  # type: ignore
 from google.protobuf.json_format import MessageToDict  # type: ignore
@@ -6,15 +8,24 @@ from ortools.sat.python import cp_model  # type: ignore
 
 from shift.domain.planning.constraints import (
     Constraints,
+    ContractHours,
     MaxConsecutiveShifts,
     MaxRecurrentShifts,
+    MaxShiftPatterns,
+    MinimumRest,
     PlanningConstraint,
     ShiftsPerDay,
     SpecificShifts,
+    WindowEncoding,
     WorkersPerShift,
 )
-from shift.domain.shifts.shift import Slot
-from shift.domain.utils.utils import EmployeeSlot
+from shift.domain.shifts.days import Day
+from shift.domain.shifts.periods import DayAndEvening
+from shift.domain.shifts.shift import ShiftRegistry, Slot, shift_range
+from shift.domain.utils.utils import EmployeeSlotMatrix
+
+
+day, evening = DayAndEvening.day, DayAndEvening.evening
 
 
 def test_constraint_model():
@@ -63,8 +74,11 @@ def test_constraint_add(
     constraints.add(specific_shifts, [1])
     constraints.add(max_consecutive_shifts)
     constraints.add(max_recurrent_shifts)
+    constraints.add(MaxShiftPatterns())
+    constraints.add(MinimumRest())
+    constraints.add(ContractHours())
 
-    assert len(list(constraints)) == 5
+    assert len(list(constraints)) == 8
 
 
 @pytest.mark.parametrize("max", [1, 2, 3])
@@ -72,7 +86,7 @@ def test_constraint_add(
 def test_max_recurrent_shifts(
     slots_1week: list[Slot],
     model: cp_model.CpModel,
-    employee_slots_1week: dict[EmployeeSlot, cp_model.IntVar],
+    employee_slots_1week: EmployeeSlotMatrix,
     max: int,
     n_employees: int,
 ):
@@ -103,12 +117,74 @@ def test_max_recurrent_shifts(
         assert int(constraint["linear"]["domain"][1]) == max
 
 
+@pytest.mark.parametrize(
+    "max, window, weeks, n_aggregates",
+    [(1, 2, False, 3), (2, 3, False, 3), (1, 3, True, 5), (2, 5, True, 5)],
+)
+def test_max_recurrent_shifts_windows(
+    max: int, window: int, weeks: bool, n_aggregates: int
+):
+    # the weekend day shifts of five weeks over the turn of a year, with the
+    # 53rd week of 2020
+    slots = [
+        Slot(shift.period, shift.day)
+        for shift in shift_range(
+            Slot(day, Day(date(2020, 12, 19))),
+            Slot(day, Day(date(2021, 1, 17))),
+            periods=[day],
+        )
+        if shift.day.week_day in (6, 7)
+    ]
+    model = cp_model.CpModel()
+    employee_slots = EmployeeSlotMatrix([0], ShiftRegistry(slots))
+    for index in range(len(slots)):
+        employee_slots[(0, index)] = model.NewBoolVar(
+            employee_slots.name("s", 0, index)
+        )
+    max_recurrent_shifts = MaxRecurrentShifts(
+        max=max, window=window, weeks=weeks
+    )
+    max_recurrent_shifts.employee_ids = [0]
+    max_recurrent_shifts.add_constraint(slots, model, employee_slots)
+
+    # weeks of multiple windows are aggregated once
+    assert (
+        sum(
+            variable.name.startswith("shifts in week")
+            for variable in model.Proto().variables
+        )
+        == n_aggregates
+    )
+
+    solutions = _Solutions(
+        [employee_slots[(0, index)] for index in range(len(slots))]
+    )
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    solver.Solve(model, solutions)
+
+    n_expected = 0
+    for solution in product((0, 1), repeat=len(slots)):
+        # shifts (or whether a shift is worked) per weekend
+        per_week = [
+            solution[week] + solution[week + 1]
+            for week in range(0, len(solution), 2)
+        ]
+        if weeks:
+            per_week = [min(n, 1) for n in per_week]
+        n_expected += all(
+            sum(per_week[start : start + window]) <= max
+            for start in range(len(per_week) - window + 1)
+        )
+    assert len(solutions.solutions) == n_expected
+
+
 @pytest.mark.parametrize("max", [1, 2, 10])
 @pytest.mark.parametrize("window", [1, 2, 10])
 def test_max_consecutive_shifts(
     slots_1week: list[Slot],
     model: cp_model.CpModel,
-    employee_slots_1week: dict[EmployeeSlot, cp_model.IntVar],
+    employee_slots_1week: EmployeeSlotMatrix,
     max: int,
     window: int,
     get_cap_value,
@@ -131,7 +207,7 @@ def test_specific_shifts(
     employee_ids: list[int],
     slots_1week: list[Slot],
     model: cp_model,
-    employee_slots_1week: dict[EmployeeSlot, cp_model.IntVar],
+    employee_slots_1week: EmployeeSlotMatrix,
     slot_t0: Slot,
     slot_t1_delta_1week: Slot,
     get_cap_value,
@@ -167,7 +243,7 @@ def test_specific_shifts_multiple_employees(
     employee_ids: list[int],
     slots_1week: list[Slot],
     model: cp_model,
-    employee_slots_1week: dict[EmployeeSlot, cp_model.IntVar],
+    employee_slots_1week: EmployeeSlotMatrix,
     slot_t0: Slot,
 ):
     block_first_shift = SpecificShifts(specific_shifts=[(slot_t0.shift, True)])
@@ -183,7 +259,7 @@ def test_specific_shifts_multiple_employees(
 def test_workers_per_shift(
     slots_1week: list[Slot],
     model: cp_model,
-    employee_slots_1week: dict[EmployeeSlot, cp_model.IntVar],
+    employee_slots_1week: EmployeeSlotMatrix,
     employee_ids: list[int],
     n_employees: int,
 ):
@@ -217,7 +293,7 @@ def test_workers_per_shift(
 def test_shifts_per_day(
     slots_1week: list[Slot],
     model: cp_model,
-    employee_slots_1week: dict[EmployeeSlot, cp_model.IntVar],
+    employee_slots_1week: EmployeeSlotMatrix,
     employee_ids: list[int],
 ):
     shifts_per_day = ShiftsPerDay()
@@ -245,3 +321,254 @@ def test_shifts_per_day(
 
     # check fixed property (only work one time a day)
     assert shifts_per_day.n == 1
+
+
+class _Solutions(cp_model.CpSolverSolutionCallback):
+    """Distinct values of the slot variables of all solutions, as the
+    solver can report the same slots for different values of the auxiliary
+    variables of a constraint
+    """
+
+    def __init__(self, variables: list[cp_model.IntVar]) -> None:
+        super().__init__()
+        self.variables = variables
+        self.solutions: set[tuple[int, ...]] = set()
+
+    def on_solution_callback(self) -> None:
+        self.solutions.add(
+            tuple(self.Value(variable) for variable in self.variables)
+        )
+
+
+@pytest.mark.parametrize("encoding", list(WindowEncoding))
+@pytest.mark.parametrize("max, window", [(1, 2), (2, 3), (3, 6)])
+def test_max_consecutive_shifts_encoding(
+    slots_1week: list[Slot], encoding: WindowEncoding, max: int, window: int
+):
+    # a single employee over the first five days, which keeps the number
+    # of solutions to enumerate small
+    slots = slots_1week[:10]
+    model = cp_model.CpModel()
+    employee_slots = EmployeeSlotMatrix([0], ShiftRegistry(slots))
+    for index in range(len(slots)):
+        employee_slots[(0, index)] = model.NewBoolVar(
+            employee_slots.name("s", 0, index)
+        )
+
+    # skip the thursday, which splits the days in two runs of slots
+    week_days = [1, 2, 3, 5, 6, 7]
+    max_consecutive_shifts = MaxConsecutiveShifts(
+        week_days=week_days, max=max, window=window, encoding=encoding
+    )
+    max_consecutive_shifts.employee_ids = [0]
+    max_consecutive_shifts.add_constraint(slots, model, employee_slots)
+
+    solutions = _Solutions(
+        [employee_slots[(0, index)] for index in range(len(slots))]
+    )
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    solver.Solve(model, solutions)
+
+    on_week_days = [slot.day.week_day in week_days for slot in slots]
+    n_expected = 0
+    for solution in product((0, 1), repeat=len(slots)):
+        n_expected += all(
+            sum(solution[start : start + window]) <= max
+            for start in range(len(slots) - window + 1)
+            if all(on_week_days[start : start + window])
+        )
+    assert len(solutions.solutions) == n_expected
+
+
+@pytest.mark.parametrize("encoding", list(WindowEncoding))
+def test_max_consecutive_shifts_window_beyond_slots(
+    slots_1week: list[Slot],
+    model: cp_model.CpModel,
+    employee_slots_1week: EmployeeSlotMatrix,
+    encoding: WindowEncoding,
+):
+    # a window of more slots than planned is never complete
+    max_consecutive_shifts = MaxConsecutiveShifts(
+        max=1, window=10, encoding=encoding
+    )
+    max_consecutive_shifts.employee_ids = [0, 1]
+    max_consecutive_shifts.add_constraint(
+        slots_1week[:3], model, employee_slots_1week
+    )
+    assert not model.Proto().constraints
+
+
+def test_max_consecutive_shifts_automaton_states(
+    slots_1week: list[Slot],
+    model: cp_model.CpModel,
+    employee_slots_1week: EmployeeSlotMatrix,
+):
+    max_consecutive_shifts = MaxConsecutiveShifts(
+        max=5, window=20, encoding=WindowEncoding.AUTOMATON
+    )
+    max_consecutive_shifts.employee_ids = [0]
+    with pytest.raises(ValueError, match="prefix sum"):
+        max_consecutive_shifts.add_constraint(
+            slots_1week, model, employee_slots_1week
+        )
+
+
+@pytest.mark.parametrize(
+    "patterns, max, monthly",
+    [
+        # no day shift directly after an evening shift
+        ([[evening, day]], 0, False),
+        ([[evening, None, {day, evening}]], 0, False),
+        # at most a single turnaround or three shifts in a row (per month)
+        ([[evening, day], [{day, evening}] * 3], 1, False),
+        ([[evening, day], [{day, evening}] * 3], 1, True),
+        # patterns that end on a day off (and overlap)
+        ([[evening, {day, evening}, None], [None, None, evening]], 1, False),
+    ],
+)
+def test_max_shift_patterns(patterns, max: int, monthly: bool):
+    # a single employee over five days, which cross a month
+    slots = [
+        Slot(shift.period, shift.day)
+        for shift in shift_range(
+            Slot(day, Day(date(2024, 1, 29))),
+            Slot(evening, Day(date(2024, 2, 2))),
+            periods=DayAndEvening,
+        )
+    ]
+    model = cp_model.CpModel()
+    employee_slots = EmployeeSlotMatrix([0], ShiftRegistry(slots))
+    for index in range(len(slots)):
+        employee_slots[(0, index)] = model.NewBoolVar(
+            employee_slots.name("s", 0, index)
+        )
+    max_shift_patterns = MaxShiftPatterns(
+        patterns=patterns, max=max, monthly=monthly
+    )
+    max_shift_patterns.employee_ids = [0]
+    max_shift_patterns.add_constraint(slots, model, employee_slots)
+
+    solutions = _Solutions(
+        [employee_slots[(0, index)] for index in range(len(slots))]
+    )
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    solver.Solve(model, solutions)
+
+    # count the sequences of days (without or with a single shift)
+    months = [1, 1, 1, 2, 2]
+    n_expected = 0
+    for days in product((None, day, evening), repeat=len(months)):
+        occurrences = [
+            months[start + len(pattern) - 1]
+            for pattern in patterns
+            for start in range(len(days) - len(pattern) + 1)
+            if all(
+                _day == pattern_day
+                or (isinstance(pattern_day, set) and _day in pattern_day)
+                for _day, pattern_day in zip(days[start:], pattern)
+            )
+        ]
+        n_expected += (
+            all(occurrences.count(month) <= max for month in set(months))
+            if monthly
+            else len(occurrences) <= max
+        )
+    assert len(solutions.solutions) == n_expected
+
+    with pytest.raises(ValueError):
+        MaxShiftPatterns(patterns=[[]]).add_constraint(
+            slots, model, employee_slots
+        )
+
+
+@pytest.mark.parametrize(
+    "hours, n_conflicts",
+    [
+        # a day shift is directly followed by an evening shift
+        (0, 0),
+        # the shifts on the same day
+        (8, 8),
+        # and an evening shift followed by a day shift
+        (11, 8 + 7),
+        # and the shifts of consecutive days with the same period
+        (17, 8 + 7 + 7 + 7),
+        # and a day shift followed by an evening shift on the next day
+        (25, 8 + 7 + 7 + 7 + 7),
+    ],
+)
+def test_minimum_rest(
+    slots_1week: list[Slot],
+    model: cp_model.CpModel,
+    employee_slots_1week: EmployeeSlotMatrix,
+    hours: float,
+    n_conflicts: int,
+):
+    minimum_rest = MinimumRest(hours=hours)
+    minimum_rest.employee_ids = [0, 1]
+    minimum_rest.add_constraint(slots_1week, model, employee_slots_1week)
+
+    constraints = model.Proto().constraints
+    assert len(constraints) == 2 * n_conflicts
+    for constraint in constraints:
+        first, second = sorted(
+            employee_slots_1week.decode_name(
+                model.Proto().variables[index].name
+            )
+            for index in constraint.at_most_one.literals
+        )
+        assert first.split(";")[0] == second.split(";")[0]
+
+
+@pytest.mark.parametrize(
+    "limits, n_shifts",
+    [
+        ({}, 8),
+        # 3 shifts in the first week, 1 in the second (a single day)
+        ({"weekly": 1.0}, 4),
+        ({"weekly": 1.0, "rolling": 0.5, "window": 2}, 3),
+        ({"weekly": 1.0, "max_weekly_hours": 16}, 3),
+        ({"max_rolling_hours": 8, "window": 2}, 2),
+    ],
+)
+def test_contract_hours(
+    slots_1week: list[Slot],
+    model: cp_model.CpModel,
+    employee_slots_1week: EmployeeSlotMatrix,
+    limits: dict,
+    n_shifts: int,
+):
+    contract_hours = ContractHours(**limits)
+    contract_hours.employee_ids = [0]
+    contract_hours.employee_hours = {0: 24}
+    contract_hours.add_constraint(slots_1week, model, employee_slots_1week)
+
+    # the hours of both weeks are aggregated once
+    n_aggregates = sum(
+        variable.name.startswith("hours in week")
+        for variable in model.Proto().variables
+    )
+    assert n_aggregates == (2 if limits else 0)
+
+    # a single shift per day, as many as possible
+    shifts_per_day = ShiftsPerDay()
+    shifts_per_day.employee_ids = [0]
+    shifts_per_day.add_constraint(slots_1week, model, employee_slots_1week)
+    model.Maximize(sum(employee_slots_1week.row(0)))
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    assert solver.ObjectiveValue() == n_shifts
+
+
+def test_contract_hours_of_planning(get_planning):
+    contract_hours = ContractHours(weekly=1.0)
+    planning = get_planning(
+        date(2024, 1, 1),
+        date(2024, 1, 14),
+        {0: 24, 1: 32},
+        constraints=[contract_hours],
+    )
+    assert contract_hours in list(planning.retrieve_constraints())
+    assert contract_hours.employee_hours == {0: 24, 1: 32}
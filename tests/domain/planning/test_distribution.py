@@ -11,7 +11,7 @@ from shift.domain.planning.distributions import (
     _get_bounds,
 )
 from shift.domain.shifts.shift import Slot
-from shift.domain.utils.utils import EmployeeSlot
+from shift.domain.utils.utils import EmployeeSlotMatrix
 
 
 def test_distributions():
@@ -39,7 +39,7 @@ def test_add_distributions(
     employee_ids: list[int],
     slots_4months: list[Slot],
     model: cp_model,
-    employee_slots_4months: dict[EmployeeSlot, cp_model.IntVar],
+    employee_slots_4months: EmployeeSlotMatrix,
     distribution,
     expected_avg_cap_value,
     get_cap_value,
@@ -61,5 +61,17 @@ def test_add_distributions(
     assert avg_cap_value == expected_avg_cap_value
 
 
+def test_add_monthly_distribution_without_slots(
+    employee_ids: list[int],
+    model: cp_model,
+    employee_slots_4months: EmployeeSlotMatrix,
+):
+    distribute_shifts = NShiftsMonthly()
+    distribute_shifts.employee_hours = {id: 1 for id in employee_ids}
+    n_constraints = len(model.Proto().constraints)
+    distribute_shifts.add_distribution([], model, employee_slots_4months)
+    assert len(model.Proto().constraints) == n_constraints
+
+
 def test_get_bounds():
     assert _get_bounds(3, 1) == (2, 4)
@@ -0,0 +1,113 @@
+from datetime import date
+
+import pytest
+
+from shift.domain.employee.specifications import Holiday, Specifications
+from shift.domain.planning.constraints import SpecificShifts
+from shift.domain.planning.distributions import NShifts
+from shift.domain.planning.feasibility import (
+    InfeasiblePlanning,
+    assert_feasible,
+    check_feasibility,
+)
+from shift.domain.planning.planning import Planning
+from shift.domain.shifts.periods import DayAndEvening
+from shift.domain.shifts.shift import Day, Shift
+
+
+@pytest.fixture
+def planning(get_planning) -> Planning:
+    return get_planning(
+        date(2024, 1, 1),
+        date(2024, 1, 14),
+        {0: 32, 1: 32, 2: 32, 3: 32},
+        distributions=[NShifts(offset=1)],
+    )
+
+
+def _holiday(employee_id: int, first_day: date, last_day: date):
+    specifications = Specifications(employee_id)
+    specifications.add(
+        Holiday(
+            Shift(DayAndEvening.day, Day(first_day)),
+            Shift(DayAndEvening.evening, Day(last_day)),
+        )
+    )
+    return specifications
+
+
+def test_feasible(planning: Planning):
+    assert check_feasibility(planning) == []
+    assert_feasible(planning)
+
+
+def test_supply(planning: Planning):
+    # all employees are on holiday on the first day
+    specifications = [
+        _holiday(employee_id, date(2024, 1, 1), date(2024, 1, 1))
+        for employee_id in range(4)
+    ]
+    conflicts = check_feasibility(planning, specifications)
+    assert [conflict.check for conflict in conflicts] == [
+        "supply",
+        "daily supply",
+    ]
+    assert conflicts[0].message.startswith("2 slot(s)")
+
+
+def test_daily_supply(planning: Planning):
+    # a single employee can not work both shifts of the first week
+    specifications = [
+        _holiday(employee_id, date(2024, 1, 1), date(2024, 1, 7))
+        for employee_id in range(3)
+    ]
+    conflicts = check_feasibility(planning, specifications)
+    assert [conflict.check for conflict in conflicts] == ["daily supply"]
+    assert conflicts[0].message.startswith("7 day(s)")
+    assert "and 2 more" in conflicts[0].message
+
+
+def test_distribution(planning: Planning):
+    # the first employee can only work in the second week
+    specifications = [_holiday(0, date(2024, 1, 1), date(2024, 1, 12))]
+    conflicts = check_feasibility(planning, specifications)
+    assert [conflict.check for conflict in conflicts] == ["NShifts"]
+    assert conflicts[0].message == (
+        "employee 0 requires at least 6 shifts of the planning, "
+        "but is available for 4"
+    )
+
+
+def test_distribution_balance(planning: Planning):
+    planning.distributions.n_shifts[0].balance = {0: -4.0, 1: -4.0}
+    conflicts = check_feasibility(planning)
+    assert [conflict.check for conflict in conflicts] == ["NShifts"]
+    assert conflicts[0].message == (
+        "28 shifts of the planning can not be distributed within the "
+        "bounds of the employees (32 - 40)"
+    )
+
+
+def test_specific_shifts(planning: Planning):
+    first_day = Day(date(2024, 1, 1))
+    specific_shifts = SpecificShifts(
+        specific_shifts=[
+            (Shift(DayAndEvening.day, first_day), False),
+            (Shift(DayAndEvening.evening, first_day), False),
+        ]
+    )
+    planning.constraints.add(specific_shifts, employee_ids=[0])
+    specifications = [_holiday(0, date(2024, 1, 1), date(2024, 1, 1))]
+
+    conflicts = check_feasibility(planning, specifications)
+    assert [conflict.check for conflict in conflicts] == [
+        "specific shifts",
+        "specific shifts",
+        "specific shifts",
+    ]
+    assert "who can only work a single shift per day" in conflicts[-1].message
+
+    with pytest.raises(InfeasiblePlanning) as error:
+        assert_feasible(planning, specifications)
+    assert len(error.value.conflicts) == 3
+    assert str(error.value).count("\n- specific shifts:") == 3
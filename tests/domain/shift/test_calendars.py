@@ -0,0 +1,118 @@
+from datetime import date
+
+import pytest
+
+from shift.domain.shifts.calendars import (
+    CalendarTable,
+    HolidayCalendar,
+    get_holiday_calendar,
+    set_holiday_calendar,
+)
+from shift.domain.shifts.days import Day
+
+
+@pytest.fixture
+def holiday_calendar():
+    calendar = get_holiday_calendar()
+    yield calendar
+    set_holiday_calendar(calendar.country, calendar.subdiv)
+
+
+def test_default_calendar():
+    assert get_holiday_calendar() == HolidayCalendar("NL")
+
+
+def test_is_holiday():
+    calendar = HolidayCalendar("NL")
+    assert calendar.is_holiday(date(2020, 4, 27))
+    assert not calendar.is_holiday(date(2020, 4, 28))
+
+
+def test_holidays_are_cached():
+    calendar = HolidayCalendar("NL")
+    assert calendar.holidays(2020) is calendar.holidays(2020)
+    assert calendar.holidays(2020) is HolidayCalendar("NL").holidays(2020)
+
+
+def test_between():
+    calendar = HolidayCalendar("NL")
+    between = list(calendar.between(date(2020, 12, 1), date(2021, 1, 31)))
+    assert between == [
+        date(2020, 12, 25),
+        date(2020, 12, 26),
+        date(2021, 1, 1),
+    ]
+
+
+def test_set_holiday_calendar(holiday_calendar: HolidayCalendar):
+    # King's day is not a holiday in Germany
+    kings_day = Day(date(2020, 4, 27))
+    assert kings_day.is_holiday()
+
+    set_holiday_calendar("DE", "BY")
+    assert get_holiday_calendar() == HolidayCalendar("DE", "BY")
+    assert not kings_day.is_holiday()
+    assert Day(date(2020, 1, 6)).is_holiday()
+
+
+def test_set_invalid_holiday_calendar(holiday_calendar: HolidayCalendar):
+    with pytest.raises(NotImplementedError):
+        set_holiday_calendar("XX")
+    assert get_holiday_calendar() == holiday_calendar
+
+
+def test_calendar_table():
+    first_day, last_day = date(2020, 12, 25), date(2021, 1, 4)
+    calendar = CalendarTable(first_day, last_day)
+
+    assert len(calendar) == 11
+    for index in range(len(calendar)):
+        day = Day(date.fromordinal(first_day.toordinal() + index))
+        assert calendar.index(day.date) == index
+        assert calendar.week_day[index] == day.week_day
+        assert calendar.week_number[index] == day.week_number
+        assert calendar.iso_year[index] == day.iso_year
+        assert calendar.month[index] == day.month
+        assert calendar.weekend[index] == day.is_weekend()
+        assert calendar.holiday[index] == day.is_holiday()
+
+    with pytest.raises(ValueError):
+        calendar.week_day[0] = 1
+
+
+def test_calendar_table_weeks():
+    # the turn of a year, within the first (iso) week of 2021
+    calendar = CalendarTable(date(2020, 12, 25), date(2021, 1, 11))
+    assert calendar.week_index.tolist() == [0] * 3 + [1] * 7 + [2] * 7 + [3]
+    assert calendar.weeks == {
+        (2020, 52): 0,
+        (2020, 53): 1,
+        (2021, 1): 2,
+        (2021, 2): 3,
+    }
+
+
+def test_calendar_table_indices():
+    calendar = CalendarTable(date(2020, 12, 25), date(2021, 1, 4))
+    assert calendar.indices(
+        [date(2021, 1, 1), date(2020, 12, 25)]
+    ).tolist() == [7, 0]
+
+    with pytest.raises(KeyError):
+        calendar.index(date(2021, 1, 5))
+
+    with pytest.raises(KeyError):
+        calendar.indices([date(2020, 12, 24)])
+
+
+def test_calendar_table_cached():
+    first_day, last_day = date(2020, 1, 1), date(2020, 12, 31)
+    assert CalendarTable.between(first_day, last_day) is CalendarTable.between(
+        first_day, last_day
+    )
+    assert CalendarTable.from_dates(
+        [last_day, first_day]
+    ) is CalendarTable.between(first_day, last_day)
+
+    with pytest.raises(ValueError):
+        CalendarTable(last_day, first_day)
@@ -1,9 +1,16 @@
-from datetime import date
+from datetime import date, datetime, time
+from enum import IntEnum
 
 import pytest
 
 from shift.domain.shifts.days import Day
-from shift.domain.shifts.periods import DayAndEvening
+from shift.domain.shifts.periods import (
+    DayAndEvening,
+    Period,
+    _starts,
+    get_period_starts,
+    set_period_starts,
+)
 from shift.domain.shifts.shift import Shift
 
 
@@ -26,3 +33,41 @@ def test_invalid_operators():
         day_period <= shift_2013  # type: ignore
 
     assert not shift_2013 == day_period
+
+
+def test_start():
+    assert DayAndEvening.day.start == time(7)
+    assert DayAndEvening.evening.start == time(15)
+
+    shift = Shift(DayAndEvening.evening, Day(date(2013, 4, 30)))
+    assert shift.start == datetime(2013, 4, 30, 15)
+    assert shift.end == datetime(2013, 4, 30, 23)
+
+
+@pytest.fixture
+def period_starts():
+    starts = get_period_starts()
+    yield starts
+    # drop the periods of the test, as those can not be pickled
+    _starts.clear()
+    for period, start in starts:
+        set_period_starts({period: start})
+
+
+def test_set_start(period_starts: list[tuple[Period, time]]):
+    class Night(Period):
+        night = 1
+
+    with pytest.raises(ValueError):
+        Night.night.start
+
+    set_period_starts({Night.night: time(23)})
+    assert Night.night.start == time(23)
+    # periods of other types with the same value are not affected
+    assert DayAndEvening.day.start == time(7)
+    assert isinstance(Night.night, IntEnum)
+
+    shift = Shift(Night.night, Day(date(2013, 4, 30)), duration=9)
+    assert shift.end == datetime(2013, 5, 1, 8)
+    assert get_period_starts() == [*period_starts, (Night.night, time(23))]
+    assert type(get_period_starts()[-1][0]) is Night
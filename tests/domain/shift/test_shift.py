@@ -7,6 +7,8 @@ from shift.domain.shifts.periods import DayAndEvening
 from shift.domain.shifts.shift import (
     Planned,
     Shift,
+    ShiftRange,
+    ShiftRegistry,
     Slot,
     get_consecutive_shifts,
     shift_range,
@@ -150,3 +152,88 @@ def test_slot_repr(slot_t0: Slot):
         str(slot_t0)
         == "slot day shift on Monday 4 February (week: 6), for 1 employee(s)"
     )
+
+
+def test_shift_registry(slots_1week: list[Slot]):
+    shifts = ShiftRegistry(slots_1week)
+    assert len(shifts) == len(slots_1week)
+    assert shifts.indices(slots_1week) == list(range(len(slots_1week)))
+
+    # re-registering a shift does not create a new index
+    assert shifts.add(slots_1week[3]) == 3
+    assert len(shifts) == len(slots_1week)
+
+    # interned shifts are plain shifts
+    assert type(shifts[3]) is Shift
+    assert shifts[3] == slots_1week[3]
+    assert shifts[3] is shifts[shifts.index(slots_1week[3].shift)]
+    assert list(shifts) == [slot.shift for slot in slots_1week]
+
+    unknown_shift = Shift(DayAndEvening.day, Day(date(2021, 1, 1)))
+    assert unknown_shift not in shifts
+    assert slots_1week[0] in shifts
+    assert shifts.get_index(unknown_shift) is None
+    with pytest.raises(KeyError):
+        shifts.index(unknown_shift)
+
+
+def test_slot_shift_is_cached(slot_t0: Slot):
+    assert slot_t0.shift is slot_t0.shift
+    assert type(slot_t0.shift) is Shift
+
+
+@pytest.fixture
+def shift_range_1week(slot_t0: Slot, slot_t1_delta_1week: Slot) -> ShiftRange:
+    return shift_range(slot_t0, slot_t1_delta_1week, periods=DayAndEvening)
+
+
+def test_shift_range_sequence(
+    shift_range_1week: ShiftRange, slots_1week: list[Slot]
+):
+    assert isinstance(shift_range_1week, ShiftRange)
+    assert list(shift_range_1week) == slots_1week
+    assert list(reversed(shift_range_1week)) == slots_1week[::-1]
+    assert shift_range_1week[-1] == slots_1week[-1]
+
+    for index, slot in enumerate(slots_1week):
+        assert slot in shift_range_1week
+        assert shift_range_1week.index(slot) == index
+
+    # start and stop bound the search, as for a list
+    assert shift_range_1week.index(slots_1week[3], 2, 4) == 3
+    assert shift_range_1week.index(slots_1week[-2], -3) == len(slots_1week) - 2
+    with pytest.raises(ValueError):
+        shift_range_1week.index(slots_1week[3], 4)
+    with pytest.raises(ValueError):
+        shift_range_1week.index(slots_1week[3], 0, 3)
+
+
+def test_shift_range_slicing(
+    shift_range_1week: ShiftRange, slots_1week: list[Slot]
+):
+    assert isinstance(shift_range_1week[2:6], ShiftRange)
+    assert list(shift_range_1week[2:6]) == slots_1week[2:6]
+    assert list(shift_range_1week[::2]) == slots_1week[::2]
+    assert list(shift_range_1week[::-3]) == slots_1week[::-3]
+    assert len(shift_range_1week[100:]) == 0
+
+
+def test_shift_range_not_in_range(shift_range_1week: ShiftRange):
+    before = Shift(DayAndEvening.evening, Day(date(2002, 2, 3)))
+    assert before not in shift_range_1week
+    assert "shift" not in shift_range_1week
+    with pytest.raises(ValueError):
+        shift_range_1week.index(before)
+    with pytest.raises(IndexError):
+        shift_range_1week[len(shift_range_1week)]
+
+
+def test_shift_range_subset_of_periods():
+    _shift_range = shift_range(
+        Shift(DayAndEvening.evening, Day(date(2002, 2, 2))),
+        Shift(DayAndEvening.day, Day(date(2002, 2, 4))),
+        periods=[DayAndEvening.evening],
+    )
+    assert len(_shift_range) == 2
+    assert all(shift.period == DayAndEvening.evening for shift in _shift_range)
+    assert Shift(DayAndEvening.day, Day(date(2002, 2, 3))) not in _shift_range
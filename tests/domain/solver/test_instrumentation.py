@@ -0,0 +1,78 @@
+from ortools.sat.python import cp_model  # type: ignore
+
+from shift.domain.planning.constraints import ShiftsPerDay, WorkersPerShift
+from shift.domain.planning.distributions import NShifts
+from shift.domain.shifts.shift import Slot
+from shift.domain.solver.instrumentation import (
+    Instrumentation,
+    StageStatistics,
+)
+from shift.domain.solver.optimizers import PlanningOptimization
+from shift.domain.solver.solver import Solver
+
+
+def test_instrumentation(employee_ids: list[int], slots_1week: list[Slot]):
+    recorded: list[StageStatistics] = []
+    instrumentation = Instrumentation(
+        trace_memory=True, hooks=[recorded.append]
+    )
+
+    solver = Solver(
+        0,
+        employee_ids,
+        slots_1week,
+        optimization=PlanningOptimization(employee_ids, week_days=(1, 2)),
+        instrumentation=instrumentation,
+    )
+
+    constraints = [WorkersPerShift(), ShiftsPerDay()]
+    for constraint in constraints:
+        constraint.employee_ids = employee_ids
+    n_shifts = NShifts(offset=1)
+    n_shifts.employee_hours = {id: 1 for id in employee_ids}
+
+    solver.add_constraints(constraints)
+    solver.add_distributions([n_shifts])
+    solver.add_optimization()
+
+    assert recorded == instrumentation.statistics
+    assert [
+        (statistics.stage, statistics.component) for statistics in recorded
+    ] == [
+        ("slots", "EmployeeSlotMatrix"),
+        ("constraints", "WorkersPerShift"),
+        ("constraints", "ShiftsPerDay"),
+        ("distributions", "NShifts"),
+        ("optimization", "PlanningOptimization"),
+    ]
+
+    (
+        slots,
+        workers_per_shift,
+        shifts_per_day,
+        n_shifts_,
+        optimization,
+    ) = recorded
+    assert slots.n_variables == len(employee_ids) * len(slots_1week)
+    assert slots.n_constraints == 0
+    assert workers_per_shift.n_constraints == len(slots_1week)
+    assert workers_per_shift.n_variables == 0
+    assert shifts_per_day.n_constraints == len(employee_ids) * 8
+    assert n_shifts_.n_constraints == 2 * len(employee_ids)
+    assert optimization.n_variables == 3 * len(employee_ids)
+    assert all(statistics.wall_time >= 0 for statistics in recorded)
+    assert any(statistics.peak_memory > 0 for statistics in recorded)
+
+    summary = instrumentation.summary()
+    assert summary["constraints"]["n_constraints"] == (
+        workers_per_shift.n_constraints + shifts_per_day.n_constraints
+    )
+    assert instrumentation.report()[1]["component"] == "WorkersPerShift"
+
+
+def test_without_instrumentation(
+    employee_ids: list[int], slots_1week: list[Slot]
+):
+    solver = Solver(0, employee_ids, slots_1week, model=cp_model.CpModel())
+    solver.add_optimization()
+    assert solver.instrumentation is None
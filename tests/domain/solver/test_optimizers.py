@@ -32,3 +32,11 @@ def test_add_optimization(
     n_expected_constraints = (len(week_days) + 1) * len(employee_ids)
 
     assert len(constraints) == n_expected_constraints
+
+
+def test_add_optimization_without_slots(
+    employee_ids, employee_slots_1week, model
+):
+    optimizer = PlanningOptimization(employee_ids)
+    optimizer.add_optimization([], model, employee_slots_1week)
+    assert not model.Proto().HasField("objective")
@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+
+from shift.domain.planning.constraints import MaxConsecutiveShifts
+from shift.domain.planning.distributions import NShifts
+from shift.domain.planning.planning import Planning
+from shift.domain.solver.rolling import RollingHorizon, Window
+
+
+@pytest.fixture
+def planning(get_planning) -> Planning:
+    return get_planning(
+        date(2024, 1, 15),
+        date(2024, 3, 10),
+        {0: 16, 1: 16, 2: 32, 3: 32},
+        constraints=[MaxConsecutiveShifts(max=2, window=4)],
+        distributions=[NShifts(offset=1)],
+    )
+
+
+def test_windows(planning: Planning):
+    windows = list(RollingHorizon(planning, lookahead=7).windows())
+    assert windows == [
+        Window(date(2024, 1, 15), date(2024, 1, 31), date(2024, 2, 7)),
+        Window(date(2024, 2, 1), date(2024, 2, 29), date(2024, 3, 7)),
+        Window(date(2024, 3, 1), date(2024, 3, 10), date(2024, 3, 10)),
+    ]
+
+
+def test_solve(planning: Planning):
+    result = RollingHorizon(planning).solve(num_workers=1, random_seed=1)
+
+    assert result.is_feasible
+    assert len(result.results) == 3
+    assert [(planned.period, planned.day) for planned in result.planned] == [
+        (shift.period, shift.day) for shift in planning.shifts
+    ]
+    for planned in result.planned:
+        assert len(planned.employee_ids) == 1
+
+    # consecutive shifts hold across the boundaries of the windows
+    employee_ids = [next(iter(p.employee_ids)) for p in result.planned]
+    for start in range(len(employee_ids) - 3):
+        window = employee_ids[start : start + 4]
+        assert max(window.count(id) for id in set(window)) <= 2
+
+    # the balance is carried forward, so the total is distributed evenly
+    n_shifts = len(result.planned)
+    for employee_id, hours in planning.employee_hours.items():
+        share = hours / 96 * n_shifts
+        assert abs(employee_ids.count(employee_id) - share) <= 2
+    assert planning.distributions.n_shifts[0].balance == {}
+
+
+def test_solve_restores_balance(planning: Planning):
+    n_shifts = planning.distributions.n_shifts[0]
+    balance = {0: 4.0}
+    n_shifts.balance = balance
+    result = RollingHorizon(planning).solve(num_workers=1, random_seed=1)
+    assert result.is_feasible
+    assert n_shifts.balance is balance
+
+    # the employee with a positive balance works less in the first window
+    # than the employee with the same hours
+    employee_ids = [
+        next(iter(p.employee_ids)) for p in result.results[0].planned
+    ]
+    assert employee_ids.count(0) < employee_ids.count(1)
+
+    # also restored if solving a window fails
+    with pytest.raises(TypeError):
+        RollingHorizon(planning).solve(unknown=True)
+    assert n_shifts.balance is balance
@@ -0,0 +1,129 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, time
+
+import pytest
+
+from shift.domain.planning.constraints import MaxRecurrentShifts, MinimumRest
+from shift.domain.planning.planning import Planning
+from shift.domain.shifts.calendars import (
+    HolidayCalendar,
+    get_holiday_calendar,
+)
+from shift.domain.shifts.periods import DayAndEvening, get_period_starts
+from shift.domain.solver.scenarios import (
+    Scenario,
+    _initialize_process,
+    comparison_table,
+    solve_scenarios,
+)
+
+
+@pytest.fixture
+def planning(get_planning) -> Planning:
+    return get_planning(
+        date(2024, 1, 1),
+        date(2024, 1, 14),
+        {0: 32, 1: 32, 2: 32},
+        constraints=[MaxRecurrentShifts(max=3)],
+        # including an employee that could be hired
+        employee_ids=[0, 1, 2, 3],
+    )
+
+
+def test_apply(planning: Planning):
+    scenario = Scenario(
+        "relaxed",
+        {
+            "employees_per_shift": 2,
+            "constraints.max_recurrent_shifts.0.max": 4,
+        },
+    )
+    _planning = scenario.apply(planning)
+    assert _planning.employees_per_shift == 2
+    assert _planning.constraints.max_recurrent_shifts[0].max == 4
+    assert planning.employees_per_shift == 1
+    assert planning.constraints.max_recurrent_shifts[0].max == 3
+
+    with pytest.raises(AttributeError):
+        Scenario("unknown", {"employees": 2}).apply(planning)
+
+
+def test_solve_scenarios(planning: Planning):
+    scenarios = [
+        Scenario("base"),
+        # two employees per shift do not fit a single shift per day
+        Scenario("understaffed", {"employees_per_shift": 2}),
+        Scenario(
+            "extra hire",
+            {
+                "employees_per_shift": 2,
+                "employee_hours": {0: 32, 1: 32, 2: 32, 3: 32},
+                # four weekend shifts per two weeks for every employee
+                "constraints.max_recurrent_shifts.0.max": 4,
+            },
+        ),
+    ]
+    results = solve_scenarios(planning, scenarios, cpu_budget=2, random_seed=1)
+
+    assert [result.scenario for result in results] == [
+        "base",
+        "understaffed",
+        "extra hire",
+    ]
+    assert [result.result.status for result in results] == [
+        "OPTIMAL",
+        "INFEASIBLE",
+        "OPTIMAL",
+    ]
+    assert [result.is_feasible for result in results] == [True, False, True]
+    assert len(results[0].result.planned) == len(list(planning.slots))
+
+    table = comparison_table(results)
+    assert list(table[0]) == [
+        "scenario",
+        "status",
+        "objective",
+        "bound",
+        "build_time",
+        "solve_time",
+    ]
+
+    with pytest.raises(TypeError):
+        solve_scenarios(planning, scenarios, num_workers=4)
+
+
+def test_initialize_process():
+    period_starts = [
+        (DayAndEvening.day, time(6)),
+        (DayAndEvening.evening, time(14)),
+    ]
+    holiday_calendar = HolidayCalendar("DE", "BY")
+    # a spawned process does not inherit the configuration of this process
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_initialize_process,
+        initargs=(period_starts, holiday_calendar),
+    ) as executor:
+        assert executor.submit(get_period_starts).result() == period_starts
+        assert (
+            executor.submit(get_holiday_calendar).result() == holiday_calendar
+        )
+
+
+def test_solve_scenarios_spawn(planning: Planning):
+    minimum_rest = MinimumRest()
+    minimum_rest.employee_ids = planning.employee_ids
+    scenarios = [
+        Scenario("base"),
+        Scenario("rest", {"constraints.minimum_rest": [minimum_rest]}),
+    ]
+    results = solve_scenarios(
+        planning,
+        scenarios,
+        cpu_budget=2,
+        mp_context=multiprocessing.get_context("spawn"),
+        random_seed=1,
+    )
+    assert [result.is_feasible for result in results] == [True, True]
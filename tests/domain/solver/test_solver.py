@@ -2,11 +2,26 @@ from datetime import timedelta
 
 import pytest
 from google.protobuf.json_format import MessageToDict  # type: ignore
+from ortools.sat.python import cp_model  # type: ignore
 
-from shift.domain.planning.constraints import SpecificShifts
+from shift.domain.employee.specifications import Holiday, Specifications
+from shift.domain.planning.constraints import (
+    MaxConsecutiveShifts,
+    MaxShiftPatterns,
+    ShiftsPerDay,
+    SpecificShifts,
+    WindowEncoding,
+    WorkersPerShift,
+)
 from shift.domain.planning.distributions import NShifts
 from shift.domain.shifts.periods import DayAndEvening
+from shift.domain.shifts.shift import Slot
+from shift.domain.solver.optimizers import (
+    MinimizeChanges,
+    PlanningOptimization,
+)
 from shift.domain.solver.solver import Solver
+from shift.domain.utils.utils import VarNaming
 
 
 @pytest.fixture
@@ -90,3 +105,353 @@ def test_add_distributions(
     initialized_model = MessageToDict(solver_1week.model.Proto())
     constraints = initialized_model["constraints"]
     assert len(constraints) == len(employee_ids) * 2
+
+
+@pytest.fixture
+def specifications_1week(slots_1week) -> list[Specifications]:
+    on_holiday = Specifications(0)
+    on_holiday.add(Holiday(slots_1week[0].shift, slots_1week[3].shift))
+    return [on_holiday]
+
+
+@pytest.fixture
+def pruned_solver_1week(
+    model, employee_ids, slots_1week, specifications_1week
+) -> Solver:
+    return Solver(
+        0,
+        employee_ids,
+        slots_1week,
+        model=model,
+        specifications=specifications_1week,
+    )
+
+
+def test_prune_unavailable_slots(
+    pruned_solver_1week: Solver,
+    employee_ids: list[int],
+    slots_1week: list[Slot],
+):
+    initialized_model = MessageToDict(pruned_solver_1week.model.Proto())
+    variables = initialized_model["variables"]
+
+    assert len(variables) == len(employee_ids) * len(slots_1week) - 4
+    for index in range(4):
+        assert (0, index) not in pruned_solver_1week.employee_slots
+    assert (1, 0) in pruned_solver_1week.employee_slots
+
+
+def test_pruned_model_is_solvable(
+    pruned_solver_1week: Solver,
+    employee_ids: list[int],
+    slots_1week: list[Slot],
+):
+    constraints = [WorkersPerShift(), ShiftsPerDay(), MaxConsecutiveShifts()]
+    for constraint in constraints:
+        constraint.employee_ids = employee_ids
+    n_shifts = NShifts(offset=1)
+    n_shifts.employee_hours = {id: 1 for id in employee_ids}
+
+    pruned_solver_1week.add_constraints(constraints)
+    pruned_solver_1week.add_distributions([n_shifts])
+
+    solver = cp_model.CpSolver()
+    status = solver.Solve(pruned_solver_1week.model)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+def test_pruned_model_optimization(
+    pruned_solver_1week: Solver,
+    employee_ids: list[int],
+    slots_1week: list[Slot],
+):
+    optimization = PlanningOptimization(employee_ids, week_days=(1, 2))
+    optimization.add_optimization(
+        slots_1week,
+        pruned_solver_1week.model,
+        pruned_solver_1week.employee_slots,
+    )
+    initialized_model = MessageToDict(pruned_solver_1week.model.Proto())
+    assert len(initialized_model["constraints"]) == 3 * len(employee_ids)
+
+
+def test_pruned_mandatory_shift_is_infeasible(
+    pruned_solver_1week: Solver, slot_t0: Slot
+):
+    mandatory_first_shift = SpecificShifts(
+        specific_shifts=[(slot_t0.shift, False)]
+    )
+    mandatory_first_shift.employee_ids = [0]
+    pruned_solver_1week.add_constraints([mandatory_first_shift])
+
+    solver = cp_model.CpSolver()
+    status = solver.Solve(pruned_solver_1week.model)
+    assert status == cp_model.INFEASIBLE
+
+
+def test_solve(
+    solver_1week: Solver, employee_ids: list[int], slots_1week: list[Slot]
+):
+    constraints = [WorkersPerShift(), ShiftsPerDay()]
+    for constraint in constraints:
+        constraint.employee_ids = employee_ids
+    solver_1week.add_constraints(constraints)
+
+    log_lines: list[str] = []
+    result = solver_1week.solve(
+        num_workers=2,
+        max_time=10,
+        random_seed=1,
+        log_callback=log_lines.append,
+    )
+
+    assert result.status == "OPTIMAL"
+    assert result.is_feasible
+    assert result.objective is None
+    assert result.wall_time >= 0
+    assert log_lines
+
+    assert [(planned.period, planned.day) for planned in result.planned] == [
+        (slot.period, slot.day) for slot in slots_1week
+    ]
+    for planned, slot in zip(result.planned, slots_1week):
+        assert planned.is_complete(slot)
+        assert len(planned.employee_ids) == slot.n_employees
+
+
+def test_solve_with_objective(solver_1week: Solver, employee_ids: list[int]):
+    workers_per_shift = WorkersPerShift()
+    workers_per_shift.employee_ids = employee_ids
+    solver_1week.add_constraints([workers_per_shift])
+    solver_1week.model.Minimize(solver_1week.employee_slots[(0, 0)])
+
+    result = solver_1week.solve(relative_gap=0.0)
+    assert result.objective == 0
+    assert result.bound == 0
+    assert 0 not in result.planned[0].employee_ids
+
+
+def test_solve_infeasible(pruned_solver_1week: Solver, slot_t0: Slot):
+    mandatory_first_shift = SpecificShifts(
+        specific_shifts=[(slot_t0.shift, False)]
+    )
+    mandatory_first_shift.employee_ids = [0]
+    pruned_solver_1week.add_constraints([mandatory_first_shift])
+
+    result = pruned_solver_1week.solve()
+    assert result.status == "INFEASIBLE"
+    assert not result.is_feasible
+    assert result.planned == []
+
+
+def test_default_model(employee_ids: list[int], slots_1week: list[Slot]):
+    solver = Solver(0, employee_ids, slots_1week)
+    assert len(solver.employee_slots) == len(employee_ids) * len(slots_1week)
+
+
+@pytest.mark.parametrize("naming", list(VarNaming))
+def test_naming(
+    naming: VarNaming, employee_ids: list[int], slots_1week: list[Slot]
+):
+    solver = Solver(0, employee_ids, slots_1week, naming=naming)
+    PlanningOptimization(employee_ids, week_days=(1,)).add_optimization(
+        slots_1week, solver.model, solver.employee_slots
+    )
+    names = [
+        variable.get("name", "")
+        for variable in MessageToDict(solver.model.Proto())["variables"]
+    ]
+
+    if naming is VarNaming.ANONYMOUS:
+        assert not any(names)
+    elif naming is VarNaming.COMPACT:
+        assert names[0] == "s0_0"
+        assert solver.decode_name(names[0]) == (
+            f"Slot <Employee: 0; Shift: {slots_1week[0].shift}"
+        )
+        assert solver.decode_name("m3") == (
+            "max planned on week day <employee: 3>"
+        )
+        assert solver.decode_name("a3_1") == (
+            "any planned <employee: 3; week day: 1>"
+        )
+    else:
+        assert names[0] == f"Slot <Employee: 0; Shift: {slots_1week[0].shift}"
+        assert "max planned on week day <employee: 0>" in names
+        assert solver.decode_name(names[0]) == names[0]
+
+
+def test_decode_unknown_name(solver_1week: Solver):
+    assert solver_1week.decode_name("x1_2") == "x1_2"
+    assert solver_1week.decode_name("") == ""
+
+
+def _solve_roster(solver: Solver, employee_ids: list[int]):
+    constraints = [WorkersPerShift(), ShiftsPerDay()]
+    for constraint in constraints:
+        constraint.employee_ids = employee_ids
+    solver.add_constraints(constraints)
+    solver.add_optimization()
+    return solver.solve(num_workers=1, random_seed=1)
+
+
+def test_warm_start_hints(employee_ids: list[int], slots_1week: list[Slot]):
+    previous = _solve_roster(
+        Solver(0, employee_ids, slots_1week), employee_ids
+    ).planned
+
+    # a previous planning of the first half of the week only
+    solver = Solver(
+        0, employee_ids, slots_1week, previous=previous[: len(previous) // 2]
+    )
+    hint = solver.model.Proto().solution_hint
+    assert len(hint.vars) == len(employee_ids) * (len(previous) // 2)
+    assert sum(hint.values) == len(previous) // 2
+    assert solver.minimize_changes is None
+
+
+def test_warm_start_minimize_changes(
+    employee_ids: list[int], slots_1week: list[Slot]
+):
+    previous = _solve_roster(
+        Solver(0, employee_ids, slots_1week), employee_ids
+    ).planned
+    sick_id = next(iter(previous[0].employee_ids))
+    n_sick_shifts = sum(
+        sick_id in planned.employee_ids for planned in previous
+    )
+
+    # the sick employee is unavailable for the whole week
+    sick = Specifications(sick_id)
+    sick.add(Holiday(slots_1week[0].shift, slots_1week[-1].shift))
+    solver = Solver(
+        0,
+        employee_ids,
+        slots_1week,
+        specifications=[sick],
+        previous=previous,
+        change_weight=1,
+    )
+    result = _solve_roster(solver, employee_ids)
+
+    # every shift of the sick employee is taken over by a single colleague
+    assert result.objective == 2 * n_sick_shifts
+    for planned, _previous in zip(result.planned, previous):
+        if sick_id not in _previous.employee_ids:
+            assert planned.employee_ids == _previous.employee_ids
+
+
+def test_minimize_changes_extends_objective(
+    solver_1week: Solver, employee_ids: list[int]
+):
+    solver_1week.model.Minimize(3 * solver_1week.employee_slots[(0, 0)] + 1)
+    MinimizeChanges([], weight=2).add_optimization(
+        [], solver_1week.model, solver_1week.employee_slots
+    )
+    objective = solver_1week.model.Proto().objective
+    assert list(objective.coeffs) == [3]
+    assert objective.offset == 1
+
+    solver_1week.model.Maximize(solver_1week.employee_slots[(0, 0)])
+    with pytest.raises(ValueError):
+        MinimizeChanges([]).add_optimization(
+            [], solver_1week.model, solver_1week.employee_slots
+        )
+
+
+def test_assumptions_conflicts(
+    employee_ids: list[int], slots_1week: list[Slot], slot_t0: Slot
+):
+    solver = Solver(0, employee_ids[:3], slots_1week, assumptions=True)
+
+    workers_per_shift = WorkersPerShift()
+    shifts_per_day = ShiftsPerDay()
+    workers_per_shift.employee_ids = employee_ids[:3]
+    shifts_per_day.employee_ids = employee_ids[:3]
+    max_consecutive = MaxConsecutiveShifts(max=4, window=5)
+    max_consecutive.employee_ids = employee_ids[:3]
+    # the first shift is both mandatory and blocked
+    mandatory = SpecificShifts(
+        specific_shifts=[
+            (slot_t0.shift, False),
+            (slot_t0.shift, True),
+        ]
+    )
+    mandatory.employee_ids = [0]
+
+    solver.add_constraints(
+        [workers_per_shift, shifts_per_day, max_consecutive, mandatory]
+    )
+    proto = solver.model.Proto()
+    assert len(proto.assumptions) == 4
+    assert all(
+        constraint.enforcement_literal for constraint in proto.constraints
+    )
+    # at most one constraints are enforced as linear constraints
+    assert not any(
+        constraint.HasField("at_most_one") for constraint in proto.constraints
+    )
+
+    result = solver.solve(num_workers=1)
+    assert result.status == "INFEASIBLE"
+    assert [type(conflict) for conflict in result.conflicts] == [
+        SpecificShifts
+    ]
+
+
+def test_assumptions_distribution_conflict(
+    employee_ids: list[int], slots_1week: list[Slot]
+):
+    solver = Solver(0, employee_ids[:2], slots_1week, assumptions=True)
+    workers_per_shift = WorkersPerShift()
+    workers_per_shift.employee_ids = employee_ids[:2]
+    shifts_per_day = ShiftsPerDay()
+    shifts_per_day.employee_ids = employee_ids[:2]
+    n_shifts = NShifts()
+    # the first employee should work all shifts
+    n_shifts.employee_hours = {0: 1, 1: 0}
+    solver.add_constraints([workers_per_shift, shifts_per_day])
+    solver.add_distributions([n_shifts])
+    PlanningOptimization(employee_ids[:2], week_days=(1, 2)).add_optimization(
+        slots_1week, solver.model, solver.employee_slots
+    )
+
+    result = solver.solve(num_workers=1, conflicts_max_time=5.0)
+    assert result.status == "INFEASIBLE"
+    assert result.conflicts == [shifts_per_day, n_shifts]
+    assert result.conflicts_time > 0
+    # the conflicts are minimized on a copy, which leaves the model as is
+    proto = solver.model.Proto()
+    assert len(proto.assumptions) == 3
+    assert proto.HasField("objective")
+
+
+def test_assumptions_automaton(
+    employee_ids: list[int], slots_1week: list[Slot]
+):
+    solver = Solver(0, employee_ids[:1], slots_1week, assumptions=True)
+    workers_per_shift = WorkersPerShift()
+    workers_per_shift.employee_ids = employee_ids[:1]
+    max_consecutive = MaxConsecutiveShifts(
+        max=1, window=2, encoding=WindowEncoding.AUTOMATON
+    )
+    max_consecutive.employee_ids = employee_ids[:1]
+    solver.add_constraints([workers_per_shift, max_consecutive])
+
+    # the automaton is replaced by prefix sums, which can be enforced
+    proto = solver.model.Proto()
+    assert not any(
+        constraint.HasField("automaton") for constraint in proto.constraints
+    )
+    assert max_consecutive.encoding is WindowEncoding.AUTOMATON
+
+    result = solver.solve(num_workers=1)
+    assert result.status == "INFEASIBLE"
+    assert result.conflicts == [workers_per_shift, max_consecutive]
+
+    max_shift_patterns = MaxShiftPatterns(
+        patterns=[[DayAndEvening.evening, DayAndEvening.day]]
+    )
+    max_shift_patterns.employee_ids = employee_ids[:1]
+    with pytest.raises(ValueError, match="automaton"):
+        solver.add_constraints([max_shift_patterns])
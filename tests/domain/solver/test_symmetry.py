@@ -0,0 +1,98 @@
+from datetime import date
+
+import pytest
+from ortools.sat.python import cp_model  # type: ignore
+
+from shift.domain.employee.specifications import Holiday, Specifications
+from shift.domain.planning.constraints import SpecificShifts
+from shift.domain.planning.distributions import NShifts
+from shift.domain.planning.planning import Planning
+from shift.domain.shifts.periods import DayAndEvening
+from shift.domain.shifts.shift import Day, Shift
+from shift.domain.solver.solver import Solver
+from shift.domain.solver.symmetry import (
+    SymmetryBreaking,
+    equivalent_employees,
+)
+
+
+@pytest.fixture
+def planning(get_planning) -> Planning:
+    return get_planning(
+        date(2024, 1, 1),
+        date(2024, 1, 2),
+        {0: 32, 1: 32, 2: 32, 3: 24},
+        distributions=[NShifts(offset=4)],
+    )
+
+
+def test_equivalent_employees(planning: Planning):
+    assert equivalent_employees(planning) == [[0, 1, 2]]
+
+    holiday = Specifications(2)
+    holiday.add(
+        Holiday(
+            Shift(DayAndEvening.day, Day(date(2024, 1, 1))),
+            Shift(DayAndEvening.evening, Day(date(2024, 1, 1))),
+        )
+    )
+    assert equivalent_employees(planning, [holiday]) == [[0, 1]]
+
+    specific_shifts = SpecificShifts(
+        specific_shifts=[
+            (Shift(DayAndEvening.day, Day(date(2024, 1, 1))), True)
+        ]
+    )
+    planning.constraints.add(specific_shifts, employee_ids=[0])
+    assert equivalent_employees(planning) == [[1, 2]]
+
+
+class _Solutions(cp_model.CpSolverSolutionCallback):
+    def __init__(self, rows: list[list[cp_model.IntVar]]) -> None:
+        super().__init__()
+        self.rows = rows
+        self.solutions: list[list[tuple[int, ...]]] = []
+
+    def on_solution_callback(self) -> None:
+        self.solutions.append(
+            [tuple(self.Value(var) for var in row) for row in self.rows]
+        )
+
+
+def _solutions(planning: Planning, symmetry_breaking: bool):
+    solver = Solver(0, planning.employee_ids, planning.slots)
+    solver.add_constraints(planning.retrieve_constraints())
+    if symmetry_breaking:
+        solver.add_constraints(
+            [SymmetryBreaking(classes=equivalent_employees(planning))]
+        )
+
+    callback = _Solutions(
+        [
+            solver.employee_slots.row(employee_id)
+            for employee_id in planning.employee_ids
+        ]
+    )
+    cp_solver = cp_model.CpSolver()
+    cp_solver.parameters.enumerate_all_solutions = True
+    cp_solver.Solve(solver.model, callback)
+    return callback.solutions
+
+
+def test_symmetry_breaking(planning: Planning):
+    solutions = _solutions(planning, symmetry_breaking=False)
+    ordered = _solutions(planning, symmetry_breaking=True)
+
+    assert len(solutions) == 4 * 3 * 4 * 3
+    # every assignment is enumerated once, the literals are fixed by it
+    assert len(ordered) == 26
+    for rows in ordered:
+        assert rows[0] >= rows[1] >= rows[2]
+    assert {tuple(rows) for rows in ordered} <= {
+        tuple(rows) for rows in solutions
+    }
+    # a single solution of every permutation of the employees 0, 1 and 2
+    assert {
+        tuple(sorted(rows[:3], reverse=True)) + (rows[3],)
+        for rows in solutions
+    } == {tuple(rows) for rows in ordered}
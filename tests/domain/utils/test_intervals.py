@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from shift.domain.utils.intervals import Intervals
+
+
+@pytest.mark.parametrize(
+    "intervals, expected",
+    [
+        ([(0, 2), (4, 6)], [(0, 2), (4, 6)]),
+        ([(4, 6), (0, 2)], [(0, 2), (4, 6)]),
+        ([(0, 2), (2, 4)], [(0, 4)]),
+        ([(0, 2), (4, 6), (1, 5)], [(0, 6)]),
+        ([(0, 10), (2, 4)], [(0, 10)]),
+        ([(0, 2), (4, 6), (8, 10), (3, 9)], [(0, 2), (3, 10)]),
+        ([(3, 3), (5, 4)], []),
+    ],
+)
+def test_add(intervals, expected):
+    assert list(Intervals(intervals)) == expected
+
+
+def test_contains():
+    intervals = Intervals([(0, 2), (4, 6)])
+    assert [value in intervals for value in range(-1, 8)] == [
+        False,
+        True,
+        True,
+        False,
+        False,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert "1" not in intervals
+    assert intervals.contains(np.arange(-1, 8)).tolist() == [
+        value in intervals for value in range(-1, 8)
+    ]
+    assert not Intervals().contains([1, 2]).any()
+
+
+@pytest.mark.parametrize("start, stop", [(-3, 10), (1, 5), (5, 5), (3, 4)])
+def test_mask(start: int, stop: int):
+    intervals = Intervals([(0, 2), (4, 6)])
+    assert intervals.mask(start, stop).tolist() == [
+        value in intervals for value in range(start, stop)
+    ]
@@ -0,0 +1,83 @@
+from ortools.sat.python import cp_model  # type: ignore
+
+from shift.domain.shifts.shift import ShiftRegistry
+from shift.domain.utils.utils import (
+    EmployeeSlotMatrix,
+    linear_sum,
+    weighted_sum,
+)
+
+
+def _matrix(slots_1week) -> tuple[EmployeeSlotMatrix, cp_model.CpModel]:
+    model = cp_model.CpModel()
+    matrix = EmployeeSlotMatrix([3, 5], ShiftRegistry(slots_1week))
+    for employee_id in (3, 5):
+        for index in range(len(matrix.shifts)):
+            # employee 5 is pruned from the even shifts
+            if employee_id == 5 and index % 2 == 0:
+                continue
+            matrix[(employee_id, index)] = model.NewBoolVar(
+                matrix.name("s", employee_id, index)
+            )
+    return matrix, model
+
+
+def test_getitem(slots_1week):
+    matrix, _ = _matrix(slots_1week)
+    assert matrix[(3, 0)].Name().startswith("Slot <Employee: 3;")
+    assert (5, 0) not in matrix
+    assert (5, 1) in matrix
+    assert (7, 1) not in matrix
+    assert matrix.get((5, 0)) is None
+    n_shifts = len(matrix.shifts)
+    assert len(matrix) == n_shifts + n_shifts // 2
+
+
+def test_row_column_window(slots_1week):
+    matrix, _ = _matrix(slots_1week)
+    assert len(matrix.row(3)) == len(matrix.shifts)
+    assert len(matrix.row(5)) == len(matrix.shifts) // 2
+    assert [var.Name() for var in matrix.row(5, [0, 1, 2, 3])] == [
+        matrix[(5, 1)].Name(),
+        matrix[(5, 3)].Name(),
+    ]
+    assert len(matrix.column([3, 5], 0)) == 1
+    assert len(matrix.column([3, 5, 7], 1)) == 2
+    assert len(matrix.window(5, 0, 4)) == 2
+    assert matrix.row(7) == []
+
+
+def test_iter(slots_1week):
+    matrix, _ = _matrix(slots_1week)
+    keys = list(matrix)
+    assert keys[:3] == [(3, 0), (3, 1), (3, 2)]
+    assert (5, 1) in keys
+    assert len(matrix.values()) == len(keys)
+
+
+def test_sums(slots_1week):
+    matrix, model = _matrix(slots_1week)
+    # every variable is assigned
+    for var in matrix.values():
+        model.Add(var == 1)
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+
+    n_shifts = len(matrix.shifts)
+    assert solver.Value(matrix.row_sum(3)) == n_shifts
+    assert solver.Value(matrix.row_sum(5)) == n_shifts // 2
+    assert solver.Value(matrix.row_sum(5, [0, 1, 2, 3])) == 2
+    assert solver.Value(matrix.column_sum([3, 5], 0)) == 1
+    assert solver.Value(matrix.column_sum([3, 5], 1)) == 2
+    assert solver.Value(matrix.window_sum(3, 2, 6)) == 4
+    assert (
+        solver.Value(
+            weighted_sum([matrix[(3, 0)], matrix[(5, 1)], 2], [2, -1, 3])
+        )
+        == 7
+    )
+
+    # sums without expressions are zero
+    assert solver.Value(matrix.row_sum(7)) == 0
+    assert solver.Value(linear_sum([])) == 0
+    assert solver.Value(weighted_sum([], [])) == 0